@@ -0,0 +1,33 @@
+import os
+import sys
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class A2SLConfig(AppConfig):
+    name = 'A2SL'
+    verbose_name = 'Sanket Bhasha'
+
+    def ready(self):
+        # Registers the system checks
+        from . import checks
+
+        # Warm models in the serving process only, not in migrate/collectstatic, tests etc.
+        if not getattr(settings, 'NLP_WARMUP', False) or _is_management_command() or _is_test_run():
+            return
+
+        # In the background: the readiness probe answers 503 until it is done
+        from .warmup import start_warmup
+        start_warmup(languages=getattr(settings, 'NLP_WARMUP_LANGUAGES', None))
+
+
+def _is_management_command() -> bool:
+    """True when running a manage.py command other than runserver"""
+    program = os.path.basename(sys.argv[0]) if sys.argv else ''
+    return program in ('manage.py', 'django-admin') and 'runserver' not in sys.argv
+
+
+def _is_test_run() -> bool:
+    """True under pytest (manage.py test is caught as a management command)"""
+    return 'pytest' in sys.modules
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SL.settings')
+# Serve the async conversion views (pooled async translation client, NLP on a thread pool)
+os.environ.setdefault('SERVE_ASYNC', 'True')
 
 application = get_asgi_application()
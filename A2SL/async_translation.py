@@ -0,0 +1,131 @@
+"""
+Async Translation Client
+Google Translate over a pooled, keep-alive httpx.AsyncClient for the ASGI
+deployment: a translation wait is a suspended coroutine instead of a blocked
+worker, so one process can hold hundreds of them. The number of requests in
+flight is bounded by the connection pool size.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+import httpx
+from django.conf import settings
+
+from .deadline import remaining, request_timeout
+from .translator_pool import TranslatorPoolExhausted
+
+logger = logging.getLogger(__name__)
+
+# Token-free endpoint of the Google Translate client API
+DEFAULT_TRANSLATE_URL = 'https://translate.googleapis.com/translate_a/single'
+
+
+def pool_limits(max_keepalive: int, max_connections: int) -> Dict:
+    """
+    httpx.AsyncClient keyword arguments for the connection limits: httpx 0.13
+    (pinned for googletrans) takes pool_limits=PoolLimits, later versions
+    limits=Limits
+    """
+    if hasattr(httpx, 'Limits'):
+        return {'limits': httpx.Limits(max_keepalive_connections=max_keepalive, max_connections=max_connections)}
+    return {'pool_limits': httpx.PoolLimits(max_keepalive=max_keepalive, max_connections=max_connections)}
+
+
+class _LoopState:
+    """HTTP client and concurrency limit bound to one event loop"""
+
+    def __init__(self, loop, client: httpx.AsyncClient, max_connections: int):
+        self.loop = loop
+        self.client = client
+        self.semaphore = asyncio.Semaphore(max_connections)
+
+
+class AsyncGoogleTranslateClient:
+    """
+    Translates to English with at most max_connections requests in flight;
+    further callers wait for a free connection instead of opening new ones,
+    until their translation deadline, or acquire_timeout outside one
+    """
+
+    def __init__(self, url: Optional[str] = None, timeout: Optional[float] = None,
+                 max_connections: Optional[int] = None, max_keepalive: Optional[int] = None,
+                 acquire_timeout: Optional[float] = None):
+        self.url = url or getattr(settings, 'TRANSLATION_ASYNC_URL', DEFAULT_TRANSLATE_URL)
+        self.timeout = timeout if timeout is not None else request_timeout()
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else request_timeout()
+        self.max_connections = max_connections or getattr(settings, 'TRANSLATION_ASYNC_MAX_CONNECTIONS', 20)
+        self.max_keepalive = max_keepalive or getattr(settings, 'TRANSLATION_ASYNC_MAX_KEEPALIVE', 10)
+        self._state: Optional[_LoopState] = None
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.waiting = 0
+        self.timeouts = 0
+
+    def _get_state(self) -> _LoopState:
+        # Connections belong to the event loop that opened them; an ASGI server runs one loop per process
+        loop = asyncio.get_running_loop()
+        state = self._state
+        if state is None or state.loop is not loop:
+            client = httpx.AsyncClient(timeout=self.timeout, **pool_limits(self.max_keepalive, self.max_connections))
+            state = self._state = _LoopState(loop, client, self.max_connections)
+        return state
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Hold one of the max_connections request slots for the duration of the
+        async with block; request() must be called inside it
+        """
+        state = self._get_state()
+        # Waiting for a connection counts against the translation deadline
+        acquire_timeout = min(self.acquire_timeout, remaining(self.acquire_timeout))
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(state.semaphore.acquire(), acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TranslatorPoolExhausted(f"No connection free after {acquire_timeout:.2f}s")
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            yield self
+        finally:
+            self.in_flight -= 1
+            state.semaphore.release()
+
+    async def translate(self, text: str, source_lang: str) -> str:
+        async with self.acquire():
+            return await self.request(text, source_lang)
+
+    async def request(self, text: str, source_lang: str) -> str:
+        """The upstream request itself, on a slot held through acquire()"""
+        self.requests += 1
+        response = await self._get_state().client.get(self.url, params={
+            'client': 'gtx', 'sl': source_lang, 'tl': 'en', 'dt': 't', 'q': text,
+        }, timeout=min(self.timeout, remaining(self.timeout)))
+        response.raise_for_status()
+        data = response.json()
+        translated_text = ''.join(segment[0] for segment in data[0] if segment[0])
+        logger.info(f"Google Translate result (async): '{text}' -> '{translated_text}'")
+        return translated_text
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the current event loop"""
+        state, self._state = self._state, None
+        if state is not None:
+            await state.client.aclose()
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'waiting': self.waiting,
+            'timeouts': self.timeouts,
+            'max_connections': self.max_connections,
+        }
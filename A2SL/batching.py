@@ -0,0 +1,102 @@
+"""
+Micro-batching Translator
+Groups translations that arrive within a few milliseconds of each other into
+one upstream call per source language and fans the results back out
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTimeout(TimeoutError):
+    """Raised when a request gives up waiting for its batch"""
+
+
+class _PendingTranslation:
+    def __init__(self, text: str):
+        self.text = text
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatchTranslator:
+    """
+    The first request for a language opens a batch and waits up to max_wait
+    seconds for company; the batch is sent early once it holds max_batch_size
+    items. No background thread is used, so it is safe to create before a fork.
+    """
+
+    def __init__(self, translate_batch: Callable[[List[str], str], List[str]],
+                 max_wait: float = 0.005, max_batch_size: int = 16, timeout: Optional[float] = 30.0):
+        self.translate_batch = translate_batch
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._pending: Dict[str, List[_PendingTranslation]] = {}
+        self._lock = threading.Lock()
+        self.batches_sent = 0
+        self.items_sent = 0
+
+    def translate(self, text: str, source_lang: str) -> str:
+        item = _PendingTranslation(text)
+        batch = None
+        opened = False
+
+        with self._lock:
+            queue = self._pending.setdefault(source_lang, [])
+            queue.append(item)
+            if len(queue) >= self.max_batch_size:
+                batch = self._pending.pop(source_lang)
+            elif len(queue) == 1:
+                opened = True
+
+        if batch is None and opened:
+            # Give concurrent requests a moment to join, unless a full batch already took ours
+            item.done.wait(self.max_wait)
+            with self._lock:
+                if self._pending.get(source_lang) is queue:
+                    batch = self._pending.pop(source_lang)
+
+        if batch is not None:
+            self._send(batch, source_lang)
+
+        if not item.done.wait(remaining(self.timeout)):
+            raise BatchTimeout(f"Timed out after {self.timeout}s waiting for batched translation")
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _send(self, batch: List[_PendingTranslation], source_lang: str) -> None:
+        # Identical texts in one batch are translated once
+        texts = list(dict.fromkeys(item.text for item in batch))
+        try:
+            start_time = time.perf_counter()
+            translations = self.translate_batch(texts, source_lang)
+            if len(translations) != len(texts):
+                raise ValueError(f"Batch translation returned {len(translations)} results for {len(texts)} texts")
+            results = dict(zip(texts, translations))
+            logger.info(f"Batched {len(batch)} '{source_lang}' translations into one call ({(time.perf_counter() - start_time) * 1000:.0f} ms)")
+            for item in batch:
+                item.result = results[item.text]
+        except BaseException as e:
+            for item in batch:
+                item.error = e
+        finally:
+            with self._lock:
+                self.batches_sent += 1
+                self.items_sent += len(batch)
+            for item in batch:
+                item.done.set()
+
+    def stats(self) -> Dict:
+        return {
+            'batches_sent': self.batches_sent,
+            'items_sent': self.items_sent,
+            'average_batch_size': round(self.items_sent / self.batches_sent, 2) if self.batches_sent else 0.0,
+        }
@@ -0,0 +1,367 @@
+"""
+Caching Utilities
+Bounded result caches with hit/miss/eviction counters, used to avoid
+repeating upstream translations for phrases we have already seen
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_translation_key(text: str, source_lang: str) -> str:
+    """Cache key for a translation: source language plus NFC-normalized text"""
+    return f"{source_lang}:{unicodedata.normalize('NFC', text.strip())}"
+
+
+class CacheStats:
+    """
+    Thread-safe hit/miss/eviction counters
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def record_evictions(self, count: int = 1) -> None:
+        with self._lock:
+            self.evictions += count
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def as_dict(self) -> Dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hit_rate, 4),
+        }
+
+
+class _CountingTTLCache(TTLCache):
+    """TTLCache that reports size-based and TTL-based evictions"""
+
+    def __init__(self, maxsize, ttl, stats: CacheStats):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._stats = stats
+
+    def popitem(self):
+        item = super().popitem()
+        self._stats.record_evictions()
+        return item
+
+    def expire(self, time=None):
+        # The expired (key, value) pairs are returned since cachetools 5.3 (required in requirements.txt)
+        expired = super().expire(time)
+        if expired:
+            self._stats.record_evictions(len(expired))
+        return expired
+
+
+class LocalTTLCache:
+    """
+    In-process LRU cache with a time-to-live per entry
+    """
+
+    backend_name = 'local'
+
+    def __init__(self, max_size: int = 2048, ttl: float = 86400):
+        self.stats = CacheStats()
+        self._cache = _CountingTTLCache(max_size, ttl, self.stats)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._cache.get(key)
+        if value is None:
+            self.stats.record_miss()
+        else:
+            self.stats.record_hit()
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+
+class DjangoCacheBackend:
+    """
+    Cache stored in one of the configured Django CACHES (e.g. Redis or Memcached),
+    shared by every worker that points at the same cache server.
+    Size and TTL eviction are left to the cache server.
+    """
+
+    backend_name = 'django'
+
+    def __init__(self, alias: str = 'default', ttl: float = 86400, prefix: str = 'translation'):
+        from django.core.cache import caches
+
+        self._cache = caches[alias]
+        self._ttl = ttl
+        self._prefix = prefix
+        self.stats = CacheStats()
+
+    def _make_key(self, key: str) -> str:
+        # Hash the text so keys stay short and memcached-safe for any script
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return f"{self._prefix}:{digest}"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            value = self._cache.get(self._make_key(key))
+        except Exception as e:
+            logger.warning(f"Django cache lookup failed: {e}")
+            value = None
+        if value is None:
+            self.stats.record_miss()
+        else:
+            self.stats.record_hit()
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self._cache.set(self._make_key(key), value, timeout=self._ttl)
+        except Exception as e:
+            logger.warning(f"Django cache store failed: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._cache.delete(self._make_key(key))
+        except Exception as e:
+            logger.warning(f"Django cache delete failed: {e}")
+
+    def clear(self) -> None:
+        # Only the local counters; other keys in the shared cache are left alone
+        self.stats.reset()
+
+    def __len__(self) -> int:
+        return 0
+
+
+class SQLiteCacheBackend:
+    """
+    On-disk cache in a SQLite database running in WAL mode.
+    Every worker on a node opens the same file, so entries are shared between
+    workers and survive restarts. Eviction is approximate LRU: the access time
+    is refreshed at most once per ACCESS_RESOLUTION seconds to keep hits read-only.
+    The file and its schema are created on first use, not when the backend is built.
+    """
+
+    backend_name = 'sqlite'
+
+    # Seconds between access-time updates for the same entry
+    ACCESS_RESOLUTION = 60
+    # Check the size bound once every this many writes
+    EVICTION_CHECK_INTERVAL = 64
+
+    def __init__(self, path: str, max_size: int = 100000, ttl: float = 30 * 86400):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        One connection per thread and per process (connections must not cross a fork);
+        the first one opens the file and creates the schema
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            # Reported like any other database error: the request continues without the cache
+            raise sqlite3.OperationalError(f"Cannot create {directory}: {e}")
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(conn)
+                    self._schema_ready = True
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS translation_cache ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS translation_cache_accessed ON translation_cache (accessed)')
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT value, created, accessed FROM translation_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                conn.execute('DELETE FROM translation_cache WHERE key = ?', (key,))
+                self.stats.record_evictions()
+                row = None
+            elif row is not None and now - row[2] > self.ACCESS_RESOLUTION:
+                conn.execute('UPDATE translation_cache SET accessed = ? WHERE key = ?', (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache lookup failed: {e}")
+            row = None
+
+        if row is None:
+            self.stats.record_miss()
+            return None
+        self.stats.record_hit()
+        return row[0]
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        try:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO translation_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+                (key, value, now, now),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache store failed: {e}")
+            return
+
+        with self._writes_lock:
+            self._writes += 1
+            check_size = self._writes % self.EVICTION_CHECK_INTERVAL == 0
+        if check_size:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._connect().execute('DELETE FROM translation_cache WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache delete failed: {e}")
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently used ones above max_size"""
+        try:
+            conn = self._connect()
+            expired = conn.execute(
+                'DELETE FROM translation_cache WHERE created < ?', (time.time() - self.ttl,)
+            ).rowcount
+            overflow = conn.execute(
+                'DELETE FROM translation_cache WHERE key IN ('
+                ' SELECT key FROM translation_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_size,),
+            ).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache eviction failed: {e}")
+            return 0
+
+        removed = expired + overflow
+        if removed:
+            self.stats.record_evictions(removed)
+        return removed
+
+    def compact(self) -> Dict:
+        """Evict, fold the WAL back into the database and reclaim free pages"""
+        size_before = self._file_size()
+        removed = self.evict()
+        conn = self._connect()
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        conn.execute('VACUUM')
+        return {
+            'removed': removed,
+            'entries': len(self),
+            'bytes_before': size_before,
+            'bytes_after': self._file_size(),
+        }
+
+    def _file_size(self) -> int:
+        total = 0
+        for suffix in ('', '-wal'):
+            try:
+                total += os.path.getsize(self.path + suffix)
+            except OSError:
+                pass
+        return total
+
+    def clear(self) -> None:
+        try:
+            self._connect().execute('DELETE FROM translation_cache')
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache clear failed: {e}")
+
+    def __len__(self) -> int:
+        try:
+            return self._connect().execute('SELECT COUNT(*) FROM translation_cache').fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+
+def build_translation_cache():
+    """
+    Create the translation cache configured in settings:
+    TRANSLATION_CACHE_BACKEND is 'local' (default), 'sqlite', 'django' or 'none'
+    """
+    backend = getattr(settings, 'TRANSLATION_CACHE_BACKEND', 'local')
+    max_size = getattr(settings, 'TRANSLATION_CACHE_MAX_SIZE', 2048)
+    ttl = getattr(settings, 'TRANSLATION_CACHE_TTL', 86400)
+
+    if backend == 'none':
+        return None
+    if backend == 'sqlite':
+        path = getattr(settings, 'TRANSLATION_CACHE_PATH', 'translation_cache.sqlite3')
+        return SQLiteCacheBackend(path=path, max_size=max_size, ttl=ttl)
+    if backend == 'django':
+        alias = getattr(settings, 'TRANSLATION_CACHE_ALIAS', 'default')
+        return DjangoCacheBackend(alias=alias, ttl=ttl)
+    if backend != 'local':
+        logger.warning(f"Unknown translation cache backend '{backend}', using local cache")
+    return LocalTTLCache(max_size=max_size, ttl=ttl)
@@ -0,0 +1,27 @@
+"""
+System Checks
+Generated data files the app needs but that are only built by build.sh;
+`manage.py check` (and every command that runs checks, runserver and
+migrate included) fails while one is missing instead of the worker quietly
+running slower without it.
+"""
+import os
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def check_pos_lexicon(app_configs, **kwargs):
+    """The POS fast path lexicon must exist unless the fast path is disabled"""
+    if not getattr(settings, 'POS_LEXICON_ENABLED', True):
+        return []
+    path = getattr(settings, 'POS_LEXICON_PATH', None)
+    if path and not os.path.exists(path):
+        return [Error(
+            f"POS lexicon {path} does not exist.",
+            hint="Run 'python manage.py build_pos_lexicon' (needs the averaged_perceptron_tagger NLTK data), "
+                 "or set POS_LEXICON_ENABLED=False to tag every sentence with the full tagger.",
+            id='A2SL.E001',
+        )]
+    return []
@@ -0,0 +1,129 @@
+"""
+Circuit Breaker
+Stops calling an upstream service after repeated failures or slow calls,
+so requests fail fast to an offline fallback instead of stalling a worker
+"""
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    closed    -> calls pass through; consecutive failures/slow calls are counted
+    open      -> calls are rejected until reset_timeout has passed
+    half_open -> one trial call is let through; success closes, failure re-opens
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str = 'upstream', failure_threshold: int = 5,
+                 slow_call_threshold: float = 2.0, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+            # Half-open: only one trial call at a time
+            if self._trial_in_flight:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self, duration: float = 0.0) -> None:
+        if self.slow_call_threshold and duration > self.slow_call_threshold:
+            logger.warning(f"Slow {self.name} call: {duration:.2f}s")
+            self.record_failure()
+            return
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                    logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def call(self, func: Callable[[], Any]) -> Any:
+        """Run func through the breaker, raising CircuitOpenError while open"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        start_time = self._clock()
+        try:
+            result = func()
+        except BaseException:
+            self.record_failure()
+            raise
+        self.record_success(self._clock() - start_time)
+        return result
+
+    async def call_async(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await func() through the breaker, raising CircuitOpenError while open"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        start_time = self._clock()
+        try:
+            result = await func()
+        except BaseException:
+            self.record_failure()
+            raise
+        self.record_success(self._clock() - start_time)
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict:
+        return {
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'times_opened': self.times_opened,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,52 @@
+"""
+Translation Deadlines
+One time budget per translation request, TRANSLATION_TIMEOUT seconds from the
+moment the request needs the upstream. Waiting for an identical in-flight
+translation, waiting for a pooled client and the upstream request itself all
+draw on the same budget, so together they never run past it.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+
+# Monotonic time the current translation must finish by (None outside a request);
+# tasks and threads started through asgiref copy it along with the rest of the context
+_deadline: ContextVar[Optional[float]] = ContextVar('translation_deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The translation request used up its time budget"""
+
+
+def request_timeout() -> float:
+    return getattr(settings, 'TRANSLATION_TIMEOUT', 5.0)
+
+
+@contextmanager
+def translation_deadline(timeout: Optional[float] = None):
+    """Give the with block a deadline, unless an enclosing block already set one"""
+    if _deadline.get() is not None:
+        yield
+        return
+    token = _deadline.set(time.monotonic() + (timeout if timeout is not None else request_timeout()))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before the current deadline, or default outside a deadline.
+    Raises DeadlineExceeded once the deadline has passed.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Translation deadline exceeded")
+    return left
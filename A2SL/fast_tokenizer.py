@@ -0,0 +1,85 @@
+"""
+Fast Word Tokenizer
+Regex fast path for short single-sentence utterances. It yields the same
+alphabetic tokens as nltk.word_tokenize followed by an isalpha() filter, and
+hands anything that needs punkt sentence segmentation back to word_tokenize.
+"""
+import re
+from typing import List, Optional
+
+from nltk.tokenize import NLTKWordTokenizer
+
+from .nltk_resources import nltk_resources
+
+# Characters the Treebank tokenizer always splits off a word
+# (',' and ':' are only kept attached when followed by a digit, which never leaves a letters-only word)
+SPLIT_CHARS = '?!;@#$%&*()[]{}<>",:'
+
+# Clitics the Treebank tokenizer splits off the end of a word ("don't" -> "do", "n't")
+CLITIC_RE = re.compile(r"^(\w+?)(n't|N'T|'[sSmMdD]|'ll|'LL|'re|'RE|'ve|'VE)$")
+
+# Words the Treebank tokenizer splits in two ("cannot" -> "can", "not"); all split after 3 letters
+SPLIT_WORDS = frozenset(['cannot', 'gimme', 'gonna', 'gotta', 'lemme', 'wanna'])
+
+# The tokenizer behind nltk.word_tokenize; it keeps no state between calls
+_treebank_tokenizer = NLTKWordTokenizer()
+
+
+def _append_word(tokens: List[str], word: str) -> bool:
+    """Add a letters-only word (split like the Treebank tokenizer); False if the word needs the slow path"""
+    if word.isalpha():
+        if word.lower() in SPLIT_WORDS:
+            tokens.append(word[:3])
+            tokens.append(word[3:])
+        else:
+            tokens.append(word)
+        return True
+    # Letters mixed with digits stay one token, which the alpha filter drops
+    return word.isalnum()
+
+
+def _has_other_whitespace(text: str) -> bool:
+    return any(ch.isspace() for ch in text.replace(' ', ''))
+
+
+def fast_alpha_tokens(text: str) -> Optional[List[str]]:
+    """
+    Alphabetic tokens of a single-sentence text, or None when the text has
+    periods inside it, apostrophes other than common clitics, hyphens, or other
+    punctuation the fast path does not model.
+    """
+    chunks = text.split()
+    if not chunks:
+        return []
+
+    # A single final period is split off by the Treebank tokenizer
+    last = chunks[-1]
+    if last.endswith('.') and not last.endswith('..'):
+        chunks[-1] = last[:-1]
+
+    tokens: List[str] = []
+    for chunk in chunks:
+        word = chunk.strip(SPLIT_CHARS)
+        if not word:
+            continue
+        if _append_word(tokens, word):
+            continue
+        # Clitics are only split off when followed by a plain space (or the end of the text)
+        match = CLITIC_RE.match(word)
+        if match is None or not _append_word(tokens, match.group(1)) or _has_other_whitespace(text):
+            return None
+    return tokens
+
+
+def word_tokenize(text: str) -> List[str]:
+    """nltk.word_tokenize with the punkt model from the resource registry (loaded once, thread-safe)"""
+    sentences = nltk_resources.get('punkt').tokenize(text)
+    return [token for sentence in sentences for token in _treebank_tokenizer.tokenize(sentence)]
+
+
+def alpha_word_tokenize(text: str) -> List[str]:
+    """word_tokenize(text) restricted to alphabetic tokens, skipping punkt when the fast path applies"""
+    tokens = fast_alpha_tokens(text)
+    if tokens is None:
+        tokens = [token for token in word_tokenize(text) if token.isalpha()]
+    return tokens
@@ -0,0 +1,211 @@
+"""
+Fuzzy Vocabulary Matching
+SymSpell-style deletes index over the clip vocabulary, so misspelled or
+ASR-garbled words ('helo', 'wrold') are signed with the clip they were meant
+to be instead of being fingerspelled. Real English words close to a clip
+('fold' next to 'gold') are listed by `manage.py build_fuzzy_index` and are
+never corrected.
+"""
+import json
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set
+
+from django.conf import settings
+
+from .caching import CacheStats
+
+logger = logging.getLogger(__name__)
+
+FUZZY_INDEX_VERSION = 1
+
+# Shorter words are neither indexed nor corrected (one edit already changes a third of them)
+MIN_WORD_LENGTH = 4
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """Every string obtained by deleting up to max_distance characters from word (including word itself)"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {candidate[:i] + candidate[i + 1:] for candidate in frontier for i in range(len(candidate))}
+        results |= frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions and
+    adjacent transpositions); returns max_distance + 1 once it is exceeded
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyMatch(NamedTuple):
+    word: str
+    distance: int
+    confidence: float
+
+
+class SymSpellIndex:
+    """
+    Deletes index: every word is stored under each string reachable by up to
+    max_distance deletions, so a query only needs its own deletes looked up
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = 2, min_length: int = MIN_WORD_LENGTH):
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.words: FrozenSet[str] = frozenset(
+            word for word in words if len(word) >= min_length and word.isalpha()
+        )
+        self._deletes: Dict[str, List[str]] = {}
+        for word in sorted(self.words):
+            for key in deletes(word, max_distance):
+                self._deletes.setdefault(key, []).append(word)
+
+    def candidates(self, word: str, max_distance: Optional[int] = None) -> Dict[str, int]:
+        """Indexed words within max_distance of word, with their distance"""
+        max_distance = self.max_distance if max_distance is None else max_distance
+        found = {}
+        for key in deletes(word, max_distance):
+            for candidate in self._deletes.get(key, ()):
+                if candidate not in found:
+                    found[candidate] = edit_distance(word, candidate, max_distance)
+        return {candidate: distance for candidate, distance in found.items() if distance <= max_distance}
+
+    def lookup(self, word: str, min_confidence: float = 0.0) -> Optional[FuzzyMatch]:
+        """
+        Closest indexed word, with confidence 1 - distance / length of the longer
+        word; None when nothing is close enough or two words tie for closest
+        """
+        if len(word) < self.min_length:
+            return None
+        best: Optional[FuzzyMatch] = None
+        tied = False
+        for candidate, distance in self.candidates(word).items():
+            confidence = 1 - distance / max(len(word), len(candidate))
+            if best is None or distance < best.distance:
+                best, tied = FuzzyMatch(candidate, distance, confidence), False
+            elif distance == best.distance:
+                tied = True
+        if best is None or tied or best.confidence < min_confidence:
+            return None
+        return best
+
+    def __len__(self) -> int:
+        return len(self._deletes)
+
+
+def build_known_words(index_words: Iterable[str], dictionary: Iterable[str], max_distance: int = 2) -> Dict:
+    """
+    Dictionary words within max_distance of an indexed word (and not indexed
+    themselves): correctly spelled words the fuzzy matcher must leave alone
+    """
+    index = SymSpellIndex(index_words, max_distance=max_distance)
+    known = sorted({
+        word for word in dictionary
+        if word.isalpha() and word not in index.words and index.candidates(word)
+    })
+    return {
+        'version': FUZZY_INDEX_VERSION,
+        'max_distance': max_distance,
+        'words': known,
+    }
+
+
+def load_known_words(path: str) -> Optional[FrozenSet[str]]:
+    """Known-words list from a file written by build_fuzzy_index, or None if missing or outdated"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load fuzzy known words {path}: {e}")
+        return None
+    if data.get('version') != FUZZY_INDEX_VERSION:
+        logger.warning(f"Fuzzy known words {path} have version {data.get('version')}, expected {FUZZY_INDEX_VERSION}")
+        return None
+    return frozenset(data.get('words', ()))
+
+
+class FuzzyMatcher:
+    """
+    Corrects words without a clip to the closest clip word (or synonym) of the
+    sign vocabulary. The deletes index is rebuilt when the vocabulary changes.
+    """
+
+    def __init__(self, vocabulary, known_words: Iterable[str] = (), extra_words: Iterable[str] = (),
+                 max_distance: int = 2, min_confidence: float = 0.75):
+        self.vocabulary = vocabulary
+        self.known_words = frozenset(known_words)
+        self.extra_words = frozenset(extra_words)
+        self.max_distance = max_distance
+        self.min_confidence = min_confidence
+        self.stats = CacheStats()
+        self._index: Optional[SymSpellIndex] = None
+        self._index_version = None
+        self._lock = threading.Lock()
+
+    def _get_index(self) -> SymSpellIndex:
+        version = self.vocabulary.version
+        index = self._index
+        if index is None or self._index_version != version:
+            with self._lock:
+                if self._index is None or self._index_version != version:
+                    words = {word for word in self.vocabulary.words if ' ' not in word} | self.extra_words
+                    self._index = SymSpellIndex(words, max_distance=self.max_distance)
+                    self._index_version = version
+                    logger.info(f"Fuzzy index built: {len(self._index.words)} words, {len(self._index)} deletes")
+                index = self._index
+        return index
+
+    def match(self, word: str) -> Optional[str]:
+        """The clip word or synonym a misspelled word was meant to be, or None"""
+        word = word.casefold()
+        if word in self.known_words:
+            return None
+        result = self._get_index().lookup(word, self.min_confidence)
+        if result is None:
+            self.stats.record_miss()
+            return None
+        self.stats.record_hit()
+        return result.word
+
+    def preload(self) -> int:
+        """Build the deletes index now instead of on the first miss; returns its size"""
+        return len(self._get_index())
+
+    def __len__(self) -> int:
+        return len(self._get_index())
+
+
+def get_fuzzy_matcher(vocabulary, synonyms=None) -> Optional[FuzzyMatcher]:
+    """Fuzzy matcher configured from the FUZZY_MATCH_* settings, or None when disabled"""
+    if not getattr(settings, 'FUZZY_MATCH_ENABLED', False):
+        return None
+    known_words = load_known_words(settings.FUZZY_KNOWN_WORDS_PATH)
+    if known_words is None:
+        # Without the list, correctly spelled words next to a clip would be rewritten
+        logger.warning("Fuzzy matching disabled: known words list missing (run manage.py build_fuzzy_index)")
+        return None
+    return FuzzyMatcher(
+        vocabulary,
+        known_words=known_words,
+        extra_words=synonyms.words if synonyms is not None else (),
+        max_distance=settings.FUZZY_MATCH_MAX_DISTANCE,
+        min_confidence=settings.FUZZY_MATCH_MIN_CONFIDENCE,
+    )
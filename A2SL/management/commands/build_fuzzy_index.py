@@ -0,0 +1,54 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from A2SL.fuzzy_match import build_known_words
+from A2SL.nlp_models import COMMON_WORDS
+from A2SL.sign_vocabulary import sign_vocabulary
+from A2SL.synonyms import SynonymIndex
+
+
+class Command(BaseCommand):
+    help = 'List the English words close to a sign clip name so fuzzy matching never "corrects" them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-distance', type=int, default=None,
+                            help='Edit distance to cover (default: settings.FUZZY_MATCH_MAX_DISTANCE)')
+        parser.add_argument('--output', default=None,
+                            help='Output path (default: settings.FUZZY_KNOWN_WORDS_PATH)')
+
+    def handle(self, *args, **options):
+        output = options['output'] or settings.FUZZY_KNOWN_WORDS_PATH
+        max_distance = options['max_distance'] or settings.FUZZY_MATCH_MAX_DISTANCE
+
+        sign_vocabulary.rebuild()
+        if not len(sign_vocabulary):
+            raise CommandError('No sign clips found in the static files; nothing to build a fuzzy index for')
+
+        index_words = {word for word in sign_vocabulary.words if ' ' not in word}
+        synonyms = SynonymIndex.load(settings.SYNONYM_INDEX_PATH)
+        if synonyms is not None:
+            index_words |= synonyms.words
+
+        try:
+            from nltk.corpus import wordnet
+            dictionary = {name for name in wordnet.all_lemma_names() if name.isalpha()}
+            for forms in wordnet._exception_map.values():
+                dictionary.update(forms)
+        except LookupError as e:
+            raise CommandError(f"WordNet is required to build the fuzzy index: {e}")
+        dictionary.update(COMMON_WORDS)
+
+        known = build_known_words(index_words, dictionary, max_distance=max_distance)
+
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        tmp_path = f"{output}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(known, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(tmp_path, output)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(known['words'])} known words near {len(index_words)} vocabulary words to {output}"
+        ))
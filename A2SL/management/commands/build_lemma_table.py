@@ -0,0 +1,49 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from A2SL.nlp_models import COMMON_WORDS, build_lemma_table
+from A2SL.sign_vocabulary import sign_vocabulary
+from A2SL.synonyms import SynonymIndex
+
+
+class Command(BaseCommand):
+    help = ('Generate the inflection -> lemma table for the sign vocabulary and its synonyms '
+            'so workers do not need to load WordNet')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None,
+                            help='Output path (default: settings.LEMMA_TABLE_PATH)')
+
+    def handle(self, *args, **options):
+        output = options['output'] or settings.LEMMA_TABLE_PATH
+
+        sign_vocabulary.rebuild()
+        if not len(sign_vocabulary):
+            raise CommandError('No sign clips found in the static files; nothing to build a lemma table for')
+
+        # Synonyms (also the fuzzy matcher's extra words) are only found once their inflections are reduced
+        words = set(sign_vocabulary.words)
+        synonyms = SynonymIndex.load(settings.SYNONYM_INDEX_PATH)
+        if synonyms is not None:
+            words.update(synonyms.words)
+        else:
+            self.stderr.write(f"No synonym index at {settings.SYNONYM_INDEX_PATH}; run build_synonym_index first")
+
+        try:
+            table = build_lemma_table(words, extra_forms=COMMON_WORDS)
+        except LookupError as e:
+            raise CommandError(f"WordNet is required to build the lemma table: {e}")
+
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        tmp_path = f"{output}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(table, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(tmp_path, output)
+
+        entries = sum(len(lemmas) for lemmas in table['lemmas'].values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {entries} inflections for {table['words']} words to {output}"
+        ))
@@ -0,0 +1,38 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from A2SL.translator_backends import parse_lexicon_tsv, write_lexicon
+
+
+class Command(BaseCommand):
+    help = 'Compile the <language>.tsv bilingual lexicons into the memory-mapped files of the offline translator'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', default=None,
+                            help='Directory of <language>.tsv lexicons (default: settings.OFFLINE_LEXICON_DIR)')
+        parser.add_argument('--output', default=None,
+                            help='Directory for the compiled <language>.lex files (default: the source directory)')
+
+    def handle(self, *args, **options):
+        source = options['source'] or settings.OFFLINE_LEXICON_DIR
+        output = options['output'] or source
+
+        try:
+            names = sorted(name for name in os.listdir(source) if name.endswith('.tsv'))
+        except OSError as e:
+            raise CommandError(f"Could not read lexicons: {e}")
+        if not names:
+            raise CommandError(f"No <language>.tsv lexicons in {source}")
+
+        os.makedirs(output, exist_ok=True)
+        for name in names:
+            language = name[:-len('.tsv')]
+            with open(os.path.join(source, name), encoding='utf-8') as f:
+                entries = parse_lexicon_tsv(f)
+            path = os.path.join(output, f"{language}.lex")
+            size = write_lexicon(entries, path)
+            self.stdout.write(f"{language}: {len(entries)} entries, {size} bytes")
+
+        self.stdout.write(self.style.SUCCESS(f"Compiled {len(names)} lexicons to {output}"))
@@ -0,0 +1,67 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from A2SL.fast_tokenizer import alpha_word_tokenize
+from A2SL.nlp_models import build_pos_lexicon, pos_tagger
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'pos_reference_corpus.txt')
+
+
+class Command(BaseCommand):
+    help = 'Tag a reference corpus with the perceptron tagger and write the word -> tag class lexicon used by the POS fast path'
+    # The missing-lexicon check must not stop the command that builds it
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', action='append', default=None,
+                            help='Text file with one utterance per line (repeatable; default: the bundled reference corpus)')
+        parser.add_argument('--nltk-corpus', action='append', default=[],
+                            help='Also tag the sentences of an installed NLTK corpus, e.g. brown')
+        parser.add_argument('--min-count', type=int, default=2,
+                            help='Minimum number of occurrences for a word to enter the lexicon')
+        parser.add_argument('--output', default=None,
+                            help='Output path (default: settings.POS_LEXICON_PATH)')
+
+    def _read_sentences(self, corpus_paths, nltk_corpora):
+        # Input is lowercased before tagging at runtime, so the corpus is too
+        for path in corpus_paths:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        yield alpha_word_tokenize(line.lower())
+        for name in nltk_corpora:
+            import nltk.corpus
+            try:
+                corpus = getattr(nltk.corpus, name)
+                for sentence in corpus.sents():
+                    yield [word.lower() for word in sentence if word.isalpha()]
+            except (AttributeError, LookupError) as e:
+                raise CommandError(f"NLTK corpus '{name}' is not available: {e}")
+
+    def handle(self, *args, **options):
+        corpus_paths = options['corpus'] or [DEFAULT_CORPUS]
+        output = options['output'] or settings.POS_LEXICON_PATH
+
+        try:
+            lexicon = build_pos_lexicon(
+                self._read_sentences(corpus_paths, options['nltk_corpus']),
+                pos_tagger,
+                min_count=options['min_count'],
+            )
+        except (OSError, LookupError) as e:
+            raise CommandError(f"Could not build the POS lexicon: {e}")
+
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        tmp_path = f"{output}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(lexicon, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(tmp_path, output)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(lexicon['words'])} words ({lexicon['ambiguous']} ambiguous skipped) "
+            f"from {lexicon['sentences']} sentences to {output}"
+        ))
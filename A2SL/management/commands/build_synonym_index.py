@@ -0,0 +1,50 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from A2SL.sign_vocabulary import sign_vocabulary
+from A2SL.synonyms import build_synonym_index, parse_curated_synonyms
+
+
+class Command(BaseCommand):
+    help = 'Generate the synonym -> clip index from WordNet and the curated list so fewer words are fingerspelled'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--curated', default=None,
+                            help='Curated synonyms file (default: settings.SYNONYM_CURATED_PATH)')
+        parser.add_argument('--no-wordnet', action='store_true',
+                            help='Only use the curated list')
+        parser.add_argument('--output', default=None,
+                            help='Output path (default: settings.SYNONYM_INDEX_PATH)')
+
+    def handle(self, *args, **options):
+        output = options['output'] or settings.SYNONYM_INDEX_PATH
+        curated_path = options['curated'] or settings.SYNONYM_CURATED_PATH
+
+        sign_vocabulary.rebuild()
+        if not len(sign_vocabulary):
+            raise CommandError('No sign clips found in the static files; nothing to build a synonym index for')
+
+        try:
+            with open(curated_path, encoding='utf-8') as f:
+                curated = parse_curated_synonyms(f)
+        except OSError as e:
+            raise CommandError(f"Could not read curated synonyms: {e}")
+
+        try:
+            index = build_synonym_index(sign_vocabulary.words, curated, use_wordnet=not options['no_wordnet'])
+        except LookupError as e:
+            raise CommandError(f"WordNet is required to build the synonym index (or pass --no-wordnet): {e}")
+
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        tmp_path = f"{output}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(tmp_path, output)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(index['synonyms'])} synonyms for {index['words']} words to {output}"
+        ))
+
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from A2SL.translation_service import translation_service
+
+
+class Command(BaseCommand):
+    help = 'Evict expired and excess entries from the on-disk translation cache and reclaim disk space'
+
+    def handle(self, *args, **options):
+        cache = translation_service.cache
+        if cache is None or not hasattr(cache, 'compact'):
+            backend = getattr(cache, 'backend_name', 'none')
+            raise CommandError(f"Translation cache backend '{backend}' does not support compaction (use TRANSLATION_CACHE_BACKEND=sqlite)")
+
+        result = cache.compact()
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {result['removed']} entries, {result['entries']} remain; "
+            f"{result['bytes_before']} -> {result['bytes_after']} bytes"
+        ))
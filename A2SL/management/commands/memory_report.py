@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from A2SL.preload import memory_report
+
+
+class Command(BaseCommand):
+    help = 'Show RSS, PSS and unique (private) memory of a gunicorn master and each of its workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pid', type=int, help='PID of the gunicorn master')
+
+    def handle(self, *args, **options):
+        report = memory_report(options['pid'])
+        if not report:
+            raise CommandError(f"No memory information for process {options['pid']} (Linux /proc is required)")
+
+        self.stdout.write(f"{'PID':>8} {'ROLE':<7} {'RSS MB':>9} {'PSS MB':>9} {'UNIQUE MB':>10} {'SHARED MB':>10}")
+        for process in report:
+            self.stdout.write(
+                f"{process['pid']:>8} {process['role']:<7} {process['rss'] / 1e6:>9.1f} {process['pss'] / 1e6:>9.1f} "
+                f"{process['unique'] / 1e6:>10.1f} {process['shared'] / 1e6:>10.1f}"
+            )
+        workers = [process for process in report if process['role'] == 'worker']
+        if workers:
+            average_unique = sum(process['unique'] for process in workers) / len(workers)
+            self.stdout.write(self.style.SUCCESS(
+                f"{len(workers)} workers, {average_unique / 1e6:.1f} MB unique per worker, "
+                f"{sum(process['pss'] for process in report) / 1e6:.1f} MB total PSS"
+            ))
@@ -0,0 +1,419 @@
+"""
+Shared NLP Models
+Process-wide NLTK models that are loaded once per worker instead of per request
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from cachetools import LRUCache
+from django.conf import settings
+from nltk.stem import WordNetLemmatizer
+from nltk.tag.perceptron import PerceptronTagger
+
+from .caching import CacheStats
+from .nltk_resources import nltk_resources
+
+logger = logging.getLogger(__name__)
+
+
+class SharedPOSTagger:
+    """
+    Lazily loaded perceptron tagger shared across threads.
+    nltk.pos_tag() in nltk 3.7 unpickles a new PerceptronTagger on every call;
+    tagging with an already loaded model only reads its weights, so one
+    instance can serve every thread once loading is serialized.
+    """
+
+    def __init__(self, loader: Optional[Callable[[], PerceptronTagger]] = None):
+        self._loader = loader or partial(nltk_resources.get, 'averaged_perceptron_tagger')
+        self._tagger: Optional[PerceptronTagger] = None
+        self._lock = threading.Lock()
+        self.load_time: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._tagger is not None
+
+    def get_tagger(self) -> PerceptronTagger:
+        """Return the shared tagger, loading the model on first use"""
+        tagger = self._tagger
+        if tagger is None:
+            with self._lock:
+                if self._tagger is None:
+                    start_time = time.perf_counter()
+                    self._tagger = self._loader()
+                    self.load_time = time.perf_counter() - start_time
+                    logger.info(f"POS tagger loaded in {self.load_time * 1000:.1f} ms")
+                tagger = self._tagger
+        return tagger
+
+    def tag(self, tokens: Sequence[str]) -> List[Tuple[str, str]]:
+        """Tag a single tokenized sentence (same output as nltk.pos_tag)"""
+        if isinstance(tokens, str):
+            raise TypeError('tokens: expected a list of strings, got a string')
+        if not tokens:
+            return []
+        return self.get_tagger().tag(tokens)
+
+    def tag_sents(self, sentences: Sequence[Sequence[str]]) -> List[List[Tuple[str, str]]]:
+        """Tag several tokenized sentences with one model lookup (same output as nltk.pos_tag_sents)"""
+        tagger = self.get_tagger()
+        return [tagger.tag(tokens) if tokens else [] for tokens in sentences]
+
+
+# Initialize global POS tagger (model is loaded on first use)
+pos_tagger = SharedPOSTagger()
+
+
+# The sign pipeline only distinguishes these buckets of Penn Treebank tags
+# (modal, present, present participle, past, NN, adjective/comparative);
+# each tag maps to one representative tag of its bucket
+TAG_CLASSES = {
+    'MD': 'MD',
+    'VBP': 'VBP',
+    'VBZ': 'VBZ',
+    'VBG': 'VBG',
+    'VBD': 'VBD', 'VBN': 'VBD',
+    'NN': 'NN',
+    'JJ': 'JJ', 'JJR': 'JJ', 'JJS': 'JJ', 'RBR': 'JJ', 'RBS': 'JJ',
+}
+# Representative tag for every other tag (lemmatized as a noun, no tense)
+OTHER_TAG_CLASS = 'X'
+
+POS_LEXICON_VERSION = 1
+
+
+def tag_class(tag: str) -> str:
+    return TAG_CLASSES.get(tag, OTHER_TAG_CLASS)
+
+
+def build_pos_lexicon(sentences: Iterable[Sequence[str]], tagger, min_count: int = 2) -> Dict:
+    """
+    Tag a reference corpus and keep the words that always received the same
+    tag class (and were seen at least min_count times)
+    """
+    observed: Dict[str, Counter] = defaultdict(Counter)
+    sentence_count = 0
+    for tokens in sentences:
+        if not tokens:
+            continue
+        sentence_count += 1
+        for word, tag in tagger.tag(list(tokens)):
+            observed[word][tag_class(tag)] += 1
+
+    words = {}
+    ambiguous = 0
+    for word, classes in observed.items():
+        if len(classes) > 1:
+            ambiguous += 1
+        elif sum(classes.values()) >= min_count:
+            words[word] = next(iter(classes))
+
+    return {
+        'version': POS_LEXICON_VERSION,
+        'sentences': sentence_count,
+        'ambiguous': ambiguous,
+        'words': dict(sorted(words.items())),
+    }
+
+
+class LexiconPOSTagger:
+    """
+    Tags sentences whose words are all unambiguous in a precomputed
+    word -> tag class lexicon without running the perceptron; any sentence
+    with an unknown or ambiguous word goes to the full tagger. Tags returned
+    by the fast path are the representative tags of TAG_CLASSES.
+    """
+
+    def __init__(self, tagger: SharedPOSTagger = pos_tagger, path: Optional[str] = None,
+                 lexicon: Optional[Dict[str, str]] = None):
+        self.tagger = tagger
+        self._path = path
+        self._lexicon = lexicon
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.fast_path = 0
+        self.full_tagger = 0
+
+    def _get_path(self) -> Optional[str]:
+        if self._path is not None:
+            return self._path
+        if not getattr(settings, 'POS_LEXICON_ENABLED', True):
+            return None
+        return getattr(settings, 'POS_LEXICON_PATH', None)
+
+    def get_lexicon(self) -> Dict[str, str]:
+        """Return the word -> tag class lexicon, loading it on first use (empty if missing)"""
+        lexicon = self._lexicon
+        if lexicon is None:
+            with self._lock:
+                if self._lexicon is None:
+                    self._lexicon = self._load(self._get_path())
+                lexicon = self._lexicon
+        return lexicon
+
+    @staticmethod
+    def _load(path: Optional[str]) -> Dict[str, str]:
+        if not path:
+            return {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            logger.error(f"POS lexicon {path} not found; every sentence uses the full tagger (run manage.py build_pos_lexicon)")
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load POS lexicon {path}: {e}")
+            return {}
+        if data.get('version') != POS_LEXICON_VERSION:
+            logger.warning(f"POS lexicon {path} has version {data.get('version')}, expected {POS_LEXICON_VERSION}; ignoring it")
+            return {}
+        words = data.get('words', {})
+        logger.info(f"POS lexicon loaded with {len(words)} words from {os.path.basename(path)}")
+        return words
+
+    def tag(self, tokens: Sequence[str]) -> List[Tuple[str, str]]:
+        if isinstance(tokens, str):
+            raise TypeError('tokens: expected a list of strings, got a string')
+        if not tokens:
+            return []
+        lexicon = self.get_lexicon()
+        try:
+            tagged = [(token, lexicon[token]) for token in tokens]
+        except KeyError:
+            with self._stats_lock:
+                self.full_tagger += 1
+            return self.tagger.tag(tokens)
+        with self._stats_lock:
+            self.fast_path += 1
+        return tagged
+
+    def tag_sents(self, sentences: Sequence[Sequence[str]]) -> List[List[Tuple[str, str]]]:
+        return [self.tag(tokens) for tokens in sentences]
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            fast_path, full_tagger = self.fast_path, self.full_tagger
+        total = fast_path + full_tagger
+        return {
+            'lexicon_words': len(self.get_lexicon()),
+            'fast_path': fast_path,
+            'full_tagger': full_tagger,
+            'fast_path_rate': round(fast_path / total, 4) if total else 0.0,
+        }
+
+
+# Initialize global lexicon tagger (lexicon is loaded on first use)
+lexicon_tagger = LexiconPOSTagger()
+
+
+# Frequent words in short everyday utterances, lemmatized ahead of time during warm-up
+COMMON_WORDS = (
+    'am', 'are', 'is', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having',
+    'do', 'does', 'did', 'doing', 'done', 'go', 'goes', 'going', 'went', 'gone', 'come', 'comes',
+    'coming', 'came', 'eat', 'eats', 'eating', 'ate', 'eaten', 'see', 'sees', 'seeing', 'saw', 'seen',
+    'make', 'makes', 'making', 'made', 'get', 'gets', 'getting', 'got', 'take', 'takes', 'taking',
+    'took', 'taken', 'give', 'gives', 'giving', 'gave', 'given', 'know', 'knows', 'knew', 'known',
+    'think', 'thinks', 'thinking', 'thought', 'say', 'says', 'said', 'tell', 'tells', 'told',
+    'want', 'wants', 'wanted', 'need', 'needs', 'needed', 'like', 'likes', 'liked', 'love', 'loves',
+    'loved', 'help', 'helps', 'helping', 'helped', 'work', 'works', 'working', 'worked', 'study',
+    'studies', 'studying', 'studied', 'learn', 'learns', 'learning', 'learned', 'learnt', 'talk',
+    'talks', 'talking', 'talked', 'walk', 'walks', 'walking', 'walked', 'play', 'plays', 'playing',
+    'played', 'read', 'reads', 'reading', 'write', 'writes', 'writing', 'wrote', 'written', 'sing',
+    'sings', 'singing', 'sang', 'laugh', 'laughs', 'laughing', 'laughed', 'wash', 'washing', 'washed',
+    'stay', 'stays', 'staying', 'stayed', 'keep', 'keeps', 'keeping', 'kept', 'finish', 'finished',
+    'change', 'changed', 'ask', 'asked', 'fight', 'fought', 'invent', 'invented', 'welcome',
+    'hello', 'hi', 'bye', 'thank', 'thanks', 'please', 'sorry', 'yes', 'no', 'not', 'good', 'better',
+    'best', 'bad', 'worse', 'worst', 'great', 'happy', 'happier', 'sad', 'sadder', 'pretty',
+    'prettier', 'beautiful', 'busy', 'busier', 'safe', 'safer', 'right', 'wrong', 'more', 'most',
+    'i', 'me', 'my', 'you', 'your', 'we', 'us', 'our', 'they', 'them', 'he', 'she', 'his', 'her',
+    'it', 'this', 'that', 'those', 'these', 'what', 'when', 'where', 'which', 'who', 'whose', 'why',
+    'how', 'name', 'names', 'day', 'days', 'time', 'times', 'home', 'homes', 'college', 'colleges',
+    'computer', 'computers', 'engineer', 'engineers', 'hand', 'hands', 'word', 'words', 'language',
+    'languages', 'world', 'sign', 'signs', 'food', 'water', 'friend', 'friends', 'family', 'school',
+    'teacher', 'teachers', 'student', 'students', 'book', 'books', 'morning', 'night', 'today',
+    'tomorrow', 'yesterday', 'now', 'here', 'there', 'again', 'also', 'alone', 'after', 'before',
+)
+
+# Tag classes used by the sign pipeline when choosing a WordNet part of speech
+LEMMA_POS = ('n', 'v', 'a')
+
+
+class CachedLemmatizer:
+    """
+    WordNet lemmatizer instantiated once, with a bounded cache of
+    (word, part of speech) -> lemma shared by all requests
+    """
+
+    backend_name = 'wordnet'
+
+    def __init__(self, max_size: int = 50000, lemmatizer: Optional[WordNetLemmatizer] = None):
+        # WordNetLemmatizer reads nltk.corpus.wordnet, which must be loaded through the registry first
+        self._uses_wordnet = lemmatizer is None
+        self._lemmatizer = lemmatizer or WordNetLemmatizer()
+        self._cache = LRUCache(maxsize=max_size)
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def lemmatize(self, word: str, pos: str = 'n') -> str:
+        key = (word, pos)
+        with self._lock:
+            lemma = self._cache.get(key)
+        if lemma is not None:
+            self.stats.record_hit()
+            return lemma
+
+        self.stats.record_miss()
+        lemma = self._get_lemmatizer().lemmatize(word, pos=pos)
+        with self._lock:
+            self._cache[key] = lemma
+        return lemma
+
+    def _get_lemmatizer(self) -> WordNetLemmatizer:
+        if self._uses_wordnet:
+            nltk_resources.get('wordnet')
+        return self._lemmatizer
+
+    def preload(self, words: Iterable[str] = COMMON_WORDS, pos_tags: Sequence[str] = LEMMA_POS) -> int:
+        """Fill the cache for the given words in every tag class; returns the number of entries added"""
+        lemmatizer = self._get_lemmatizer()
+        added = 0
+        for word in words:
+            for pos in pos_tags:
+                key = (word, pos)
+                if key in self._cache:
+                    continue
+                lemma = lemmatizer.lemmatize(word, pos=pos)
+                with self._lock:
+                    self._cache[key] = lemma
+                added += 1
+        return added
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+
+LEMMA_TABLE_VERSION = 1
+
+
+class LemmaTable:
+    """
+    Inflection -> lemma table generated by `manage.py build_lemma_table` for the
+    words that can reach a sign clip; any other word is its own lemma.
+    Replaces WordNet at runtime, so the corpus is never loaded into the worker.
+    """
+
+    backend_name = 'table'
+
+    def __init__(self, tables: Dict[str, Dict[str, str]]):
+        self._tables = {pos: dict(tables.get(pos, {})) for pos in LEMMA_POS}
+        self.stats = CacheStats()
+
+    @classmethod
+    def load(cls, path: str) -> Optional['LemmaTable']:
+        """Load a table file, or return None if it is missing or was built by another version"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load lemma table {path}: {e}")
+            return None
+        if data.get('version') != LEMMA_TABLE_VERSION:
+            logger.warning(f"Lemma table {path} has version {data.get('version')}, expected {LEMMA_TABLE_VERSION}")
+            return None
+        return cls(data.get('lemmas', {}))
+
+    def lemmatize(self, word: str, pos: str = 'n') -> str:
+        lemma = self._tables[pos].get(word)
+        if lemma is None:
+            self.stats.record_miss()
+            return word
+        self.stats.record_hit()
+        return lemma
+
+    def preload(self, *args, **kwargs) -> int:
+        """Nothing to load; the whole table is in memory"""
+        return 0
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._tables.values())
+
+
+def inflection_candidates(lemma: str) -> Set[str]:
+    """Regular noun, verb and adjective inflections of a lemma (WordNet exceptions are added separately)"""
+    if len(lemma) < 2:
+        return set()
+    forms = {lemma + 's', lemma + 'ing'}
+    if lemma.endswith('e'):
+        forms.update({lemma + 'd', lemma + 'r', lemma + 'st', lemma[:-1] + 'ing'})
+    else:
+        forms.update({lemma + 'ed', lemma + 'er', lemma + 'est'})
+    if lemma.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+        forms.add(lemma + 'es')
+    if lemma.endswith('y') and lemma[-2] not in 'aeiou':
+        forms.update({lemma[:-1] + 'ies', lemma[:-1] + 'ied', lemma[:-1] + 'ier', lemma[:-1] + 'iest'})
+    if len(lemma) > 2 and lemma[-1] not in 'aeiouwxy' and lemma[-2] in 'aeiou' and lemma[-3] not in 'aeiou':
+        # Doubled final consonant (stop -> stopped, big -> bigger)
+        doubled = lemma + lemma[-1]
+        forms.update({doubled + 'ed', doubled + 'ing', doubled + 'er', doubled + 'est'})
+    return forms
+
+
+def build_lemma_table(words: Iterable[str], extra_forms: Iterable[str] = (),
+                      lemmatizer: Optional[WordNetLemmatizer] = None) -> Dict:
+    """
+    Lemmatize, with WordNet, every word, its regular inflections, the WordNet
+    irregular forms of it, and the extra forms; keep the pairs where the
+    lemma differs from the form
+    """
+    from nltk.corpus import wordnet
+
+    lemmatizer = lemmatizer or WordNetLemmatizer()
+    lemmas = {word for word in words if word.isalpha()}
+
+    forms = set(lemmas)
+    forms.update(form for form in extra_forms if form.isalpha())
+    for lemma in lemmas:
+        forms.update(inflection_candidates(lemma))
+    for pos in LEMMA_POS:
+        for form, bases in wordnet._exception_map[pos].items():
+            if lemmas.intersection(bases):
+                forms.add(form)
+
+    tables = {pos: {} for pos in LEMMA_POS}
+    for form in sorted(forms):
+        for pos in LEMMA_POS:
+            lemma = lemmatizer.lemmatize(form, pos=pos)
+            if lemma != form:
+                tables[pos][form] = lemma
+
+    return {
+        'version': LEMMA_TABLE_VERSION,
+        'words': len(lemmas),
+        'lemmas': tables,
+    }
+
+
+def get_lemmatizer():
+    """Lemma table when LEMMATIZER_BACKEND is 'table' and the table exists, otherwise cached WordNet"""
+    backend = getattr(settings, 'LEMMATIZER_BACKEND', 'wordnet')
+    if backend == 'table':
+        table = LemmaTable.load(settings.LEMMA_TABLE_PATH)
+        if table is not None:
+            logger.info(f"Lemma table loaded with {len(table)} entries")
+            return table
+        logger.warning("Falling back to WordNet lemmatization (run manage.py build_lemma_table)")
+    elif backend != 'wordnet':
+        logger.warning(f"Unknown LEMMATIZER_BACKEND '{backend}', using WordNet")
+    return CachedLemmatizer()
+
+
+# Initialize global lemmatizer (the table is read now; WordNet would be loaded on first use)
+lemmatizer = get_lemmatizer()
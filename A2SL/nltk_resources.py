@@ -0,0 +1,141 @@
+"""
+NLTK Resource Registry
+The NLTK data used by the sign pipeline (punkt, the perceptron tagger and
+WordNet), each loaded once per process behind its own lock.
+
+NLTK's own loaders are not safe on first use from several threads: the
+LazyCorpusLoader behind nltk.corpus.wordnet swaps its class and __dict__
+while loading, so a second thread can see a half-loaded corpus, and
+nltk.data.load() may unpickle the same punkt model twice. The registry
+resolves each resource exactly once (at warm-up or preload, or otherwise on
+first use) and hands the loaded object to every thread.
+"""
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import nltk
+from nltk.tag.perceptron import PerceptronTagger
+
+logger = logging.getLogger(__name__)
+
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def _load_punkt():
+    return nltk.data.load('tokenizers/punkt/english.pickle')
+
+
+def _load_perceptron_tagger():
+    return PerceptronTagger()
+
+
+def _load_wordnet():
+    from nltk.corpus import wordnet
+    # Turns the module-level LazyCorpusLoader into the corpus reader, which WordNetLemmatizer uses directly
+    wordnet.ensure_loaded()
+    return wordnet
+
+
+def _summarize(error: LookupError) -> str:
+    """First line of NLTK's boxed 'Resource ... not found' message"""
+    for line in _ANSI_RE.sub('', str(error)).splitlines():
+        line = line.strip(' *')
+        if line:
+            return line
+    return repr(error)
+
+
+class NLTKResourceRegistry:
+    """
+    Named NLTK resources with their loaders. get() loads a resource on first
+    use; concurrent callers wait for that load instead of starting their own.
+    A missing resource raises LookupError (like NLTK) and is retried on the
+    next call, so data installed later is picked up.
+    """
+
+    def __init__(self, loaders: Optional[Dict[str, Callable[[], Any]]] = None):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._resources: Dict[str, Any] = {}
+        self._load_times: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        for name, loader in (loaders or {}).items():
+            self.register(name, loader)
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+        self._resources.pop(name, None)
+
+    def names(self) -> List[str]:
+        return list(self._loaders)
+
+    def loaded(self, name: str) -> bool:
+        return name in self._resources
+
+    def get(self, name: str) -> Any:
+        """The loaded resource, loading it on first use"""
+        try:
+            return self._resources[name]
+        except KeyError:
+            pass
+        if name not in self._loaders:
+            raise LookupError(f"Unknown NLTK resource '{name}'")
+
+        with self._locks[name]:
+            if name not in self._resources:
+                start_time = time.perf_counter()
+                try:
+                    resource = self._loaders[name]()
+                except LookupError as e:
+                    self._errors[name] = _summarize(e)
+                    raise
+                self._load_times[name] = time.perf_counter() - start_time
+                self._errors.pop(name, None)
+                self._resources[name] = resource
+                logger.info(f"NLTK resource '{name}' loaded in {self._load_times[name] * 1000:.1f} ms")
+        return self._resources[name]
+
+    def resolve(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Load the named resources (all by default) now; returns name -> None
+        for loaded resources or the error for missing ones
+        """
+        results = {}
+        for name in names if names is not None else self.names():
+            try:
+                self.get(name)
+                results[name] = None
+            except LookupError:
+                results[name] = self._errors.get(name, 'not found')
+                logger.warning(f"NLTK resource '{name}' is not available: {results[name]}")
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            name: {
+                'loaded': name in self._resources,
+                'load_ms': round(self._load_times[name] * 1000, 1) if name in self._load_times else None,
+                'error': self._errors.get(name),
+            }
+            for name in self._loaders
+        }
+
+
+# Initialize global registry (nothing is loaded until warm-up, preload or first use)
+nltk_resources = NLTKResourceRegistry({
+    'punkt': _load_punkt,
+    'averaged_perceptron_tagger': _load_perceptron_tagger,
+    'wordnet': _load_wordnet,
+})
+
+
+def pipeline_resources(lemmatizer_backend: str) -> List[str]:
+    """Resources the sign pipeline needs: WordNet only with the WordNet lemmatizer"""
+    names = ['punkt', 'averaged_perceptron_tagger']
+    if lemmatizer_backend == 'wordnet':
+        names.append('wordnet')
+    return names
@@ -0,0 +1,250 @@
+"""
+Multilingual Phrase Table
+Curated per-language phrase mappings loaded once from the versioned files in
+A2SL/data/phrases/ and compiled into Aho-Corasick automata, so matching a text
+against any number of phrases is a single pass over the text:
+
+- exact:    whole utterance -> English translation (skips the upstream)
+- contains: phrase anywhere in the text -> English translation of the whole text
+- source:   corrections applied to the source text before translation
+- english:  corrections applied to the English translation
+"""
+import json
+import logging
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PHRASE_TABLE_VERSION = 1
+
+# Punctuation ignored around exact-match utterances (including the danda used by Indic scripts)
+_EDGE_PUNCTUATION = ' \t\r\n.,!?;:"\'।॥'
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_utterance(text: str) -> str:
+    """Key for exact matches: NFC, case-folded, single spaces, no surrounding punctuation"""
+    text = unicodedata.normalize('NFC', text)
+    return _WHITESPACE_RE.sub(' ', text.strip(_EDGE_PUNCTUATION)).casefold()
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a fixed list of patterns. Searching reports
+    every occurrence of every pattern in one pass, whatever the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Pattern ids ending at each state, including those reached through failure links
+        self._output: List[List[int]] = [[]]
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(len(self.patterns))
+            self.patterns.append(pattern)
+
+        # Breadth-first pass to set failure links
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, pattern id) for every occurrence, ordered by end position"""
+        if not self.patterns:
+            return
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self.patterns
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield end - len(patterns[pattern_id]), end, pattern_id
+
+    def leftmost_longest(self, text: str) -> List[Tuple[int, int, int]]:
+        """Non-overlapping occurrences, preferring the earliest start and then the longest pattern"""
+        matches = sorted(self.finditer(text), key=lambda match: (match[0], match[0] - match[1]))
+        selected = []
+        position = 0
+        for start, end, pattern_id in matches:
+            if start >= position:
+                selected.append((start, end, pattern_id))
+                position = end
+        return selected
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+class PhraseReplacer:
+    """Replaces every occurrence of the mapped phrases in a single left-to-right pass"""
+
+    def __init__(self, replacements: Dict[str, str]):
+        self._automaton = AhoCorasick(replacements)
+        self._replacements = [replacements[pattern] for pattern in self._automaton.patterns]
+
+    def replace(self, text: str) -> Tuple[str, List[str]]:
+        """Return the replaced text and the phrases that were replaced"""
+        matches = self._automaton.leftmost_longest(text)
+        if not matches:
+            return text, []
+        parts = []
+        position = 0
+        for start, end, pattern_id in matches:
+            parts.append(text[position:start])
+            parts.append(self._replacements[pattern_id])
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts), [self._automaton.patterns[pattern_id] for _, _, pattern_id in matches]
+
+    def __len__(self) -> int:
+        return len(self._automaton)
+
+
+class PhraseTable:
+    """
+    Compiled phrase mappings of one language
+    """
+
+    def __init__(self, language: str, exact: Dict[str, str] = None, contains: Dict[str, str] = None,
+                 source: Dict[str, str] = None, english: Dict[str, str] = None):
+        self.language = language
+        self._exact = {normalize_utterance(phrase): translation for phrase, translation in (exact or {}).items()}
+        # The first listed 'contains' phrase found in the text wins
+        contains = contains or {}
+        self._contains = AhoCorasick(contains)
+        self._contains_translations = [contains[pattern] for pattern in self._contains.patterns]
+        self._source = PhraseReplacer(source or {})
+        self._english = PhraseReplacer(english or {})
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PhraseTable':
+        return cls(
+            data['language'],
+            exact=data.get('exact'),
+            contains=data.get('contains'),
+            source=data.get('source'),
+            english=data.get('english'),
+        )
+
+    def translate(self, text: str) -> Optional[str]:
+        """Curated English translation of the text, or None if no phrase applies"""
+        translation = self._exact.get(normalize_utterance(text))
+        if translation is not None:
+            return translation
+        best = None
+        for _, _, pattern_id in self._contains.finditer(text):
+            if best is None or pattern_id < best:
+                best = pattern_id
+        return self._contains_translations[best] if best is not None else None
+
+    def correct_source(self, text: str) -> str:
+        """Apply the source-text corrections before translation"""
+        corrected, phrases = self._source.replace(text)
+        if phrases:
+            logger.info(f"Applied {self.language} source corrections: {phrases}")
+        return corrected
+
+    def correct_english(self, text: str) -> str:
+        """Apply the corrections for known mistranslations to the English text"""
+        corrected, phrases = self._english.replace(text)
+        if phrases:
+            logger.info(f"Applied {self.language} post-corrections: {phrases}")
+        return corrected
+
+    def __len__(self) -> int:
+        return len(self._exact) + len(self._contains) + len(self._source) + len(self._english)
+
+
+def load_phrase_tables(directory: str) -> Dict[str, PhraseTable]:
+    """Load every <language>.json phrase file in a directory, skipping unreadable or outdated ones"""
+    tables = {}
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError as e:
+        logger.warning(f"Could not read phrase tables from {directory}: {e}")
+        return tables
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load phrase table {path}: {e}")
+            continue
+        if data.get('version') != PHRASE_TABLE_VERSION:
+            logger.warning(f"Phrase table {path} has version {data.get('version')}, expected {PHRASE_TABLE_VERSION}")
+            continue
+        table = PhraseTable.from_dict(data)
+        tables[table.language] = table
+    logger.info(f"Loaded phrase tables for {len(tables)} languages ({sum(map(len, tables.values()))} phrases)")
+    return tables
+
+
+class PhraseTables:
+    """
+    Phrase tables of every language, loaded on first use
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+        self._tables: Optional[Dict[str, PhraseTable]] = None
+
+    def _get_tables(self) -> Dict[str, PhraseTable]:
+        tables = self._tables
+        if tables is None:
+            # Concurrent first calls may both load; the tables are identical
+            tables = self._tables = load_phrase_tables(self._directory or settings.PHRASE_TABLE_DIR)
+        return tables
+
+    def get(self, language: str) -> Optional[PhraseTable]:
+        return self._get_tables().get(language)
+
+    def translate(self, text: str, language: str) -> Optional[str]:
+        table = self.get(language)
+        return table.translate(text) if table is not None else None
+
+    def correct_source(self, text: str, language: str) -> str:
+        table = self.get(language)
+        return table.correct_source(text) if table is not None else text
+
+    def correct_english(self, text: str, language: str) -> str:
+        table = self.get(language)
+        return table.correct_english(text) if table is not None else text
+
+    def languages(self) -> List[str]:
+        return sorted(self._get_tables())
+
+    def stats(self) -> Dict[str, int]:
+        return {language: len(table) for language, table in self._get_tables().items()}
+
+
+# Initialize global phrase tables (read on first use)
+phrase_tables = PhraseTables()
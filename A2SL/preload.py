@@ -0,0 +1,315 @@
+"""
+Preload and Copy-on-Write Sharing
+Loads the read-only NLP tables in the gunicorn master before it forks and
+repacks the largest ones into anonymous shared mappings, so worker processes
+keep sharing their pages instead of copying them as refcounts and the garbage
+collector write to the objects
+"""
+import gc
+import logging
+import mmap
+import os
+import time
+import zlib
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+from nltk.tag.perceptron import AveragedPerceptron
+
+logger = logging.getLogger(__name__)
+
+
+def shared_array(typecode: str, values: Iterable) -> memoryview:
+    """
+    Copy values into an anonymous shared mapping and return a typed view of it.
+    Reading an element creates a new Python object in the reading process and
+    never writes to the mapping, so the pages stay shared after fork.
+    """
+    data = array(typecode, values)
+    size = len(data) * data.itemsize
+    buffer = mmap.mmap(-1, max(size, 1))
+    buffer.write(data.tobytes())
+    return memoryview(buffer)[:size].cast(typecode)
+
+
+class SharedKeyIndex:
+    """
+    Read-only str -> row number index for the shared tables: the UTF-8 keys in
+    one shared blob with their offsets, and an open-addressing hash table of
+    rows (crc32 of the key, linear probing) in a shared array. A dict of ints
+    would be copied into every worker as lookups bump its refcounts.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        encoded = [key.encode('utf-8', 'surrogatepass') for key in keys]
+        offsets = array('q', [0])
+        blob = bytearray()
+        for key in encoded:
+            blob += key
+            offsets.append(len(blob))
+        # At most half full, so probe sequences stay short
+        size = 1
+        while size < 2 * len(encoded):
+            size *= 2
+        mask = size - 1
+        table = array('q', [-1]) * size
+        for row, key in enumerate(encoded):
+            slot = zlib.crc32(key) & mask
+            while table[slot] != -1:
+                slot = (slot + 1) & mask
+            table[slot] = row
+        self._count = len(encoded)
+        self._mask = mask
+        self._offsets = shared_array('q', offsets)
+        # The mapping itself rather than a view: slicing it gives bytes, the fastest to compare
+        self._keys = shared_array('B', bytes(blob)).obj
+        self._table = shared_array('q', table)
+
+    def get(self, key: str) -> Optional[int]:
+        """Row number of a key, or None"""
+        target = key.encode('utf-8', 'surrogatepass')
+        offsets, keys, table, mask = self._offsets, self._keys, self._table, self._mask
+        slot = zlib.crc32(target) & mask
+        while True:
+            row = table[slot]
+            if row == -1:
+                return None
+            if keys[offsets[row]:offsets[row + 1]] == target:
+                return row
+            slot = (slot + 1) & mask
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+    def __iter__(self):
+        offsets, keys = self._offsets, self._keys
+        for row in range(self._count):
+            yield str(keys[offsets[row]:offsets[row + 1]], 'utf-8', 'surrogatepass')
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self._offsets.nbytes + len(self._keys) + self._table.nbytes
+
+
+class SharedProbabilityMap(Mapping):
+    """
+    Read-only replacement for langdetect's word -> [probability per language]
+    map, with all probabilities in one shared matrix of doubles
+    """
+
+    def __init__(self, word_lang_prob_map: Dict[str, List[float]], langsize: int):
+        self._langsize = langsize
+        self._rows = SharedKeyIndex(word_lang_prob_map)
+        values = array('d')
+        for probabilities in word_lang_prob_map.values():
+            values.extend(probabilities)
+        self._matrix = shared_array('d', values)
+
+    def __getitem__(self, word: str) -> memoryview:
+        row = self._rows.get(word)
+        if row is None:
+            raise KeyError(word)
+        start = row * self._langsize
+        return self._matrix[start:start + self._langsize]
+
+    def __contains__(self, word) -> bool:
+        return word in self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def nbytes(self) -> int:
+        return self._matrix.nbytes + self._rows.nbytes
+
+
+class SharedAveragedPerceptron(AveragedPerceptron):
+    """
+    Prediction-only copy of a trained AveragedPerceptron whose feature weights
+    are packed into shared arrays (label index and weight per entry, rows
+    found through a SharedKeyIndex) instead of a dict of dicts of floats.
+    Scores are summed in the original order, so tags and confidences are
+    identical.
+    """
+
+    def __init__(self, model: AveragedPerceptron):
+        self.classes = set(model.classes)
+        self._labels = sorted(self.classes)
+        label_index = {label: i for i, label in enumerate(self._labels)}
+        self._rows = SharedKeyIndex(model.weights)
+        starts = array('q', [0])
+        labels = array('H')
+        weights = array('d')
+        for feature_weights in model.weights.values():
+            for label, weight in feature_weights.items():
+                labels.append(label_index[label])
+                weights.append(weight)
+            starts.append(len(weights))
+        self._starts = shared_array('q', starts)
+        self._label_ids = shared_array('H', labels)
+        self._weights = shared_array('d', weights)
+        self.weights = {}  # training state is not kept
+        self._totals = defaultdict(int)
+        self._tstamps = defaultdict(int)
+        self.i = model.i
+
+    def predict(self, features, return_conf=False):
+        scores = defaultdict(float)
+        rows = self._rows
+        starts, label_ids, weights, labels = self._starts, self._label_ids, self._weights, self._labels
+        for feat, value in features.items():
+            row = rows.get(feat)
+            if row is None or value == 0:
+                continue
+            for j in range(starts[row], starts[row + 1]):
+                scores[labels[label_ids[j]]] += value * weights[j]
+
+        best_label = max(self.classes, key=lambda label: (scores[label], label))
+        conf = max(self._softmax(scores)) if return_conf == True else None
+        return best_label, conf
+
+    @property
+    def nbytes(self) -> int:
+        return self._rows.nbytes + self._starts.nbytes + self._label_ids.nbytes + self._weights.nbytes
+
+    def update(self, *args, **kwargs):
+        raise TypeError('SharedAveragedPerceptron is read-only')
+
+
+def share_tagger_weights(tagger) -> int:
+    """Swap a loaded PerceptronTagger's model for the shared-array version; returns bytes shared"""
+    if not isinstance(tagger.model, SharedAveragedPerceptron):
+        tagger.model = SharedAveragedPerceptron(tagger.model)
+    return tagger.model.nbytes
+
+
+def share_langdetect_profiles(factory=None) -> int:
+    """Swap langdetect's probability map for the shared-matrix version; returns bytes shared"""
+    if factory is None:
+        from langdetect import detector_factory
+        detector_factory.init_factory()
+        factory = detector_factory._factory
+    if not isinstance(factory.word_lang_prob_map, SharedProbabilityMap):
+        factory.word_lang_prob_map = SharedProbabilityMap(factory.word_lang_prob_map, len(factory.langlist))
+    return factory.word_lang_prob_map.nbytes
+
+
+def _share_pos_tagger() -> int:
+    from .nlp_models import lexicon_tagger, pos_tagger
+    lexicon_tagger.get_lexicon()
+    return share_tagger_weights(pos_tagger.get_tagger())
+
+
+def _resolve_nltk_resources() -> int:
+    from .nlp_models import lemmatizer
+    from .nltk_resources import nltk_resources, pipeline_resources
+    nltk_resources.resolve(pipeline_resources(lemmatizer.backend_name))
+    return 0
+
+
+def _load_small_tables() -> int:
+    from .nlp_models import lemmatizer
+    from .phrase_table import phrase_tables
+    from .sign_pipeline import sign_pipeline
+    from .sign_vocabulary import sign_vocabulary
+    from .translation_service import translation_service
+    sign_vocabulary.rebuild()
+    lemmatizer.preload()
+    phrase_tables.languages()
+    for backend in translation_service.local_backends:
+        backend.preload()
+    if sign_pipeline.fuzzy is not None:
+        sign_pipeline.fuzzy.preload()
+    return 0
+
+
+PRELOAD_STEPS = [
+    ('nltk_resources', _resolve_nltk_resources),
+    ('tables', _load_small_tables),
+    ('pos_tagger', _share_pos_tagger),
+    ('langdetect', share_langdetect_profiles),
+]
+
+
+def prepare_for_fork() -> Dict:
+    """
+    Called in the gunicorn master (preload_app) once the application is
+    imported: load every model, move the large tables into shared mappings,
+    then freeze the heap so the garbage collector never touches it in workers
+    """
+    start_time = time.perf_counter()
+    shared_bytes = {}
+    for name, step in PRELOAD_STEPS:
+        try:
+            shared_bytes[name] = step()
+        except Exception as e:
+            logger.warning(f"Preload step '{name}' failed: {e}")
+
+    gc.collect()
+    gc.freeze()
+    duration = time.perf_counter() - start_time
+    logger.info(
+        f"Preloaded models in {duration * 1000:.0f} ms: {sum(shared_bytes.values()) / 1e6:.1f} MB in shared mappings, "
+        f"{gc.get_freeze_count()} objects frozen"
+    )
+    return {'shared_bytes': shared_bytes, 'frozen_objects': gc.get_freeze_count(), 'duration': duration}
+
+
+def process_memory(pid='self') -> Dict[str, int]:
+    """
+    Memory of a process in bytes from /proc/<pid>/smaps_rollup (Linux):
+    rss, pss (shared pages split between the processes using them), unique
+    (pages private to this process, i.e. what it would free on exit) and shared
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            lines = f.readlines()
+    except OSError:
+        return {}
+    fields = {}
+    for line in lines:
+        parts = line.split()
+        if len(parts) >= 3 and parts[0].endswith(':'):
+            fields[parts[0][:-1]] = int(parts[1]) * 1024
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'unique': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
+
+
+def child_pids(pid: int) -> List[int]:
+    """Direct children of a process (the gunicorn workers of a master)"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields after it are space separated
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        if ppid == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def memory_report(master_pid: int) -> List[Dict]:
+    """process_memory() of a master process and each of its workers"""
+    report = []
+    for role, pid in [('master', master_pid)] + [('worker', child) for child in child_pids(master_pid)]:
+        memory = process_memory(pid)
+        if memory:
+            report.append(dict(memory, pid=pid, role=role))
+    return report
@@ -0,0 +1,85 @@
+"""
+Unicode Script Detection
+Identifies the language of Indic text from the Unicode blocks of its letters,
+so langdetect is only needed when one script is shared by several languages
+"""
+from typing import Dict, Optional, Tuple
+
+# Each Indic block is 128 code points aligned on a multiple of 128,
+# so the block of a character is simply ord(ch) >> 7
+SCRIPT_BY_BLOCK = {
+    0x0900 >> 7: 'Devanagari',
+    0x0980 >> 7: 'Bengali',
+    0x0A00 >> 7: 'Gurmukhi',
+    0x0A80 >> 7: 'Gujarati',
+    0x0B00 >> 7: 'Oriya',
+    0x0B80 >> 7: 'Tamil',
+    0x0C00 >> 7: 'Telugu',
+    0x0C80 >> 7: 'Kannada',
+    0x0D00 >> 7: 'Malayalam',
+}
+
+# Supported languages written in each script; more than one means langdetect
+# (or a script-specific rule) has to decide
+SCRIPT_LANGUAGES = {
+    'Latin': ('en',),
+    'Devanagari': ('hi', 'mr'),
+    'Bengali': ('bn', 'as'),
+    'Gurmukhi': ('pa',),
+    'Gujarati': ('gu',),
+    'Oriya': ('or',),
+    'Tamil': ('ta',),
+    'Telugu': ('te',),
+    'Kannada': ('kn',),
+    'Malayalam': ('ml',),
+}
+
+# Letters used in Assamese but not in Bengali (ra with lower diagonal, wa with lower diagonal)
+ASSAMESE_LETTERS = frozenset('ৰৱ')
+
+
+def script_histogram(text: str) -> Dict[str, int]:
+    """Count the letters of each script in one pass (digits, spaces and punctuation are ignored)"""
+    counts: Dict[str, int] = {}
+    for ch in text:
+        code = ord(ch)
+        if code < 0x80:
+            if ch.isalpha():
+                counts['Latin'] = counts.get('Latin', 0) + 1
+            continue
+        script = SCRIPT_BY_BLOCK.get(code >> 7)
+        if script is None:
+            script = 'Latin' if ch.isalpha() and code < 0x250 else 'Other'
+        counts[script] = counts.get(script, 0) + 1
+    return counts
+
+
+def dominant_script(text: str) -> Optional[str]:
+    """Script with the most letters, or None if the text has no letters"""
+    counts = script_histogram(text)
+    if not counts:
+        return None
+    return max(counts, key=counts.get)
+
+
+def detect_language_by_script(text: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """
+    Resolve a language from the script alone.
+    Returns (language, candidates): language is None when the script is shared
+    by several languages (candidates lists them) or is not an Indic/ASCII script.
+    """
+    if text.isascii():
+        return 'en', ('en',)
+
+    script = dominant_script(text)
+    candidates = SCRIPT_LANGUAGES.get(script, ())
+
+    if script == 'Latin':
+        # Accented Latin text may be any European language
+        return None, ()
+    if len(candidates) == 1:
+        return candidates[0], candidates
+    if script == 'Bengali':
+        # langdetect has no Assamese profile; the script tells them apart instead
+        return ('as' if ASSAMESE_LETTERS.intersection(text) else 'bn'), candidates
+    return None, candidates
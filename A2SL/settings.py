@@ -77,6 +77,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'A2SL',
 ]
 
 MIDDLEWARE = [
@@ -174,4 +175,85 @@ STATICFILES_DIRS = [
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Default primary key field type
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+# Sign vocabulary index: seconds between checks for added/removed clips (0 = build once per worker)
+SIGN_VOCABULARY_REFRESH_INTERVAL = config('SIGN_VOCABULARY_REFRESH_INTERVAL', default=0, cast=int)
+
+# Worker warm-up: load NLP/detection models and run one offline conversion per language in the background;
+# /health/ready/ answers 503 until it finishes
+NLP_WARMUP = config('NLP_WARMUP', default=not DEBUG, cast=bool)
+# Restrict warm-up conversions to these language codes (empty = every active language)
+NLP_WARMUP_LANGUAGES = config('NLP_WARMUP_LANGUAGES', default='', cast=Csv())
+
+# Translation cache: 'local' (in-process LRU+TTL), 'sqlite' (on-disk, shared by all workers on the node),
+# 'django' (uses CACHES[TRANSLATION_CACHE_ALIAS]) or 'none'
+TRANSLATION_CACHE_BACKEND = config('TRANSLATION_CACHE_BACKEND', default='local')
+TRANSLATION_CACHE_ALIAS = config('TRANSLATION_CACHE_ALIAS', default='default')
+TRANSLATION_CACHE_PATH = config('TRANSLATION_CACHE_PATH', default=os.path.join(BASE_DIR, 'translation_cache.sqlite3'))
+TRANSLATION_CACHE_MAX_SIZE = config('TRANSLATION_CACHE_MAX_SIZE', default=2048, cast=int)
+TRANSLATION_CACHE_TTL = config('TRANSLATION_CACHE_TTL', default=86400, cast=int)
+# Micro-batching: collect concurrent translations per language for this many ms (0 = send each immediately)
+TRANSLATION_BATCH_WINDOW_MS = config('TRANSLATION_BATCH_WINDOW_MS', default=0, cast=int)
+TRANSLATION_BATCH_MAX_SIZE = config('TRANSLATION_BATCH_MAX_SIZE', default=16, cast=int)
+# Upstream translation deadline and circuit breaker. A request that needs the upstream gets TRANSLATION_TIMEOUT
+# seconds in total: waiting on an identical in-flight translation, for a pooled client and the request itself
+TRANSLATION_TIMEOUT = config('TRANSLATION_TIMEOUT', default=5.0, cast=float)
+TRANSLATION_BREAKER_FAILURES = config('TRANSLATION_BREAKER_FAILURES', default=5, cast=int)
+TRANSLATION_BREAKER_SLOW_CALL = config('TRANSLATION_BREAKER_SLOW_CALL', default=2.0, cast=float)
+TRANSLATION_BREAKER_RESET = config('TRANSLATION_BREAKER_RESET', default=30.0, cast=float)
+# Seconds a failed phrase skips the upstream (0 disables negative caching)
+TRANSLATION_NEGATIVE_CACHE_TTL = config('TRANSLATION_NEGATIVE_CACHE_TTL', default=60, cast=int)
+
+# Memoized sentence conversions (process_multilingual_text results)
+PIPELINE_CACHE_MAX_SIZE = config('PIPELINE_CACHE_MAX_SIZE', default=4096, cast=int)
+PIPELINE_CACHE_TTL = config('PIPELINE_CACHE_TTL', default=3600, cast=int)
+
+# Lexicon-first POS tagging: word -> tag class table built by `manage.py build_pos_lexicon`
+POS_LEXICON_ENABLED = config('POS_LEXICON_ENABLED', default=True, cast=bool)
+POS_LEXICON_PATH = config('POS_LEXICON_PATH', default=os.path.join(BASE_DIR, 'A2SL', 'data', 'pos_lexicon.json'))
+
+# Lemmatizer: 'table' (compact inflection -> lemma table from `manage.py build_lemma_table`, no WordNet in memory)
+# or 'wordnet' (full WordNet with an LRU cache); 'table' falls back to WordNet if the table file is missing
+LEMMATIZER_BACKEND = config('LEMMATIZER_BACKEND', default='table')
+LEMMA_TABLE_PATH = config('LEMMA_TABLE_PATH', default=os.path.join(BASE_DIR, 'A2SL', 'data', 'lemma_table.json'))
+
+# Synonym index: words without a clip are signed with a clip of the same meaning before falling back to
+# fingerspelling; the index is built by `manage.py build_synonym_index` from WordNet and the curated list
+SYNONYMS_ENABLED = config('SYNONYMS_ENABLED', default=True, cast=bool)
+SYNONYM_INDEX_PATH = config('SYNONYM_INDEX_PATH', default=os.path.join(BASE_DIR, 'A2SL', 'data', 'synonym_index.json'))
+SYNONYM_CURATED_PATH = config('SYNONYM_CURATED_PATH', default=os.path.join(BASE_DIR, 'A2SL', 'data', 'synonyms.txt'))
+
+# Fuzzy matching: misspelled words without a clip are corrected to the closest clip word (SymSpell deletes index)
+# when the edit distance is at most FUZZY_MATCH_MAX_DISTANCE and 1 - distance / word length reaches the confidence;
+# English words near a clip name (`manage.py build_fuzzy_index`) are never corrected
+FUZZY_MATCH_ENABLED = config('FUZZY_MATCH_ENABLED', default=True, cast=bool)
+FUZZY_MATCH_MAX_DISTANCE = config('FUZZY_MATCH_MAX_DISTANCE', default=2, cast=int)
+FUZZY_MATCH_MIN_CONFIDENCE = config('FUZZY_MATCH_MIN_CONFIDENCE', default=0.75, cast=float)
+FUZZY_KNOWN_WORDS_PATH = config('FUZZY_KNOWN_WORDS_PATH', default=os.path.join(BASE_DIR, 'A2SL', 'data', 'fuzzy_known_words.json'))
+
+# Curated per-language phrase tables (exact translations and corrections), one versioned JSON file per language
+PHRASE_TABLE_DIR = config('PHRASE_TABLE_DIR', default=os.path.join(BASE_DIR, 'A2SL', 'data', 'phrases'))
+
+# Translator backends, tried in order: 'offline' translates from the bilingual lexicons compiled by
+# `manage.py build_lexicons` (no network; texts it does not fully cover go to the next backend), 'google' uses
+# Google Translate. 'offline' alone runs without network access (uncovered texts are fingerspelled)
+TRANSLATION_BACKENDS = config('TRANSLATION_BACKENDS', default='google', cast=Csv())
+OFFLINE_LEXICON_DIR = config('OFFLINE_LEXICON_DIR', default=os.path.join(BASE_DIR, 'A2SL', 'data', 'lexicons'))
+# Share of the words the lexicon must know for an offline translation to be used (1.0 = every word)
+OFFLINE_LEXICON_MIN_COVERAGE = config('OFFLINE_LEXICON_MIN_COVERAGE', default=1.0, cast=float)
+
+# ASGI deployment: async conversion views (set by asgi.py). Translations use a pooled keep-alive client with at
+# most TRANSLATION_ASYNC_MAX_CONNECTIONS requests in flight; the NLP stage runs on NLP_THREAD_POOL_SIZE threads
+SERVE_ASYNC = config('SERVE_ASYNC', default=False, cast=bool)
+TRANSLATION_ASYNC_URL = config('TRANSLATION_ASYNC_URL', default='https://translate.googleapis.com/translate_a/single')
+TRANSLATION_ASYNC_MAX_CONNECTIONS = config('TRANSLATION_ASYNC_MAX_CONNECTIONS', default=20, cast=int)
+TRANSLATION_ASYNC_MAX_KEEPALIVE = config('TRANSLATION_ASYNC_MAX_KEEPALIVE', default=10, cast=int)
+NLP_THREAD_POOL_SIZE = config('NLP_THREAD_POOL_SIZE', default=4, cast=int)
+
+# Sync googletrans translators: each concurrent request (gthread worker thread) borrows one of at most
+# TRANSLATION_POOL_SIZE pooled keep-alive translators, waiting for a free one until the TRANSLATION_TIMEOUT deadline
+TRANSLATION_POOL_SIZE = config('TRANSLATION_POOL_SIZE', default=8, cast=int)
+
+# /api/metrics/ is served to staff users and to scrapers sending 'Authorization: Bearer <METRICS_TOKEN>'
+# (empty = staff only)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
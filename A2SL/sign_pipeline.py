@@ -0,0 +1,260 @@
+"""
+English to Sign Pipeline
+Compiled form of the English NLP stage: stopwords, tag tables and the clip
+vocabulary are set up once, and each sentence is tagged, tense-counted and
+filtered in a single pass over its tokens
+"""
+import logging
+from typing import AbstractSet, Callable, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .fast_tokenizer import alpha_word_tokenize
+from .nlp_models import lemmatizer, lexicon_tagger
+from .sign_vocabulary import PHRASE_END, sign_vocabulary
+from .fuzzy_match import get_fuzzy_matcher
+from .synonyms import get_synonym_index
+from .transliteration import SPELL_OPEN, SPELLED_RE
+
+logger = logging.getLogger(__name__)
+
+# Stopwords that will be removed
+STOP_WORDS = frozenset([
+    "mightn't", 're', 'wasn', 'wouldn', 'be', 'has', 'that', 'does', 'shouldn', 'do', "you've", 'off', 'for',
+    "didn't", 'm', 'ain', 'haven', "weren't", 'are', "she's", "wasn't", 'its', "haven't", "wouldn't", 'don',
+    'weren', 's', "you'd", "don't", 'doesn', "hadn't", 'is', 'was', "that'll", "should've", 'a', 'then', 'the',
+    'mustn', 'i', 'nor', 'as', "it's", "needn't", 'd', 'am', 'have', 'hasn', 'o', "aren't", "you'll",
+    "couldn't", "you're", "mustn't", 'didn', "doesn't", 'll', 'an', 'hadn', 'whom', 'y', "hasn't", 'itself',
+    'couldn', 'needn', "shan't", 'isn', 'been', 'such', 'shan', "shouldn't", 'aren', 'being', 'were', 'did',
+    'ma', 't', 'having', 'mightn', 've', "isn't", "won't",
+])
+
+# Penn Treebank tag -> WordNet part of speech for lemmatizing (anything else is a noun)
+LEMMA_POS_BY_TAG = {
+    'VBG': 'v', 'VBD': 'v', 'VBZ': 'v', 'VBN': 'v', 'NN': 'v',
+    'JJ': 'a', 'JJR': 'a', 'JJS': 'a', 'RBR': 'a', 'RBS': 'a',
+}
+
+# Tense counters, in the order ties are resolved
+FUTURE, PRESENT, PAST, PRESENT_CONTINUOUS = range(4)
+
+# Penn Treebank tag -> tense counters it contributes to
+TENSES_BY_TAG = {
+    'MD': (FUTURE,),
+    'VBP': (PRESENT,),
+    'VBZ': (PRESENT,),
+    'VBG': (PRESENT, PRESENT_CONTINUOUS),
+    'VBD': (PAST,),
+    'VBN': (PAST,),
+}
+
+
+class SignToken:
+    """A kept token: the word as typed, its POS tag and its lemma (spelled tokens are fingerspelled as typed)"""
+
+    __slots__ = ('word', 'tag', 'lemma', 'spelled')
+
+    def __init__(self, word: str, tag: str, lemma: str, spelled: bool = False):
+        self.word = word
+        self.tag = tag
+        self.lemma = lemma
+        self.spelled = spelled
+
+    def __repr__(self) -> str:
+        if self.spelled:
+            return f"SignToken({self.word!r}, {self.tag!r}, {self.lemma!r}, spelled=True)"
+        return f"SignToken({self.word!r}, {self.tag!r}, {self.lemma!r})"
+
+
+class SignPipeline:
+    """
+    Converts English text to a list of sign clip names (or fingerspelled letters).
+    One instance is shared by all requests; it holds no per-request state.
+    """
+
+    def __init__(self, tagger=lexicon_tagger, lemmatizer=lemmatizer, vocabulary=sign_vocabulary,
+                 tokenizer: Callable[[str], List[str]] = alpha_word_tokenize,
+                 stop_words: Iterable[str] = STOP_WORDS, synonyms=None, fuzzy=None):
+        self.tagger = tagger
+        self.lemmatizer = lemmatizer
+        self.vocabulary = vocabulary
+        self.tokenizer = tokenizer
+        self.stop_words = frozenset(stop_words)
+        self.synonyms = synonyms
+        self.fuzzy = fuzzy
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercase, tokenize and drop punctuation and numbers"""
+        return [word for word in self.tokenizer(text.lower()) if word.isalpha()]
+
+    def tokenize_spelled(self, text: str) -> Tuple[List[str], FrozenSet[int]]:
+        """
+        tokenize() for text with words marked for fingerspelling (romanized names in a
+        translation); returns the words and the indexes of the marked ones
+        """
+        if SPELL_OPEN not in text:
+            return self.tokenize(text), frozenset()
+        words, spelled = [], set()
+        position = 0
+        for match in SPELLED_RE.finditer(text):
+            words.extend(self.tokenize(text[position:match.start()]))
+            letters = ''.join(char for char in match.group(1).lower() if 'a' <= char <= 'z')
+            if letters:
+                spelled.add(len(words))
+                words.append(letters)
+            position = match.end()
+        words.extend(self.tokenize(text[position:]))
+        return words, frozenset(spelled)
+
+    def analyze_tagged(self, tagged: Sequence[Tuple[str, str]],
+                       spelled: AbstractSet[int] = frozenset()) -> Tuple[List[SignToken], Optional[str]]:
+        """
+        Count tenses, match multi-word clips, drop stopwords and lemmatize in one pass.
+        Words at the spelled indexes are kept as they are, to be fingerspelled.
+        Returns the kept tokens and the tense marker to prepend (or None).
+        """
+        counts = [0, 0, 0, 0]
+        tokens = []
+        stop_words = self.stop_words
+        lemmatize = self.lemmatizer.lemmatize
+        phrase_trie = getattr(self.vocabulary, 'phrase_trie', None)
+
+        i = 0
+        while i < len(tagged):
+            word, tag = tagged[i]
+            if i in spelled:
+                tokens.append(SignToken(word, tag, word, spelled=True))
+                i += 1
+                continue
+            if phrase_trie:
+                end, phrase = self._match_phrase(tagged, i, phrase_trie, spelled)
+                if phrase is not None:
+                    for _, phrase_tag in tagged[i:end]:
+                        for tense in TENSES_BY_TAG.get(phrase_tag, ()):
+                            counts[tense] += 1
+                    tokens.append(SignToken(' '.join(w for w, _ in tagged[i:end]), tag, phrase))
+                    i = end
+                    continue
+            i += 1
+
+            for tense in TENSES_BY_TAG.get(tag, ()):
+                counts[tense] += 1
+            if word in stop_words:
+                continue
+            lemma = lemmatize(word, pos=LEMMA_POS_BY_TAG.get(tag, 'n'))
+            if lemma == 'I':
+                lemma = 'Me'
+            tokens.append(SignToken(word, tag, lemma))
+
+        return tokens, self._tense_marker(counts, tokens)
+
+    def _match_phrase(self, tagged: Sequence[Tuple[str, str]], start: int, trie: dict,
+                      spelled: AbstractSet[int] = frozenset()) -> Tuple[int, Optional[str]]:
+        """
+        Greedy longest match of a multi-word clip starting at tagged[start].
+        Each token matches by its own form or, failing that, its lemma ('did not' -> 'do not').
+        Returns (end index, phrase key), or (start, None) when no phrase matches.
+        """
+        node = trie
+        end, phrase = start, None
+        for j in range(start, len(tagged)):
+            if j in spelled:
+                break
+            word, tag = tagged[j]
+            child = node.get(word)
+            if child is None:
+                child = node.get(self.lemmatizer.lemmatize(word, pos=LEMMA_POS_BY_TAG.get(tag, 'n')))
+                if child is None:
+                    break
+            node = child
+            if PHRASE_END in node:
+                end, phrase = j + 1, node[PHRASE_END]
+        return end, phrase
+
+    @staticmethod
+    def _tense_marker(counts: List[int], tokens: List[SignToken]) -> Optional[str]:
+        # The first tense with the highest count wins, as max() over the counters does
+        top = max(counts)
+        if top == 0:
+            return None
+        if counts[FUTURE] == top:
+            if any(token.lemma == 'Will' for token in tokens):
+                return None
+            return 'Will'
+        if counts[PRESENT] == top:
+            return 'Now' if counts[PRESENT_CONTINUOUS] else None
+        if counts[PAST] == top:
+            return 'Before'
+        return None
+
+    def to_clips(self, tokens: List[SignToken], marker: Optional[str] = None) -> List[str]:
+        """
+        Map lemmas to clip names (directly, through a synonym or as a corrected
+        misspelling), fingerspelling words that have no clip
+        """
+        clips = []
+        if self.synonyms is None and self.fuzzy is None:
+            lookup = self.vocabulary.lookup
+        else:
+            lookup = self._resolve_clip
+        if marker:
+            self._append_clip(clips, lookup, marker)
+        for token in tokens:
+            if token.spelled:
+                clips.extend(c.upper() for c in token.word)
+            else:
+                self._append_clip(clips, lookup, token.lemma)
+        return clips
+
+    def _resolve_clip(self, word: str) -> Optional[str]:
+        clip = self._lookup_with_synonyms(word)
+        if clip is None and self.fuzzy is not None:
+            corrected = self.fuzzy.match(word)
+            if corrected is not None:
+                clip = self._lookup_with_synonyms(corrected)
+        return clip
+
+    def _lookup_with_synonyms(self, word: str) -> Optional[str]:
+        clip = self.vocabulary.lookup(word)
+        if clip is None and self.synonyms is not None:
+            target = self.synonyms.lookup(word)
+            if target is not None:
+                clip = self.vocabulary.lookup(target)
+        return clip
+
+    @staticmethod
+    def _append_clip(clips: List[str], lookup: Callable[[str], Optional[str]], word: str) -> None:
+        clip = lookup(word)
+        if clip:
+            clips.append(clip)
+        else:
+            clips.extend(c.upper() for c in word)
+
+    def convert(self, text: str) -> List[str]:
+        """Convert one English sentence to clip names"""
+        if not text:
+            return []
+        words, spelled = self.tokenize_spelled(text)
+        tokens, marker = self.analyze_tagged(self.tagger.tag(words), spelled)
+        return self.to_clips(tokens, marker)
+
+    def fingerspell(self, text: str) -> List[str]:
+        """Letter clips of every word, for text that is not English (e.g. a transliterated name)"""
+        text = SPELLED_RE.sub(r' \1 ', text)
+        return [char.upper() for word in self.tokenize(text) for char in word if 'a' <= char <= 'z']
+
+    def convert_many(self, texts: Sequence[str]) -> List[List[str]]:
+        """Convert several sentences, tagging them with a single tagger call"""
+        sentences = [self.tokenize_spelled(text) if text else ([], frozenset()) for text in texts]
+        results = []
+        tagged_sents = self.tagger.tag_sents([words for words, _ in sentences])
+        for text, (_, spelled), tagged in zip(texts, sentences, tagged_sents):
+            if not text:
+                results.append([])
+                continue
+            tokens, marker = self.analyze_tagged(tagged, spelled)
+            results.append(self.to_clips(tokens, marker))
+        return results
+
+
+# Initialize global pipeline (models are loaded on first use; the synonym index is read now)
+_synonyms = get_synonym_index()
+sign_pipeline = SignPipeline(synonyms=_synonyms, fuzzy=get_fuzzy_matcher(sign_vocabulary, _synonyms))
@@ -0,0 +1,183 @@
+"""
+Sign Vocabulary Index
+Keeps an in-memory index of the sign animation clips so that word lookups
+do not have to go through the staticfiles finders on every request
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+logger = logging.getLogger(__name__)
+
+
+# Key marking the end of a phrase in a phrase trie node; its value is the phrase's index key
+PHRASE_END = None
+
+
+def build_phrase_trie(names) -> Dict:
+    """
+    Token trie of the multi-word names (e.g. 'do not' -> {'do': {'not': {None: 'do not'}}}).
+    Single words are left to the flat index.
+    """
+    trie: Dict = {}
+    for name in names:
+        tokens = name.split()
+        if len(tokens) < 2:
+            continue
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[PHRASE_END] = name
+    return trie
+
+
+class SignVocabulary:
+    """
+    Case-folded index of the available sign clips (e.g. 'hello' -> 'Hello')
+    """
+
+    CLIP_EXTENSION = '.mp4'
+    MANIFEST_NAME = 'staticfiles.json'
+
+    def __init__(self, refresh_interval: Optional[float] = None):
+        self._clips: Dict[str, str] = {}
+        self._words: FrozenSet[str] = frozenset()
+        self._phrase_trie: Dict = {}
+        self._fingerprint: Tuple = ()
+        self._loaded = False
+        self._last_check = 0.0
+        self._configured_interval = refresh_interval
+        self._refresh_interval = 0
+        self._lock = threading.Lock()
+        self._version = 0
+
+    def _get_refresh_interval(self) -> float:
+        """Seconds between change checks (0 disables automatic refresh)"""
+        if self._configured_interval is None:
+            return getattr(settings, 'SIGN_VOCABULARY_REFRESH_INTERVAL', 0)
+        return self._configured_interval
+
+    def _watched_paths(self) -> list:
+        """Asset directories and the whitenoise manifest whose changes trigger a rebuild"""
+        paths = []
+        for location in getattr(settings, 'STATICFILES_DIRS', []):
+            # STATICFILES_DIRS entries may be (prefix, path) tuples
+            if isinstance(location, (list, tuple)):
+                location = location[1]
+            paths.append(str(location))
+
+        static_root = getattr(settings, 'STATIC_ROOT', None)
+        if static_root:
+            paths.append(os.path.join(str(static_root), self.MANIFEST_NAME))
+        return paths
+
+    def _compute_fingerprint(self) -> Tuple:
+        """Cheap change detector: one stat() per watched path"""
+        fingerprint = []
+        for path in self._watched_paths():
+            try:
+                fingerprint.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                fingerprint.append((path, None))
+        return tuple(fingerprint)
+
+    def _scan_clips(self) -> Dict[str, str]:
+        """
+        Collect top-level clip names from every configured staticfiles finder.
+        The first finder that provides a name wins, matching finders.find().
+        """
+        clips = {}
+        for finder in finders.get_finders():
+            for path, _storage in finder.list([]):
+                if not path.endswith(self.CLIP_EXTENSION):
+                    continue
+                # finders.find(word + '.mp4') only ever matches top-level files
+                if '/' in path or os.sep in path:
+                    continue
+                name = path[:-len(self.CLIP_EXTENSION)]
+                clips.setdefault(name.casefold(), name)
+        return clips
+
+    def rebuild(self) -> None:
+        """Rescan the clip directories and swap in a fresh index"""
+        start_time = time.perf_counter()
+        fingerprint = self._compute_fingerprint()
+        clips = self._scan_clips()
+        refresh_interval = self._get_refresh_interval()
+
+        with self._lock:
+            if clips != self._clips:
+                self._version += 1
+            self._clips = clips
+            self._words = frozenset(clips)
+            self._phrase_trie = build_phrase_trie(clips)
+            self._fingerprint = fingerprint
+            self._refresh_interval = refresh_interval
+            self._loaded = True
+            self._last_check = time.monotonic()
+
+        logger.info(f"Sign vocabulary built: {len(clips)} clips in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+
+    def refresh_if_changed(self) -> bool:
+        """Rebuild the index if the asset directories or manifest changed; returns True if rebuilt"""
+        if self._loaded and self._compute_fingerprint() == self._fingerprint:
+            self._last_check = time.monotonic()
+            return False
+        self.rebuild()
+        return True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            # Concurrent first lookups may both scan; the last swap wins and both are identical
+            self.rebuild()
+            return
+
+        if self._refresh_interval and time.monotonic() - self._last_check >= self._refresh_interval:
+            self.refresh_if_changed()
+
+    def lookup(self, word: str) -> Optional[str]:
+        """Return the clip name for a word (e.g. 'hello' -> 'Hello') or None if there is no clip"""
+        if not word:
+            return None
+        self._ensure_loaded()
+        return self._clips.get(word.casefold())
+
+    def __contains__(self, word: str) -> bool:
+        return self.lookup(word) is not None
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._clips)
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the set of clips changes; caches of converted output key on it"""
+        self._ensure_loaded()
+        return self._version
+
+    @property
+    def words(self) -> FrozenSet[str]:
+        """Case-folded names of every available clip"""
+        self._ensure_loaded()
+        return self._words
+
+    @property
+    def phrase_trie(self) -> Dict:
+        """Token trie of the case-folded multi-word clip names, for longest-match phrase lookups"""
+        self._ensure_loaded()
+        return self._phrase_trie
+
+    @property
+    def clips(self) -> Dict[str, str]:
+        """Mapping of case-folded word to clip name"""
+        self._ensure_loaded()
+        return dict(self._clips)
+
+
+# Initialize global sign vocabulary index (built lazily on first lookup)
+sign_vocabulary = SignVocabulary()
@@ -0,0 +1,118 @@
+"""
+Single-flight Request Coalescing
+Concurrent callers asking for the same key share one in-flight computation
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised when a waiter gives up on an in-flight call"""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for the leader and receive its result or
+    exception instead of starting their own call.
+    """
+
+    def __init__(self, timeout: Optional[float] = 10.0):
+        self.timeout = timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            wait_timeout = self.timeout if timeout is None else timeout
+            if not call.done.wait(wait_timeout):
+                raise SingleFlightTimeout(f"Timed out after {wait_timeout}s waiting for in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+            if call.waiters:
+                logger.debug(f"Single-flight call shared with {call.waiters} waiters")
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        return {'leaders': self.leaders, 'coalesced': self.coalesced, 'in_flight': self.in_flight()}
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines: the first caller for a key starts a task and
+    later callers await the same task. Callers are shielded from each other,
+    so a cancelled or timed-out waiter does not cancel the shared call.
+    """
+
+    def __init__(self, timeout: Optional[float] = 10.0):
+        self.timeout = timeout
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        task = self._calls.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            wait_timeout = self.timeout if timeout is None else timeout
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), wait_timeout)
+            except asyncio.TimeoutError:
+                raise SingleFlightTimeout(f"Timed out after {wait_timeout}s waiting for in-flight call")
+
+        task = asyncio.ensure_future(func())
+        self._calls[key] = task
+        self.leaders += 1
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict:
+        return {'leaders': self.leaders, 'coalesced': self.coalesced, 'in_flight': self.in_flight()}
@@ -0,0 +1,151 @@
+"""
+Synonym Index
+Maps words that have no sign clip onto a clip with the same meaning
+(e.g. 'glad' -> 'happy'), so they are signed with one clip instead of being
+fingerspelled letter by letter. The index is generated offline by
+`manage.py build_synonym_index` from WordNet and a curated list; at runtime it
+is a single dict lookup.
+"""
+import json
+import logging
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from django.conf import settings
+
+from .caching import CacheStats
+
+logger = logging.getLogger(__name__)
+
+SYNONYM_INDEX_VERSION = 1
+
+# WordNet parts of speech whose senses are used (adverb senses map words like 'just' onto 'but')
+SYNONYM_POS = frozenset(['n', 'v', 'a', 's'])
+
+
+def parse_curated_synonyms(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    Parse 'clip: synonym, synonym' lines ('#' starts a comment) into a
+    synonym -> clip map, all case-folded; a later line wins for a repeated synonym
+    """
+    synonyms = {}
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        clip, sep, words = line.partition(':')
+        if not sep:
+            logger.warning(f"Ignoring curated synonym line without ':': {line!r}")
+            continue
+        clip = clip.strip().casefold()
+        for word in words.split(','):
+            word = word.strip().casefold()
+            if word and word != clip:
+                synonyms[word] = clip
+    return synonyms
+
+
+def _dominant_sense(word: str, wordnet):
+    """The synset in which the word is used most often according to WordNet's sense counts"""
+    best, best_count = None, 0
+    for synset in wordnet.synsets(word):
+        for lemma in synset.lemmas():
+            if lemma.name().lower() == word and lemma.count() > best_count:
+                best, best_count = synset, lemma.count()
+    return best
+
+
+def wordnet_synonyms(words: Iterable[str], wordnet=None) -> Dict[str, str]:
+    """
+    Synonym -> word map of single-word WordNet synonyms that share their most
+    frequent sense with one of the words. Requiring the dominant sense on both
+    sides keeps out rare senses (e.g. 'dungeon' for 'keep').
+    """
+    if wordnet is None:
+        from nltk.corpus import wordnet
+
+    words = {word for word in words if word.isalpha()}
+    synonyms = {}
+    for word in sorted(words):
+        if len(word) < 3:
+            continue
+        sense = _dominant_sense(word, wordnet)
+        if sense is None or sense.pos() not in SYNONYM_POS:
+            continue
+        for name in sense.lemma_names():
+            synonym = name.lower()
+            if not synonym.isalpha() or synonym in words or synonym in synonyms:
+                continue
+            synonym_sense = _dominant_sense(synonym, wordnet)
+            if synonym_sense is not None and synonym_sense == sense:
+                synonyms[synonym] = word
+    return synonyms
+
+
+def build_synonym_index(words: Iterable[str], curated: Optional[Dict[str, str]] = None,
+                        use_wordnet: bool = True, wordnet=None) -> Dict:
+    """
+    WordNet synonyms of the clip words overlaid with the curated ones; curated
+    entries whose clip is not in the vocabulary are dropped
+    """
+    words = frozenset(words)
+    synonyms = wordnet_synonyms(words, wordnet=wordnet) if use_wordnet else {}
+    synonyms.update(
+        (word, clip) for word, clip in (curated or {}).items()
+        if clip in words and word not in words
+    )
+    return {
+        'version': SYNONYM_INDEX_VERSION,
+        'words': len(words),
+        'synonyms': dict(sorted(synonyms.items())),
+    }
+
+
+class SynonymIndex:
+    """
+    Read-only synonym -> clip word map loaded from the generated index file
+    """
+
+    def __init__(self, synonyms: Dict[str, str]):
+        self._synonyms = dict(synonyms)
+        self.stats = CacheStats()
+
+    @classmethod
+    def load(cls, path: str) -> Optional['SynonymIndex']:
+        """Load an index file, or return None if it is missing or was built by another version"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load synonym index {path}: {e}")
+            return None
+        if data.get('version') != SYNONYM_INDEX_VERSION:
+            logger.warning(f"Synonym index {path} has version {data.get('version')}, expected {SYNONYM_INDEX_VERSION}")
+            return None
+        return cls(data.get('synonyms', {}))
+
+    def lookup(self, word: str) -> Optional[str]:
+        """Clip word with the same meaning (e.g. 'glad' -> 'happy') or None"""
+        target = self._synonyms.get(word.casefold())
+        if target is None:
+            self.stats.record_miss()
+        else:
+            self.stats.record_hit()
+        return target
+
+    @property
+    def words(self) -> FrozenSet[str]:
+        """Every word the index has a clip for"""
+        return frozenset(self._synonyms)
+
+    def __len__(self) -> int:
+        return len(self._synonyms)
+
+
+def get_synonym_index() -> Optional[SynonymIndex]:
+    """The synonym index when SYNONYMS_ENABLED is set and the index file exists, otherwise None"""
+    if not getattr(settings, 'SYNONYMS_ENABLED', False):
+        return None
+    index = SynonymIndex.load(settings.SYNONYM_INDEX_PATH)
+    if index is not None:
+        logger.info(f"Synonym index loaded with {len(index)} entries")
+    return index
@@ -3,13 +3,32 @@ Multilingual Translation Service
 Handles translation between different languages for sign language conversion
 """
 import logging
-from googletrans import Translator
-from langdetect import detect
+from langdetect import DetectorFactory, detect, detect_langs
 import re
 from typing import Dict, Tuple, Optional
+from .caching import LocalTTLCache, build_translation_cache, make_translation_key
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .async_translation import AsyncGoogleTranslateClient
+from .deadline import DeadlineExceeded, remaining, request_timeout, translation_deadline
+from .batching import BatchTimeout, MicroBatchTranslator
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .script_detection import detect_language_by_script
+from .phrase_table import phrase_tables
+from .transliteration import transliterate
+from .translator_backends import GoogleTranslatorBackend, UntranslatableError, get_translator_backends
+from .translator_pool import TranslatorPoolExhausted
+from asgiref.sync import sync_to_async
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# langdetect is non-deterministic unless seeded
+DetectorFactory.seed = 0
+
+# Errors raised while waiting for local resources (the breaker, a batch, a pooled client, the deadline)
+# rather than by the upstream; they do not mark a phrase as failing in the negative cache
+NOT_UPSTREAM_FAILURES = (CircuitOpenError, BatchTimeout, TranslatorPoolExhausted, DeadlineExceeded)
+
 class MultilingualTranslationService:
     """
     Handles multilingual translation and language detection
@@ -115,8 +134,54 @@ class MultilingualTranslationService:
         }
     }
     
-    def __init__(self):
-        self.translator = Translator()
+    def __init__(self, cache=None, phrases=None, backends=None, async_upstream=None):
+        # Curated per-language phrase mappings (compiled once, shared by all requests)
+        self.phrases = phrases if phrases is not None else phrase_tables
+        # Translator backends (TRANSLATION_BACKENDS): local ones such as the offline lexicons answer
+        # first, the first network backend (if any) translates what they cannot
+        backends = backends if backends is not None else get_translator_backends()
+        self.local_backends = [backend for backend in backends if backend.is_local]
+        self.upstream = next((backend for backend in backends if not backend.is_local), None)
+        # Pooled async client used by the ASGI views in place of the sync upstream
+        if async_upstream is None and isinstance(self.upstream, GoogleTranslatorBackend):
+            async_upstream = AsyncGoogleTranslateClient()
+        self.async_upstream = async_upstream
+        # Cache of upstream translations keyed on (source language, NFC text)
+        self.cache = cache if cache is not None else build_translation_cache()
+        # Identical concurrent requests share one upstream call; waiters give up at the request deadline
+        self.single_flight = SingleFlight(timeout=request_timeout())
+        self.async_single_flight = AsyncSingleFlight(timeout=request_timeout())
+        # Fail fast to the offline fallback while the upstream is failing or slow
+        self.circuit_breaker = CircuitBreaker(
+            name='google-translate',
+            failure_threshold=getattr(settings, 'TRANSLATION_BREAKER_FAILURES', 5),
+            slow_call_threshold=getattr(settings, 'TRANSLATION_BREAKER_SLOW_CALL', 2.0),
+            reset_timeout=getattr(settings, 'TRANSLATION_BREAKER_RESET', 30.0),
+        )
+        # Recently failed phrases skip the upstream for a short while
+        negative_ttl = getattr(settings, 'TRANSLATION_NEGATIVE_CACHE_TTL', 60)
+        self.negative_cache = LocalTTLCache(max_size=1024, ttl=negative_ttl) if negative_ttl > 0 else None
+        # Optionally group concurrent translations into one upstream call per language
+        batch_window_ms = getattr(settings, 'TRANSLATION_BATCH_WINDOW_MS', 0)
+        self.batcher = None
+        if batch_window_ms > 0 and self.upstream is not None:
+            self.batcher = MicroBatchTranslator(
+                self._translate_batch_upstream,
+                max_wait=batch_window_ms / 1000,
+                max_batch_size=getattr(settings, 'TRANSLATION_BATCH_MAX_SIZE', 16),
+            )
+    
+    @property
+    def translator(self):
+        """Translator client of the upstream backend (None when running offline only)"""
+        return getattr(self.upstream, 'translator', None)
+    
+    @translator.setter
+    def translator(self, translator):
+        if self.upstream is None:
+            self.upstream = GoogleTranslatorBackend(translator=translator)
+        else:
+            self.upstream.translator = translator
         
     def get_supported_languages(self) -> Dict:
         """Return list of supported languages"""
@@ -130,6 +195,15 @@ class MultilingualTranslationService:
         try:
             if not text or not text.strip():
                 return 'en'  # Default to English
+            
+            # Most input is identified by its Unicode script alone
+            script_language, candidates = detect_language_by_script(text)
+            if script_language:
+                return script_language
+            
+            # Only scripts shared by several languages (e.g. Hindi/Marathi) need langdetect
+            if candidates:
+                return self._detect_among(text, candidates)
                 
             detected = detect(text)
             
@@ -144,51 +218,216 @@ class MultilingualTranslationService:
             logger.warning(f"Language detection failed: {e}")
             return 'en'  # Default to English on error
     
+    def _detect_among(self, text: str, candidates: Tuple[str, ...]) -> str:
+        """Pick the most probable of the candidate languages using langdetect"""
+        try:
+            for language in detect_langs(text):
+                if language.lang in candidates:
+                    return language.lang
+        except Exception as e:
+            logger.warning(f"Language detection failed: {e}")
+        return candidates[0]
+    
     def translate_to_english(self, text: str, source_lang: str = None) -> Tuple[str, str]:
         """
         Translate text to English for sign language processing
         Returns: (translated_text, detected_language)
         """
+        translated_text, source_lang, _ = self.translate_to_english_detailed(text, source_lang)
+        return translated_text, source_lang
+    
+    def translate_to_english_detailed(self, text: str, source_lang: str = None) -> Tuple[str, str, bool]:
+        """
+        Same as translate_to_english, plus whether the offline fallback was used
+        Returns: (translated_text, detected_language, is_fallback)
+        """
         try:
-            if not text or not text.strip():
-                return "", "en"
+            result, source_lang, cache_key = self._translate_without_upstream(text, source_lang)
+            if result is not None:
+                return result
             
-            # Auto-detect language if not provided
-            if not source_lang:
-                source_lang = self.detect_language(text)
+            try:
+                # Concurrent callers with the same key wait for a single upstream request; waiting
+                # for it, for a pooled client and the request itself share one TRANSLATION_TIMEOUT budget
+                with translation_deadline():
+                    translated_text = self.single_flight.do(
+                        cache_key, lambda: self._translate_upstream(text, source_lang, cache_key), timeout=remaining()
+                    )
+            except CircuitOpenError:
+                logger.info(f"Translation upstream unavailable, using offline fallback for '{source_lang}'")
+                return self._offline_fallback(text, source_lang), source_lang, True
+            except Exception as e:
+                logger.error(f"Translation failed: {e}")
+                return self._offline_fallback(text, source_lang), source_lang, True
             
-            # If already in English, return as-is
-            if source_lang == 'en':
-                return text, source_lang
+            return translated_text, source_lang, False
             
-            # Check for known problematic translations and provide direct mappings
-            if source_lang == 'gu':
-                gujarati_direct_mappings = {
-                    'જમવાનું થઈ ગયું': 'Food is ready',
-                    'જમવાનું તૈયાર છે': 'Food is ready',
-                    'ખાવાનું તૈયાર છે': 'Food is ready',
-                    'હેલો વર્લ્ડ': 'Hello world',
-                    'મારું નામ જોહન છે': 'My name is John',
-                    'હું ખુશ છું': 'I am happy',
-                }
-                
-                for gujarati_text, english_text in gujarati_direct_mappings.items():
-                    if gujarati_text in text:
-                        logger.info(f"Using direct mapping for Gujarati: '{gujarati_text}' -> '{english_text}'")
-                        return english_text, source_lang
-            
-            # Translate to English using Google Translate
-            translated = self.translator.translate(text, src=source_lang, dest='en')
+        except Exception as e:
+            logger.error(f"Translation failed: {e}")
+            # Fallback: return original text if translation fails
+            return text, source_lang or 'en', True
+    
+    async def translate_to_english_detailed_async(self, text: str, source_lang: str = None) -> Tuple[str, str, bool]:
+        """
+        translate_to_english_detailed for the ASGI views: the upstream request is
+        awaited on the pooled async client instead of blocking a thread
+        Returns: (translated_text, detected_language, is_fallback)
+        """
+        if self.async_upstream is None:
+            return await sync_to_async(self.translate_to_english_detailed, thread_sensitive=False)(text, source_lang)
+        try:
+            result, source_lang, cache_key = await self._run_cache_step(self._translate_without_upstream, text, source_lang)
+            if result is not None:
+                return result
             
-            # Log translation for debugging
-            logger.info(f"Google Translate result: '{text}' -> '{translated.text}' (confidence: {getattr(translated, 'confidence', 'N/A')})")
+            try:
+                with translation_deadline():
+                    translated_text = await self.async_single_flight.do(
+                        cache_key, lambda: self._translate_upstream_async(text, source_lang, cache_key),
+                        timeout=remaining(),
+                    )
+            except CircuitOpenError:
+                logger.info(f"Translation upstream unavailable, using offline fallback for '{source_lang}'")
+                return self._offline_fallback(text, source_lang), source_lang, True
+            except Exception as e:
+                logger.error(f"Translation failed: {e}")
+                return self._offline_fallback(text, source_lang), source_lang, True
             
-            return translated.text, source_lang
+            return translated_text, source_lang, False
             
         except Exception as e:
             logger.error(f"Translation failed: {e}")
-            # Fallback: return original text if translation fails
-            return text, source_lang or 'en'
+            return text, source_lang or 'en', True
+    
+    def _translate_without_upstream(self, text: str, source_lang: Optional[str]) -> Tuple[Optional[Tuple[str, str, bool]], str, Optional[str]]:
+        """
+        Steps before the upstream request: detection, curated phrases, local
+        backends, the cache and the negative cache.
+        Returns (result or None when the upstream is needed, source language, cache key)
+        """
+        if not text or not text.strip():
+            return ("", "en", False), "en", None
+        
+        # Auto-detect language if not provided
+        if not source_lang:
+            source_lang = self.detect_language(text)
+        
+        # If already in English, return as-is
+        if source_lang == 'en':
+            return (text, source_lang, False), source_lang, None
+        
+        # Curated phrases (and known problematic translations) skip the upstream
+        curated = self.phrases.translate(text, source_lang)
+        if curated is not None:
+            logger.info(f"Using curated phrase translation for '{source_lang}': '{curated}'")
+            return (curated, source_lang, False), source_lang, None
+        
+        # Local backends (offline lexicons) translate simple utterances without a network round trip
+        translated_text = self._translate_local(text, source_lang)
+        if translated_text is not None:
+            return (translated_text, source_lang, False), source_lang, None
+        
+        if self.upstream is None:
+            # Offline only: keep the words the lexicons know and fingerspell the rest
+            translated_text = self._translate_local(text, source_lang, partial=True)
+            if translated_text is not None:
+                return (translated_text, source_lang, False), source_lang, None
+            return (self._offline_fallback(text, source_lang), source_lang, True), source_lang, None
+        
+        # Serve repeated phrases from the cache instead of the upstream
+        cache_key = make_translation_key(text, source_lang)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return (cached, source_lang, False), source_lang, cache_key
+        
+        # Phrases that failed moments ago go straight to the fallback
+        if self.negative_cache is not None and self.negative_cache.get(cache_key):
+            return (self._offline_fallback(text, source_lang), source_lang, True), source_lang, cache_key
+        
+        return None, source_lang, cache_key
+    
+    def _offline_fallback(self, text: str, source_lang: str) -> str:
+        """
+        Translation used when the upstream cannot be reached: the text
+        romanized, so the sign pipeline can fingerspell it from the A-Z clips
+        """
+        return transliterate(text)
+    
+    def _translate_local(self, text: str, source_lang: str, partial: bool = False) -> Optional[str]:
+        """
+        Translation from the first local backend that covers the text, or None;
+        with partial, the first that knows any of its words
+        """
+        for backend in self.local_backends:
+            try:
+                if partial:
+                    return backend.translate_partial(text, source_lang)
+                return backend.translate(text, source_lang)
+            except UntranslatableError as e:
+                logger.debug(f"{backend.name} backend skipped '{source_lang}' text: {e}")
+        return None
+    
+    def _translate_upstream(self, text: str, source_lang: str, cache_key: str) -> str:
+        """
+        Translate to English using the upstream backend and cache the result
+        """
+        try:
+            if self.batcher is not None:
+                # The batch goes through the circuit breaker in _translate_batch_upstream
+                translated_text = self.batcher.translate(text, source_lang)
+            else:
+                # Waiting for a pooled client is local: only the upstream call counts for the circuit breaker
+                with self.upstream.acquire() as upstream:
+                    translated_text = self.circuit_breaker.call(lambda: upstream.translate(text, source_lang))
+        except Exception as e:
+            self._record_upstream_failure(e, cache_key)
+            raise
+        
+        # Store before waiters are released so later callers hit the cache
+        if self.cache is not None and translated_text:
+            self.cache.set(cache_key, translated_text)
+        
+        return translated_text
+    
+    async def _translate_upstream_async(self, text: str, source_lang: str, cache_key: str) -> str:
+        """
+        Translate to English using the async upstream client and cache the result
+        """
+        # Waiting for a free connection is local: only the upstream request counts for the circuit breaker
+        try:
+            async with self.async_upstream.acquire() as upstream:
+                translated_text = await self.circuit_breaker.call_async(lambda: upstream.request(text, source_lang))
+        except Exception as e:
+            self._record_upstream_failure(e, cache_key)
+            raise
+        if self.cache is not None and translated_text:
+            await self._run_cache_step(self.cache.set, cache_key, translated_text)
+        return translated_text
+    
+    def _record_upstream_failure(self, error: Exception, cache_key: str) -> None:
+        """
+        Negative-cache a phrase the upstream failed on. Only the single-flight
+        leader runs the upstream step, so waiters that time out or receive the
+        leader's error never write here.
+        """
+        if self.negative_cache is not None and not isinstance(error, NOT_UPSTREAM_FAILURES):
+            self.negative_cache.set(cache_key, True)
+    
+    async def _run_cache_step(self, func, *args):
+        """
+        Run a step that reads or writes the translation cache from the async path:
+        in place for the in-process cache, on a worker thread for the SQLite and
+        Django backends, whose calls are blocking I/O
+        """
+        if self.cache is None or isinstance(self.cache, LocalTTLCache):
+            return func(*args)
+        return await sync_to_async(func, thread_sensitive=False)(*args)
+    
+    def _translate_batch_upstream(self, texts: list, source_lang: str) -> list:
+        """Translate several texts with as few upstream requests as the backend allows"""
+        with self.upstream.acquire() as upstream:
+            return self.circuit_breaker.call(lambda: upstream.translate_batch(texts, source_lang))
     
     def preprocess_text_for_translation(self, text: str, language: str) -> str:
         """
@@ -209,21 +448,6 @@ class MultilingualTranslationService:
             # Remove unnecessary punctuation that might affect translation
             text = re.sub(r'[।॥]', '.', text)  # Replace devanagari punctuation
             
-            # Gujarati-specific preprocessing
-            if language == 'gu':
-                # Handle common Gujarati phrases that might be mistranslated
-                gujarati_corrections = {
-                    'જમવાનું થઈ ગયું': 'જમવાનું તૈયાર છે',  # "Food is ready" instead of "Gone"
-                    'જમવાનું તૈયાર છે': 'જમવાનું તૈયાર છે',  # Keep correct form
-                    'ખાવાનું તૈયાર છે': 'ખાવાનું તૈયાર છે',  # Alternative form
-                }
-                
-                # Apply corrections
-                for incorrect, correct in gujarati_corrections.items():
-                    if incorrect in text:
-                        text = text.replace(incorrect, correct)
-                        logger.info(f"Applied Gujarati correction: '{incorrect}' -> '{correct}'")
-                
         elif language in ['ta', 'te', 'kn', 'ml']:
             # Dravidian languages preprocessing
             # Handle specific punctuation and spacing issues
@@ -232,7 +456,8 @@ class MultilingualTranslationService:
             # English-specific preprocessing
             text = re.sub(r'[^\w\s.,!?-]', '', text)  # Remove special characters
         
-        return text
+        # Curated corrections for phrases that are commonly mistranslated
+        return self.phrases.correct_source(text, language)
     
     def enhance_translation_quality(self, original_text: str, translated_text: str, source_lang: str) -> str:
         """
@@ -248,31 +473,8 @@ class MultilingualTranslationService:
         # Remove common translation artifacts
         cleaned_text = translated_text.strip()
         
-        # Language-specific post-processing
-        if source_lang == 'gu':
-            # Gujarati-specific corrections for common mistranslations
-            gujarati_post_corrections = {
-                'Gone.': 'Food is ready.',  # Fix the specific issue
-                'Gone': 'Food is ready',
-                'gone': 'food is ready',
-                'GONE': 'FOOD IS READY',
-            }
-            
-            for incorrect, correct in gujarati_post_corrections.items():
-                if incorrect in cleaned_text:
-                    cleaned_text = cleaned_text.replace(incorrect, correct)
-                    logger.info(f"Applied Gujarati post-correction: '{incorrect}' -> '{correct}'")
-        
-        # General quality improvements
-        # Handle common translation issues
-        common_corrections = {
-            'Gone.': 'Food is ready.',  # General fallback
-            'Gone': 'Food is ready',
-        }
-        
-        for incorrect, correct in common_corrections.items():
-            if incorrect in cleaned_text and source_lang == 'gu':
-                cleaned_text = cleaned_text.replace(incorrect, correct)
+        # Curated corrections for known mistranslations of this language
+        cleaned_text = self.phrases.correct_english(cleaned_text, source_lang)
         
         # Ensure proper sentence structure for sign language
         if not cleaned_text.endswith(('.', '!', '?')):
@@ -280,6 +482,29 @@ class MultilingualTranslationService:
         
         return cleaned_text
     
+    def get_cache_stats(self) -> Dict:
+        """Return translation cache hit/miss/eviction counters"""
+        if self.cache is None:
+            return {'backend': 'none'}
+        stats = self.cache.stats.as_dict()
+        stats['backend'] = self.cache.backend_name
+        stats['size'] = len(self.cache)
+        return stats
+    
+    def get_upstream_stats(self) -> Dict:
+        """Return circuit breaker state and request coalescing counters"""
+        stats = {
+            'backends': [backend.stats() for backend in self.local_backends + [self.upstream] if backend is not None],
+            'circuit_breaker': self.circuit_breaker.stats(),
+            'single_flight': self.single_flight.stats(),
+        }
+        if self.batcher is not None:
+            stats['batching'] = self.batcher.stats()
+        if self.async_upstream is not None:
+            stats['async_client'] = self.async_upstream.stats()
+            stats['async_single_flight'] = self.async_single_flight.stats()
+        return stats
+    
     def get_language_info(self, lang_code: str) -> Dict:
         """Get detailed information about a language"""
         return self.SUPPORTED_LANGUAGES.get(lang_code, self.SUPPORTED_LANGUAGES['en'])
@@ -318,23 +543,21 @@ class MultilingualTranslationService:
         """
         Get alternative translation when primary translation fails
         """
-        if source_lang == 'gu':
-            # Gujarati fallback translations
-            fallback_mappings = {
-                'જમવાનું થઈ ગયું': 'Food is ready',
-                'જમવાનું તૈયાર છે': 'Food is ready',
-                'ખાવાનું તૈયાર છે': 'Food is ready',
-                'હેલો વર્લ્ડ': 'Hello world',
-                'મારું નામ જોહન છે': 'My name is John',
-                'હું ખુશ છું': 'I am happy',
-            }
-            
-            for gujarati_text, english_text in fallback_mappings.items():
-                if gujarati_text in text:
-                    return english_text
+        translated_text, _ = self.get_alternative_translation_detailed(text, source_lang)
+        return translated_text
+    
+    def get_alternative_translation_detailed(self, text: str, source_lang: str) -> Tuple[str, bool]:
+        """
+        Same as get_alternative_translation, plus whether the text is the
+        romanized source (to be fingerspelled, not read as English)
+        Returns: (translated_text, is_romanized)
+        """
+        curated = self.phrases.translate(text, source_lang)
+        if curated is not None:
+            return curated, False
         
-        # General fallback - return a generic message
-        return f"Text in {source_lang} language"
+        # General fallback - the text romanized for fingerspelling
+        return transliterate(text), True
 
 
 # Initialize global translation service
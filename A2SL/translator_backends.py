@@ -0,0 +1,387 @@
+"""
+Translator Backends
+Interface between MultilingualTranslationService and the engines that turn
+source text into English:
+
+- GoogleTranslatorBackend: Google Translate over the network through a pool
+  of thread-safe clients (cached, coalesced and circuit-broken by the service)
+- OfflineLexiconBackend: per-language bilingual lexicons compiled by
+  `manage.py build_lexicons` into sorted, memory-mapped arrays; word and
+  phrase lookups with no network access
+
+Local backends are tried first; the network backend only sees what they
+cannot translate.
+"""
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+from array import array
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from .transliteration import romanize_word
+
+logger = logging.getLogger(__name__)
+
+
+class UntranslatableError(LookupError):
+    """A local backend cannot translate the text; the next backend should be tried"""
+
+
+class TranslatorBackend:
+    """
+    Base class of translator backends
+    """
+
+    name = 'base'
+    # Local backends answer without I/O, so the service skips caching and coalescing for them
+    is_local = False
+
+    def supports(self, source_lang: str) -> bool:
+        return True
+
+    def translate(self, text: str, source_lang: str) -> str:
+        raise NotImplementedError
+
+    def translate_batch(self, texts: List[str], source_lang: str) -> List[str]:
+        return [self.translate(text, source_lang) for text in texts]
+
+    def translate_partial(self, text: str, source_lang: str) -> str:
+        """Best-effort translation when no other backend is left (local backends only)"""
+        raise UntranslatableError(f"{self.name} backend has no partial translation")
+
+    def preload(self) -> int:
+        """Load the backend's data before the first request; returns its size in bytes"""
+        return 0
+
+    @contextmanager
+    def acquire(self):
+        """
+        The backend ready for upstream calls in the with block; local waits
+        (such as for a pooled client) happen here, outside the calls
+        """
+        yield self
+
+    def stats(self) -> Dict:
+        return {'backend': self.name}
+
+
+class GoogleTranslatorBackend(TranslatorBackend):
+    """
+    Google Translate through a TranslatorPool, or through any translator with
+    the googletrans.Translator interface
+    """
+
+    name = 'google'
+
+    # Separates batched texts in a single upstream request; Google Translate keeps line breaks
+    BATCH_SEPARATOR = '\n'
+
+    def __init__(self, translator=None, timeout: Optional[float] = None):
+        if translator is None:
+            from .translator_pool import TranslatorPool
+            # One translator per concurrent request: googletrans.Translator is not safe to share between threads
+            translator = TranslatorPool(timeout=timeout)
+        self.translator = translator
+
+    @contextmanager
+    def acquire(self):
+        """The backend bound to one translator borrowed from the pool (if pooled) for the with block"""
+        from .translator_pool import TranslatorPool
+        if not isinstance(self.translator, TranslatorPool):
+            yield self
+            return
+        with self.translator.acquire() as translator:
+            yield GoogleTranslatorBackend(translator=translator)
+
+    def translate(self, text: str, source_lang: str) -> str:
+        translated = self.translator.translate(text, src=source_lang, dest='en')
+        # Log translation for debugging
+        logger.info(f"Google Translate result: '{text}' -> '{translated.text}' (confidence: {getattr(translated, 'confidence', 'N/A')})")
+        return translated.text
+
+    def translate_batch(self, texts: List[str], source_lang: str) -> List[str]:
+        """
+        Translate several texts with one upstream request.
+        googletrans sends one request per item when given a list, so the texts
+        are joined into a single request instead; if the line count does not
+        survive translation the batch is retried item by item.
+        """
+        if len(texts) == 1 or any(self.BATCH_SEPARATOR in text for text in texts):
+            return [result.text for result in self.translator.translate(list(texts), src=source_lang, dest='en')]
+
+        translated = self.translator.translate(self.BATCH_SEPARATOR.join(texts), src=source_lang, dest='en')
+        lines = translated.text.split(self.BATCH_SEPARATOR)
+        if len(lines) == len(texts):
+            return [line.strip() for line in lines]
+
+        logger.warning(f"Batched translation returned {len(lines)} lines for {len(texts)} texts; retrying individually")
+        return [result.text for result in self.translator.translate(list(texts), src=source_lang, dest='en')]
+
+    def stats(self) -> Dict:
+        stats = {'backend': self.name}
+        if hasattr(self.translator, 'stats'):
+            stats['pool'] = self.translator.stats()
+        return stats
+
+
+LEXICON_MAGIC = b'A2LX'
+LEXICON_VERSION = 1
+# magic, version, entry count, longest phrase in words
+_LEXICON_HEADER = struct.Struct('<4sIII')
+
+# Punctuation stripped from source words (ASCII plus the danda used by Indic scripts)
+_SOURCE_PUNCTUATION = '.,!?;:"\'()[]{}।॥'
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def source_words(text: str) -> List[str]:
+    """NFC-normalized, lower-cased words of a source text without surrounding punctuation"""
+    words = []
+    for word in _WHITESPACE_RE.split(unicodedata.normalize('NFC', text)):
+        word = word.strip(_SOURCE_PUNCTUATION).casefold()
+        if word:
+            words.append(word)
+    return words
+
+
+def parse_lexicon_tsv(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    Parse 'source phrase<TAB>english' lines ('#' starts a comment line). An
+    empty English side marks words with no sign of their own (copulas,
+    particles), which are dropped from the translation.
+    """
+    entries = {}
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        source, sep, english = line.partition('\t')
+        if not sep:
+            logger.warning(f"Ignoring lexicon line without a tab: {line!r}")
+            continue
+        key = ' '.join(source_words(source))
+        if key:
+            entries[key] = english.strip()
+    return entries
+
+
+def write_lexicon(entries: Dict[str, str], path: str) -> int:
+    """
+    Compile entries into a lexicon file: a header, key and value offset
+    arrays (uint32, little-endian) and the UTF-8 key and value blobs, with
+    keys in byte order so lookups can bisect the mapping. Returns the size.
+    """
+    items = sorted((key.encode('utf-8'), value.encode('utf-8')) for key, value in entries.items())
+    key_offsets, value_offsets = array('I', [0]), array('I', [0])
+    for key, value in items:
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(value))
+    if sys.byteorder != 'little':
+        key_offsets.byteswap()
+        value_offsets.byteswap()
+    max_words = max((key.count(b' ') + 1 for key, _ in items), default=0)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_LEXICON_HEADER.pack(LEXICON_MAGIC, LEXICON_VERSION, len(items), max_words))
+        f.write(key_offsets.tobytes())
+        f.write(value_offsets.tobytes())
+        f.write(b''.join(key for key, _ in items))
+        f.write(b''.join(value for _, value in items))
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+class BilingualLexicon:
+    """
+    Read-only source phrase -> English lookups over a memory-mapped lexicon
+    file. Nothing is unpacked into Python objects, so the pages are shared by
+    every process that maps the file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = memoryview(self._mmap)
+        magic, version, count, max_words = _LEXICON_HEADER.unpack_from(data)
+        if magic != LEXICON_MAGIC or version != LEXICON_VERSION:
+            raise ValueError(f"{path} is not a version {LEXICON_VERSION} lexicon")
+        self.path = path
+        self.count = count
+        self.max_phrase_words = max_words
+
+        position = _LEXICON_HEADER.size
+        offsets_size = (count + 1) * 4
+        self._key_offsets = self._offsets(data[position:position + offsets_size])
+        position += offsets_size
+        self._value_offsets = self._offsets(data[position:position + offsets_size])
+        position += offsets_size
+        self._keys = data[position:position + self._key_offsets[count]]
+        position += self._key_offsets[count]
+        self._values = data[position:position + self._value_offsets[count]]
+
+    @staticmethod
+    def _offsets(view: memoryview):
+        if sys.byteorder == 'little':
+            return view.cast('I')
+        offsets = array('I', view.tobytes())
+        offsets.byteswap()
+        return offsets
+
+    def _key(self, index: int) -> bytes:
+        return bytes(self._keys[self._key_offsets[index]:self._key_offsets[index + 1]])
+
+    def lookup(self, phrase: str) -> Optional[str]:
+        """English for a normalized source phrase ('' for words without a sign), or None"""
+        target = phrase.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key(low) == target:
+            return str(self._values[self._value_offsets[low]:self._value_offsets[low + 1]], 'utf-8')
+        return None
+
+    def translate_words(self, words: List[str], unknown_word: Callable[[str], str] = str) -> Tuple[List[str], List[str]]:
+        """
+        Greedy longest-phrase translation of normalized source words.
+        Returns the English tokens (in source order) and the words with no entry,
+        which are passed through unknown_word into the tokens.
+        """
+        tokens, unknown = [], []
+        i = 0
+        while i < len(words):
+            for length in range(min(self.max_phrase_words, len(words) - i), 0, -1):
+                english = self.lookup(' '.join(words[i:i + length]))
+                if english is not None:
+                    tokens.extend(english.split())
+                    i += length
+                    break
+            else:
+                tokens.append(unknown_word(words[i]))
+                unknown.append(words[i])
+                i += 1
+        return tokens, unknown
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._mmap)
+
+
+class OfflineLexiconBackend(TranslatorBackend):
+    """
+    Word- and phrase-level translation from the compiled bilingual lexicons
+    (<language>.lex in OFFLINE_LEXICON_DIR). Texts with too many unknown words
+    raise UntranslatableError so the next backend can take them. Unknown words
+    (names, mostly) are romanized and marked for fingerspelling.
+    """
+
+    name = 'offline'
+    is_local = True
+
+    def __init__(self, directory: Optional[str] = None, min_coverage: Optional[float] = None):
+        self._directory = directory
+        self._min_coverage = min_coverage
+        self._lexicons: Dict[str, Optional[BilingualLexicon]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return self._directory or settings.OFFLINE_LEXICON_DIR
+
+    @property
+    def min_coverage(self) -> float:
+        if self._min_coverage is None:
+            return getattr(settings, 'OFFLINE_LEXICON_MIN_COVERAGE', 1.0)
+        return self._min_coverage
+
+    def get_lexicon(self, source_lang: str) -> Optional[BilingualLexicon]:
+        """The lexicon of a language, mapped on first use (None if there is none)"""
+        if source_lang in self._lexicons:
+            return self._lexicons[source_lang]
+        with self._lock:
+            if source_lang not in self._lexicons:
+                path = os.path.join(self.directory, f"{source_lang}.lex")
+                lexicon = None
+                if os.path.exists(path):
+                    try:
+                        lexicon = BilingualLexicon(path)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Could not load lexicon {path}: {e}")
+                self._lexicons[source_lang] = lexicon
+        return self._lexicons[source_lang]
+
+    def supports(self, source_lang: str) -> bool:
+        return self.get_lexicon(source_lang) is not None
+
+    def translate(self, text: str, source_lang: str) -> str:
+        return self._translate(text, source_lang, self.min_coverage)
+
+    def translate_partial(self, text: str, source_lang: str) -> str:
+        """Translation of any text with at least one known word, whatever the coverage"""
+        return self._translate(text, source_lang, None)
+
+    def _translate(self, text: str, source_lang: str, min_coverage: Optional[float]) -> str:
+        lexicon = self.get_lexicon(source_lang)
+        if lexicon is None:
+            raise UntranslatableError(f"No offline lexicon for '{source_lang}'")
+        words = source_words(text)
+        if not words:
+            raise UntranslatableError("Nothing to translate")
+        tokens, unknown = lexicon.translate_words(words, romanize_word)
+        coverage = 1 - len(unknown) / len(words)
+        if not tokens or coverage == 0 or (min_coverage is not None and coverage < min_coverage):
+            raise UntranslatableError(f"Offline lexicon covers {coverage:.0%} of the words")
+        translated_text = ' '.join(tokens)
+        logger.info(f"Offline translation ({source_lang}): '{text}' -> '{translated_text}'")
+        return translated_text
+
+    def preload(self) -> int:
+        """Map the lexicon of every language that has one; returns their total size in bytes"""
+        total = 0
+        for name in sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []:
+            if name.endswith('.lex'):
+                lexicon = self.get_lexicon(name[:-len('.lex')])
+                total += lexicon.nbytes if lexicon is not None else 0
+        return total
+
+    def stats(self) -> Dict:
+        return {
+            'backend': self.name,
+            'lexicons': {lang: len(lexicon) for lang, lexicon in self._lexicons.items() if lexicon is not None},
+        }
+
+
+TRANSLATOR_BACKENDS = {
+    'google': GoogleTranslatorBackend,
+    'offline': OfflineLexiconBackend,
+}
+
+
+def get_translator_backends(names: Optional[Iterable[str]] = None) -> List[TranslatorBackend]:
+    """Backends named in TRANSLATION_BACKENDS (unknown names are skipped with a warning)"""
+    if names is None:
+        names = getattr(settings, 'TRANSLATION_BACKENDS', ['google'])
+    backends = []
+    for name in names:
+        backend_class = TRANSLATOR_BACKENDS.get(name.strip())
+        if backend_class is None:
+            logger.warning(f"Unknown translation backend '{name}'")
+            continue
+        backends.append(backend_class())
+    return backends
@@ -0,0 +1,152 @@
+"""
+Translator Client Pool
+Thread-safe use of googletrans for threaded (gthread) gunicorn workers.
+
+A single googletrans.Translator shares one httpx client among all request
+threads and, on an error status, rewrites a module-level placeholder
+response, so it cannot be shared safely. TranslatorPool lends each thread a
+Translator of its own for the duration of a request:
+
+- translators keep their keep-alive connection between requests and are
+  reused most-recently-used first, so a warm connection (and its resolved
+  address) serves the next request
+- at most TRANSLATION_POOL_SIZE translators (and upstream connections) exist
+  per process; further threads wait for one until their translation deadline
+- translators raise on error statuses instead of returning the placeholder
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from django.conf import settings
+
+from .deadline import remaining, request_timeout
+
+logger = logging.getLogger(__name__)
+
+
+class TranslatorPoolExhausted(TimeoutError):
+    """No translator became free within the pool timeout"""
+
+
+def create_translator(timeout: Optional[float] = None, **kwargs):
+    """googletrans.Translator that raises on error statuses, with a request timeout"""
+    from googletrans import Translator
+    return Translator(
+        raise_exception=True,
+        # googletrans hands the value to httpx as is; httpx 0.13 only accepts a Timeout there
+        timeout=httpx.Timeout(timeout if timeout is not None else request_timeout()),
+        **kwargs,
+    )
+
+
+class TranslatorPool:
+    """
+    Bounded pool of googletrans.Translator instances with the same
+    translate() interface: each call borrows a translator for its duration.
+    Translators are created on demand, up to max_size. A thread waits for a
+    free one until its translation deadline, or acquire_timeout outside one.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, acquire_timeout: Optional[float] = None,
+                 timeout: Optional[float] = None, factory: Optional[Callable[[], Any]] = None):
+        self.timeout = timeout if timeout is not None else request_timeout()
+        self.factory = factory or (lambda: create_translator(self.timeout))
+        self.max_size = max_size or getattr(settings, 'TRANSLATION_POOL_SIZE', 8)
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else request_timeout()
+        self._idle: List[Any] = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._pid = os.getpid()
+        self.created = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    def _check_fork(self) -> None:
+        # Translators created before a fork share their sockets with the parent; children start empty
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = []
+            self._size = 0
+            self.in_use = 0
+
+    def _checkout(self):
+        acquire_timeout = min(self.acquire_timeout, remaining(self.acquire_timeout))
+        deadline = time.monotonic() + acquire_timeout
+        with self._condition:
+            self._check_fork()
+            if not self._idle and self._size >= self.max_size:
+                self.waits += 1
+            while not self._idle and self._size >= self.max_size:
+                time_left = deadline - time.monotonic()
+                if time_left <= 0:
+                    self.timeouts += 1
+                    raise TranslatorPoolExhausted(f"No translator free after {acquire_timeout:.2f}s")
+                self._condition.wait(time_left)
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            if self._idle:
+                # Most recently used first: its connection is the most likely to still be open
+                return self._idle.pop()
+            self._size += 1
+
+        try:
+            translator = self.factory()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self.in_use -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.created += 1
+        return translator
+
+    def _checkin(self, translator) -> None:
+        with self._condition:
+            self.in_use -= 1
+            self._idle.append(translator)
+            self._condition.notify()
+
+    @contextmanager
+    def acquire(self):
+        """
+        Borrow a translator for the duration of the with block; its request
+        timeout is cut to what is left of the translation deadline
+        """
+        translator = self._checkout()
+        try:
+            translator.client.timeout = httpx.Timeout(min(self.timeout, remaining(self.timeout)))
+            yield translator
+        finally:
+            self._checkin(translator)
+
+    def translate(self, text, src: str = 'auto', dest: str = 'en'):
+        with self.acquire() as translator:
+            return translator.translate(text, src=src, dest=dest)
+
+    def close(self) -> None:
+        """Close the idle translators' connections; translators in use rejoin the pool when released"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for translator in idle:
+            translator.client.close()
+
+    def stats(self) -> Dict:
+        return {
+            'size': self._size,
+            'max_size': self.max_size,
+            'idle': len(self._idle),
+            'in_use': self.in_use,
+            'max_in_use': self.max_in_use,
+            'created': self.created,
+            'waits': self.waits,
+            'timeouts': self.timeouts,
+        }
@@ -0,0 +1,193 @@
+"""
+Indic Transliteration
+Romanizes text in the Indic scripts of the supported languages with
+precompiled str.translate tables, so that when no translation is available
+names and other words can still be fingerspelled from the A-Z clips instead
+of being dropped or replaced by a placeholder.
+
+The Unicode blocks of these scripts share one layout (inherited from ISCII),
+so every script's table is built from the same offset -> Latin table plus a
+few script-specific letters. Consonants carry an inherent 'a' that vowel
+signs and the virama remove; it is also dropped at the end of words in the
+scripts whose languages do not pronounce it (Hindi 'राम' -> 'ram').
+"""
+import re
+import unicodedata
+from typing import Dict, NamedTuple
+
+# Placeholders written by the translate tables and resolved afterwards
+INHERENT = '\ue000'        # inherent vowel, dropped at the end of a word
+INHERENT_KEPT = '\ue001'   # inherent vowel of scripts that always pronounce it
+KILL = '\ue002'            # vowel sign or virama: removes the preceding inherent vowel
+KILL_FINAL_U = '\ue003'    # Malayalam virama: like KILL, but read as 'u' at the end of a word
+
+# Offsets in each Indic block (Devanagari letters shown)
+SIGNS = {
+    0x01: 'n',   # ँ candrabindu
+    0x02: 'n',   # ं anusvara
+    0x03: 'h',   # ः visarga
+    0x3C: '',    # ़ nukta (see NUKTA_LETTERS)
+    0x3D: '',    # ऽ avagraha
+    0x50: 'om',  # ॐ
+    0x55: '',    # Telugu/Kannada length marks
+    0x56: '',
+    0x70: 'n',   # ੰ Gurmukhi tippi
+    0x71: '',    # ੱ Gurmukhi addak (doubles the next consonant)
+    0x75: 'y',   # ੵ Gurmukhi yakash
+}
+
+VOWELS = {
+    0x04: 'a', 0x05: 'a', 0x06: 'a', 0x07: 'i', 0x08: 'i', 0x09: 'u', 0x0A: 'u', 0x0B: 'ri', 0x0C: 'li',
+    0x0D: 'e', 0x0E: 'e', 0x0F: 'e', 0x10: 'ai', 0x11: 'o', 0x12: 'o', 0x13: 'o', 0x14: 'au',
+    0x60: 'ri', 0x61: 'li',
+}
+
+CONSONANTS = {
+    0x15: 'k', 0x16: 'kh', 0x17: 'g', 0x18: 'gh', 0x19: 'ng',
+    0x1A: 'ch', 0x1B: 'chh', 0x1C: 'j', 0x1D: 'jh', 0x1E: 'ny',
+    0x1F: 't', 0x20: 'th', 0x21: 'd', 0x22: 'dh', 0x23: 'n',
+    0x24: 't', 0x25: 'th', 0x26: 'd', 0x27: 'dh', 0x28: 'n', 0x29: 'n',
+    0x2A: 'p', 0x2B: 'ph', 0x2C: 'b', 0x2D: 'bh', 0x2E: 'm',
+    0x2F: 'y', 0x30: 'r', 0x31: 'r', 0x32: 'l', 0x33: 'l', 0x34: 'zh', 0x35: 'v',
+    0x36: 'sh', 0x37: 'sh', 0x38: 's', 0x39: 'h',
+    0x5F: 'y',
+}
+
+VOWEL_SIGNS = {
+    0x3E: 'a', 0x3F: 'i', 0x40: 'i', 0x41: 'u', 0x42: 'u', 0x43: 'ri', 0x44: 'ri',
+    0x45: 'e', 0x46: 'e', 0x47: 'e', 0x48: 'ai', 0x49: 'o', 0x4A: 'o', 0x4B: 'o', 0x4C: 'au',
+    0x4D: '',    # virama
+    0x57: 'au',  # Odia/Malayalam au length mark
+    0x62: 'li', 0x63: 'li',
+}
+
+# Consonant + nukta (NFC keeps most of these decomposed): Urdu and Persian sounds
+NUKTA_LETTERS = {
+    0x15: 'q', 0x16: 'kh', 0x17: 'gh', 0x1C: 'z', 0x21: 'r', 0x22: 'rh', 0x2B: 'f', 0x2F: 'y',
+    0x32: 'l', 0x38: 'sh',
+}
+
+# Romanized words inside an otherwise English translation are wrapped in these marks
+# ('My Name \u2039ram\u203a') so the sign pipeline fingerspells them instead of reading them as English
+SPELL_OPEN = '\u2039'
+SPELL_CLOSE = '\u203a'
+SPELLED_RE = re.compile(f'{SPELL_OPEN}([^{SPELL_CLOSE}]*){SPELL_CLOSE}')
+
+# Malayalam virama + zero-width joiner: the pre-Unicode 5.1 spelling of a chillu (bare consonant, 'അവന്\u200d' -> 'avan')
+MALAYALAM_CHILLU_ZWJ = '\u0d4d\u200d'
+
+# Dandas (shared by all the scripts) and the zero-width (non-)joiners
+PUNCTUATION = {'।': '.', '॥': '.', '\u200c': '', '\u200d': ''}
+
+
+class Script(NamedTuple):
+    name: str
+    base: int
+    # The inherent vowel is silent at the end of words (Indo-Aryan languages except Odia)
+    drop_final_vowel: bool
+    # Script-specific letters: offset -> (Latin, kind); a 'consonant' carries the inherent vowel, a 'letter' does not
+    letters: Dict[int, tuple] = {}
+
+
+SCRIPTS = [
+    Script('Devanagari', 0x0900, True),
+    Script('Bengali', 0x0980, True, {
+        0x2F: ('j', 'consonant'),      # য
+        0x4E: ('t', 'letter'),         # ৎ khanda ta
+        0x70: ('r', 'consonant'),      # ৰ Assamese ra
+        0x71: ('w', 'consonant'),      # ৱ Assamese wa
+    }),
+    Script('Gurmukhi', 0x0A00, True, {
+        0x72: ('', 'consonant'),       # ੲ vowel carrier
+        0x73: ('', 'consonant'),       # ੳ vowel carrier
+    }),
+    Script('Gujarati', 0x0A80, True),
+    Script('Oriya', 0x0B00, False, {
+        0x2F: ('j', 'consonant'),      # ଯ
+        0x71: ('w', 'consonant'),      # ୱ
+    }),
+    Script('Tamil', 0x0B80, False),
+    Script('Telugu', 0x0C00, False, {0x02: ('m', 'letter')}),
+    Script('Kannada', 0x0C80, False, {0x02: ('m', 'letter')}),
+    Script('Malayalam', 0x0D00, False, {
+        0x02: ('m', 'letter'),
+        0x4E: ('r', 'letter'),         # ൎ dot reph
+        0x7A: ('n', 'letter'), 0x7B: ('n', 'letter'), 0x7C: ('r', 'letter'),  # chillu letters
+        0x7D: ('l', 'letter'), 0x7E: ('l', 'letter'), 0x7F: ('k', 'letter'),
+    }),
+]
+
+
+def build_script_table(script: Script) -> Dict[int, str]:
+    """str.translate table of one script"""
+    inherent = INHERENT if script.drop_final_vowel else INHERENT_KEPT
+    table = {}
+    for offset, latin in SIGNS.items():
+        table[script.base + offset] = latin
+    for offset, latin in VOWELS.items():
+        table[script.base + offset] = latin
+    for offset, latin in CONSONANTS.items():
+        table[script.base + offset] = latin + inherent
+    for offset, latin in VOWEL_SIGNS.items():
+        table[script.base + offset] = KILL + latin
+    if script.name == 'Malayalam':
+        table[script.base + 0x4D] = KILL_FINAL_U
+    for offset in range(10):
+        table[script.base + 0x66 + offset] = str(offset)
+    for offset, (latin, kind) in script.letters.items():
+        table[script.base + offset] = latin + inherent if kind == 'consonant' else latin
+    return table
+
+
+def _build_tables():
+    table = {ord(char): latin for char, latin in PUNCTUATION.items()}
+    nukta_letters = {}
+    for script in SCRIPTS:
+        table.update(build_script_table(script))
+        inherent = INHERENT if script.drop_final_vowel else INHERENT_KEPT
+        for offset, latin in NUKTA_LETTERS.items():
+            nukta_letters[chr(script.base + offset) + chr(script.base + 0x3C)] = latin + inherent
+    return table, nukta_letters
+
+
+# One table covers every script (their blocks do not overlap), so mixed-script text needs a single pass
+TRANSLITERATION_TABLE, _NUKTA_LETTERS = _build_tables()
+_NUKTA_RE = re.compile('|'.join(map(re.escape, _NUKTA_LETTERS)))
+_NUKTAS = frozenset(chr(script.base + 0x3C) for script in SCRIPTS)
+_KILLED_RE = re.compile(f'[{INHERENT}{INHERENT_KEPT}]?([{KILL}{KILL_FINAL_U}])')
+_WORD_RE = re.compile(f'[a-z{INHERENT}{INHERENT_KEPT}{KILL_FINAL_U}]+')
+_VOWELS = frozenset('aeiou' + INHERENT + INHERENT_KEPT)
+
+
+def _finish_word(match) -> str:
+    word = match.group()
+    if word.endswith(KILL_FINAL_U):
+        word = word[:-1] + 'u'
+    # A lone syllable keeps its vowel ('न' -> 'na', not 'n')
+    elif word.endswith(INHERENT) and sum(char in _VOWELS for char in word) > 1:
+        word = word[:-1]
+    return word.replace(INHERENT, 'a').replace(INHERENT_KEPT, 'a').replace(KILL_FINAL_U, '')
+
+
+def transliterate(text: str) -> str:
+    """
+    Lower-case Latin rendering of the Indic letters in text ('नमस्ते' -> 'namaste');
+    Latin letters, digits and punctuation are kept, other characters pass through
+    """
+    text = unicodedata.normalize('NFC', text)
+    if MALAYALAM_CHILLU_ZWJ in text:
+        # A plain virama, not the Malayalam one that is read as 'u' at the end of a word
+        text = text.replace(MALAYALAM_CHILLU_ZWJ, KILL)
+    if any(char in _NUKTAS for char in text):
+        text = _NUKTA_RE.sub(lambda match: _NUKTA_LETTERS[match.group()], text)
+    text = text.translate(TRANSLITERATION_TABLE)
+    text = _KILLED_RE.sub(lambda match: match.group(1) if match.group(1) == KILL_FINAL_U else '', text)
+    return _WORD_RE.sub(_finish_word, text)
+
+
+def romanize_word(word: str) -> str:
+    """A source word romanized and marked for fingerspelling; words with no Indic letters are kept as they are"""
+    romanized = transliterate(word)
+    if romanized == word:
+        return word
+    return f"{SPELL_OPEN}{romanized}{SPELL_CLOSE}"
@@ -13,10 +13,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from . import views
 
+# Under ASGI (SERVE_ASYNC) the conversion views await translations instead of blocking a worker
+if settings.SERVE_ASYNC:
+    animation_view, convert_api = views.animation_view_async, views.convert_api_async
+else:
+    animation_view, convert_api = views.animation_view, views.convert_api
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('about/',views.about_view,name='about'),
@@ -24,8 +31,12 @@ urlpatterns = [
     path('login/',views.login_view,name='login'),
     path('logout/',views.logout_view,name='logout'),
     path('signup/',views.signup_view,name='signup'),
-    path('animation/',views.animation_view,name='animation'),
+    path('animation/',animation_view,name='animation'),
     path('',views.home_view,name='home'),
     # API endpoints for multilingual support
     path('api/languages/', views.get_supported_languages, name='get_languages'),
+    path('api/convert/', convert_api, name='convert'),
+    path('api/metrics/', views.metrics_view, name='metrics'),
+    # Readiness probe for load balancers / autoscaling
+    path('health/ready/', views.readiness_view, name='readiness'),
 ]
@@ -1,16 +1,27 @@
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render, redirect
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import login,logout
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import nltk
-from django.contrib.staticfiles import finders
 from django.contrib.auth.decorators import login_required
 from .translation_service import translation_service
+from .sign_vocabulary import sign_vocabulary
+from .nlp_models import lemmatizer, lexicon_tagger
+from .nltk_resources import nltk_resources
+from .sign_pipeline import sign_pipeline
+from .preload import process_memory
+from .warmup import warmup_state
+from .caching import LocalTTLCache
+from .transliteration import SPELLED_RE
+from django.conf import settings
+import asyncio
+import re
+import unicodedata
 import logging
+import hmac
 import json
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from typing import Tuple
@@ -38,10 +49,48 @@ def get_supported_languages(request):
     }
     return JsonResponse({'languages': active_languages})
 
+# Readiness probe: reports whether this worker finished warming up its models
+@require_http_methods(["GET"])
+def readiness_view(request):
+    """Return warm-up state; 503 until the worker is ready to serve"""
+    state = warmup_state.as_dict()
+    return JsonResponse(state, status=200 if state['ready'] else 503)
+
+# Memoized results of process_multilingual_text, keyed on vocabulary version, language and text
+pipeline_cache = LocalTTLCache(
+    max_size=getattr(settings, 'PIPELINE_CACHE_MAX_SIZE', 4096),
+    ttl=getattr(settings, 'PIPELINE_CACHE_TTL', 3600),
+)
+
+def make_pipeline_key(text: str, selected_language: str) -> str:
+    """Cache key: vocabulary version, selected language and NFC text with collapsed whitespace"""
+    normalized = re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text).strip())
+    return f"{sign_vocabulary.version}:{selected_language}:{normalized}"
+
 # Process multilingual text for sign language conversion
 def process_multilingual_text(text: str, selected_language: str = 'auto') -> Tuple[str, str, list]:
     """
     Process text in any supported language and convert to English for sign language.
+    Repeated inputs are served from pipeline_cache; conversions that used the
+    offline translation fallback are not cached.
+    """
+    if not text or not text.strip():
+        return "", "en", []
+
+    cache_key = make_pipeline_key(text, selected_language)
+    cached = pipeline_cache.get(cache_key)
+    if cached is not None:
+        english_text, detected_language, processed_words = cached
+        return english_text, detected_language, list(processed_words)
+
+    english_text, detected_language, processed_words, cacheable = _run_multilingual_pipeline(text, selected_language)
+    if cacheable:
+        pipeline_cache.set(cache_key, (english_text, detected_language, tuple(processed_words)))
+    return english_text, detected_language, processed_words
+
+def _run_multilingual_pipeline(text: str, selected_language: str) -> Tuple[str, str, list, bool]:
+    """
+    Run the full conversion pipeline; the last element tells whether the result may be cached.
     This function now includes:
     - Preprocessing of text before translation.
     - Auto-detection of language if not specified.
@@ -52,129 +101,161 @@ def process_multilingual_text(text: str, selected_language: str = 'auto') -> Tup
     logger = logging.getLogger(__name__)
 
     try:
-        if not text or not text.strip():
-            return "", "en", []
-
-        # Auto-detect language if needed
-        if selected_language == 'auto':
-            detected_language = translation_service.detect_language(text)
-            if not translation_service.is_language_supported(detected_language):
-                logger.warning(f"Detected language '{detected_language}' is not supported. Defaulting to English.")
-                detected_language = 'en'
-        else:
-            detected_language = selected_language
-
-        # Preprocess text before translation
-        preprocessed_text = translation_service.preprocess_text_for_translation(text, detected_language)
+        detected_language, preprocessed_text = _detect_and_preprocess(text, selected_language)
 
         # Translate to English if the source language is not English
+        translation_fallback = False
         if detected_language != 'en':
-            english_text, _ = translation_service.translate_to_english(preprocessed_text, detected_language)
-            
-            # Validate translation quality
-            if not translation_service.validate_translation_quality(preprocessed_text, english_text, detected_language):
-                logger.warning(f"Poor translation quality detected, using alternative translation")
-                english_text = translation_service.get_alternative_translation(preprocessed_text, detected_language)
-            
-            # Enhance the quality of the translation for better sign language conversion
-            english_text = translation_service.enhance_translation_quality(preprocessed_text, english_text, detected_language)
+            english_text, _, translation_fallback = translation_service.translate_to_english_detailed(preprocessed_text, detected_language)
+            english_text, romanized = _check_translation(preprocessed_text, english_text, detected_language)
+            translation_fallback = translation_fallback or romanized
         else:
             english_text = preprocessed_text
 
         logger.info(f"Original ('{detected_language}'): '{text}' -> Preprocessed: '{preprocessed_text}' -> English: '{english_text}'")
 
-        # Process the final English text to get sign language words
-        processed_words = process_english_for_sign_language(english_text)
-
-        return english_text, detected_language, processed_words
+        processed_words = _sign_words(english_text, translation_fallback)
+        return _display_text(english_text), detected_language, processed_words, not translation_fallback
 
     except Exception as e:
         logger.error(f"Multilingual text processing failed: {e}")
         # Fallback to basic processing of original text
         processed_words = process_english_for_sign_language(text)
+        return text, 'en', processed_words, False
+
+def _detect_and_preprocess(text: str, selected_language: str) -> Tuple[str, str]:
+    """Resolve 'auto' to a supported language and preprocess the text for translation"""
+    # Auto-detect language if needed
+    if selected_language == 'auto':
+        detected_language = translation_service.detect_language(text)
+        if not translation_service.is_language_supported(detected_language):
+            logging.getLogger(__name__).warning(f"Detected language '{detected_language}' is not supported. Defaulting to English.")
+            detected_language = 'en'
+    else:
+        detected_language = selected_language
+
+    # Preprocess text before translation
+    return detected_language, translation_service.preprocess_text_for_translation(text, detected_language)
+
+def _check_translation(preprocessed_text: str, english_text: str, detected_language: str) -> Tuple[str, bool]:
+    """
+    Replace poor translations and post-process the English text for sign conversion;
+    the flag tells whether the replacement is the romanized source text
+    """
+    romanized = False
+    # Validate translation quality
+    if not translation_service.validate_translation_quality(preprocessed_text, english_text, detected_language):
+        logging.getLogger(__name__).warning(f"Poor translation quality detected, using alternative translation")
+        english_text, romanized = translation_service.get_alternative_translation_detailed(preprocessed_text, detected_language)
+
+    # Enhance the quality of the translation for better sign language conversion
+    return translation_service.enhance_translation_quality(preprocessed_text, english_text, detected_language), romanized
+
+def _display_text(english_text: str) -> str:
+    """English text as shown to users: the markers around romanized words are for _sign_words only"""
+    return SPELLED_RE.sub(r'\1', english_text)
+
+def _sign_words(english_text: str, translation_fallback: bool) -> list:
+    """
+    Process the final English text to get sign language words; untranslated text was
+    romanized by the fallback and is fingerspelled instead of being read as English words
+    """
+    if translation_fallback:
+        return sign_pipeline.fingerspell(english_text)
+    return process_english_for_sign_language(english_text)
+
+# Bounded pool for the CPU-bound NLP stage of the async views, so it never runs on the event loop
+nlp_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'NLP_THREAD_POOL_SIZE', 4), thread_name_prefix='nlp'
+)
+
+async def run_nlp(func, *args):
+    """Run a CPU-bound NLP step on nlp_executor and await its result"""
+    return await asyncio.get_running_loop().run_in_executor(nlp_executor, func, *args)
+
+async def process_multilingual_text_async(text: str, selected_language: str = 'auto') -> Tuple[str, str, list]:
+    """
+    process_multilingual_text for the ASGI views: the translation is awaited on the
+    pooled async client and the NLP stages run on nlp_executor
+    """
+    if not text or not text.strip():
+        return "", "en", []
+
+    cache_key = make_pipeline_key(text, selected_language)
+    cached = pipeline_cache.get(cache_key)
+    if cached is not None:
+        english_text, detected_language, processed_words = cached
+        return english_text, detected_language, list(processed_words)
+
+    logger = logging.getLogger(__name__)
+    try:
+        detected_language, preprocessed_text = await run_nlp(_detect_and_preprocess, text, selected_language)
+
+        translation_fallback = False
+        if detected_language != 'en':
+            english_text, _, translation_fallback = await translation_service.translate_to_english_detailed_async(
+                preprocessed_text, detected_language
+            )
+            english_text, romanized = _check_translation(preprocessed_text, english_text, detected_language)
+            translation_fallback = translation_fallback or romanized
+        else:
+            english_text = preprocessed_text
+
+        logger.info(f"Original ('{detected_language}'): '{text}' -> Preprocessed: '{preprocessed_text}' -> English: '{english_text}'")
+
+        processed_words = await run_nlp(_sign_words, english_text, translation_fallback)
+        english_text = _display_text(english_text)
+    except Exception as e:
+        logger.error(f"Multilingual text processing failed: {e}")
+        processed_words = await run_nlp(process_english_for_sign_language, text)
         return text, 'en', processed_words
 
+    if not translation_fallback:
+        pipeline_cache.set(cache_key, (english_text, detected_language, tuple(processed_words)))
+    return english_text, detected_language, processed_words
+
+def _metrics_allowed(request) -> bool:
+    """Staff users, or a monitoring scraper sending 'Authorization: Bearer <METRICS_TOKEN>'"""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    return bool(token) and header.startswith('Bearer ') and hmac.compare_digest(header[len('Bearer '):], token)
+
+# Cache and upstream counters for monitoring
+@require_http_methods(["GET"])
+def metrics_view(request):
+    """Return hit rates of the conversion caches and translation upstream state (staff or METRICS_TOKEN only)"""
+    if not _metrics_allowed(request):
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    pipeline_stats = pipeline_cache.stats.as_dict()
+    pipeline_stats['size'] = len(pipeline_cache)
+    lemma_stats = lemmatizer.stats.as_dict()
+    lemma_stats['size'] = len(lemmatizer)
+    lemma_stats['backend'] = lemmatizer.backend_name
+    synonyms = sign_pipeline.synonyms
+    synonym_stats = dict(synonyms.stats.as_dict(), size=len(synonyms)) if synonyms is not None else None
+    fuzzy = sign_pipeline.fuzzy
+    fuzzy_stats = dict(fuzzy.stats.as_dict(), deletes=len(fuzzy)) if fuzzy is not None else None
+    return JsonResponse({
+        'pipeline_cache': pipeline_stats,
+        'lemma_cache': lemma_stats,
+        'pos_tagger': lexicon_tagger.stats(),
+        'nltk_resources': nltk_resources.stats(),
+        'translation_cache': translation_service.get_cache_stats(),
+        'translation_upstream': translation_service.get_upstream_stats(),
+        'sign_vocabulary': {'clips': len(sign_vocabulary), 'version': sign_vocabulary.version},
+        'synonyms': synonym_stats,
+        'fuzzy_match': fuzzy_stats,
+        'phrase_tables': translation_service.phrases.stats(),
+        'worker_memory': process_memory(),
+    })
+
 def process_english_for_sign_language(text):
     """
     Process English text for sign language conversion (extracted from original logic)
     """
-    if not text:
-        return []
-    
-    # Tokenizing the sentence and removing punctuation
-    text = text.lower()
-    words = word_tokenize(text)
-    
-    # Remove punctuation tokens
-    words = [word for word in words if word.isalpha()]
-    
-    tagged = nltk.pos_tag(words)
-    tense = {}
-    tense["future"] = len([word for word in tagged if word[1] == "MD"])
-    tense["present"] = len([word for word in tagged if word[1] in ["VBP", "VBZ","VBG"]])
-    tense["past"] = len([word for word in tagged if word[1] in ["VBD", "VBN"]])
-    tense["present_continuous"] = len([word for word in tagged if word[1] in ["VBG"]])
-    
-    # Stopwords that will be removed
-    stop_words = set(["mightn't", 're', 'wasn', 'wouldn', 'be', 'has', 'that', 'does', 'shouldn', 'do', "you've",'off', 'for', "didn't", 'm', 'ain', 'haven', "weren't", 'are', "she's", "wasn't", 'its', "haven't", "wouldn't", 'don', 'weren', 's', "you'd", "don't", 'doesn', "hadn't", 'is', 'was', "that'll", "should've", 'a', 'then', 'the', 'mustn', 'i', 'nor', 'as', "it's", "needn't", 'd', 'am', 'have',  'hasn', 'o', "aren't", "you'll", "couldn't", "you're", "mustn't", 'didn', "doesn't", 'll', 'an', 'hadn', 'whom', 'y', "hasn't", 'itself', 'couldn', 'needn', "shan't", 'isn', 'been', 'such', 'shan', "shouldn't", 'aren', 'being', 'were', 'did', 'ma', 't', 'having', 'mightn', 've', "isn't", "won't"])
-    
-    # Removing stopwords, punctuation, and applying lemmatizing nlp process to words
-    lr = WordNetLemmatizer()
-    filtered_text = []
-    for w,p in zip(words,tagged):
-        # Skip punctuation and stopwords
-        if w not in stop_words and w.isalpha():  # Only keep alphabetic words
-            if p[1]=='VBG' or p[1]=='VBD' or p[1]=='VBZ' or p[1]=='VBN' or p[1]=='NN':
-                filtered_text.append(lr.lemmatize(w,pos='v'))
-            elif p[1]=='JJ' or p[1]=='JJR' or p[1]=='JJS'or p[1]=='RBR' or p[1]=='RBS':
-                filtered_text.append(lr.lemmatize(w,pos='a'))
-            else:
-                filtered_text.append(lr.lemmatize(w))
-    
-    # Adding the specific word to specify tense
-    words = filtered_text
-    temp=[]
-    for w in words:
-        if w=='I':
-            temp.append('Me')
-        else:
-            temp.append(w)
-    words = temp
-    probable_tense = max(tense,key=tense.get)
-    
-    if probable_tense == "past" and tense["past"]>=1:
-        temp = ["Before"]
-        temp = temp + words
-        words = temp
-    elif probable_tense == "future" and tense["future"]>=1:
-        if "Will" not in words:
-                temp = ["Will"]
-                temp = temp + words
-                words = temp
-        else:
-            pass
-    elif probable_tense == "present":
-        if tense["present_continuous"]>=1:
-            temp = ["Now"]
-            temp = temp + words
-            words = temp
-    
-    filtered_text = []
-    for w in words:
-        # Capitalize first letter to match video file names (e.g., H.mp4, Hello.mp4)
-        capitalized_word = w.capitalize()
-        path = capitalized_word + ".mp4"
-        f = finders.find(path)
-        # Splitting the word if its animation is not present in database
-        if not f:
-            # Try uppercase for single characters
-            for c in w:
-                filtered_text.append(c.upper())
-        # Otherwise animation of word
-        else:
-            filtered_text.append(capitalized_word)
-    
-    return filtered_text
+    return sign_pipeline.convert(text)
 
 @login_required(login_url="login")
 def animation_view(request):
@@ -194,20 +275,7 @@ def animation_view(request):
             original_text, selected_language
         )
         
-        # Get language information
-        source_lang_info = translation_service.get_language_info(detected_language)
-        
-        context = {
-            'words': processed_words,
-            'original_text': original_text,
-            'english_text': english_text,
-            'detected_language': detected_language,
-            'source_language_name': source_lang_info.get('native_name', source_lang_info.get('name')),
-            'selected_language': selected_language,
-            'supported_languages': translation_service.get_supported_languages(),
-            'translation_performed': detected_language != 'en'
-        }
-        
+        context = _animation_context(original_text, selected_language, english_text, detected_language, processed_words)
         return render(request, 'animation.html', context)
     else:
         # GET request - show the form with language options
@@ -216,6 +284,105 @@ def animation_view(request):
         }
         return render(request, 'animation.html', context)
 
+def _animation_context(original_text, selected_language, english_text, detected_language, processed_words) -> dict:
+    """Template context of a converted sentence"""
+    # Get language information
+    source_lang_info = translation_service.get_language_info(detected_language)
+    
+    return {
+        'words': processed_words,
+        'original_text': original_text,
+        'english_text': english_text,
+        'detected_language': detected_language,
+        'source_language_name': source_lang_info.get('native_name', source_lang_info.get('name')),
+        'selected_language': selected_language,
+        'supported_languages': translation_service.get_supported_languages(),
+        'translation_performed': detected_language != 'en'
+    }
+
+async def animation_view_async(request):
+    """
+    animation_view for the ASGI deployment (SERVE_ASYNC): the translation wait
+    suspends the request instead of holding a worker thread
+    """
+    # login_required cannot wrap coroutine views in this Django version; the session lookup is synchronous
+    is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+    if not is_authenticated:
+        return redirect_to_login(request.get_full_path(), 'login')
+    
+    if request.method != 'POST':
+        return render(request, 'animation.html', {
+            'supported_languages': translation_service.get_supported_languages()
+        })
+    
+    original_text = request.POST.get('sen', '').strip()
+    selected_language = request.POST.get('language', 'en')
+    if not original_text:
+        return render(request, 'animation.html', {
+            'error': 'Please enter some text or use the microphone.',
+            'supported_languages': translation_service.get_supported_languages()
+        })
+    
+    english_text, detected_language, processed_words = await process_multilingual_text_async(
+        original_text, selected_language
+    )
+    context = _animation_context(original_text, selected_language, english_text, detected_language, processed_words)
+    return render(request, 'animation.html', context)
+
+def _parse_convert_request(request) -> Tuple[str, str]:
+    """Text and language of a conversion request (JSON body or form fields)"""
+    if request.content_type == 'application/json':
+        data = json.loads(request.body or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError('Expected a JSON object')
+    else:
+        data = request.POST
+    return str(data.get('text', '')).strip(), str(data.get('language', 'auto'))
+
+def _unauthenticated_response() -> JsonResponse:
+    return JsonResponse({'error': 'Authentication required'}, status=401)
+
+def _convert_response(english_text, detected_language, processed_words) -> JsonResponse:
+    return JsonResponse({
+        'english_text': english_text,
+        'detected_language': detected_language,
+        'words': processed_words,
+    })
+
+# JSON conversion API: {"text": ..., "language": "auto"} -> English text and sign clip names
+@csrf_exempt
+@require_http_methods(["POST"])
+def convert_api(request):
+    """Convert text in any supported language to sign clip names (signed-in users only)"""
+    # A JSON error instead of login_required's redirect to the login page
+    if not request.user.is_authenticated:
+        return _unauthenticated_response()
+    try:
+        text, selected_language = _parse_convert_request(request)
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid request: {e}'}, status=400)
+    if not text:
+        return JsonResponse({'error': 'No text given'}, status=400)
+    return _convert_response(*process_multilingual_text(text, selected_language))
+
+async def convert_api_async(request):
+    """convert_api for the ASGI deployment (SERVE_ASYNC)"""
+    # csrf_exempt and require_http_methods cannot wrap coroutine views in this Django version
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+    if not is_authenticated:
+        return _unauthenticated_response()
+    try:
+        text, selected_language = _parse_convert_request(request)
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid request: {e}'}, status=400)
+    if not text:
+        return JsonResponse({'error': 'No text given'}, status=400)
+    return _convert_response(*await process_multilingual_text_async(text, selected_language))
+
+convert_api_async.csrf_exempt = True
+
 
 
 
@@ -0,0 +1,211 @@
+"""
+Worker Warm-up
+Loads the NLP and language detection models and runs a synthetic conversion
+for every active language, in a background thread the readiness endpoint
+tracks. Conversions stay local: curated phrases, offline backends and cache
+reads only, never the upstream translator.
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Short synthetic utterance per language, pushed through the full pipeline
+WARMUP_PHRASES = {
+    'en': 'Hello, how are you?',
+    'hi': 'नमस्ते, आप कैसे हैं?',
+    'mr': 'नमस्कार, तुम्ही कसे आहात?',
+    'ta': 'வணக்கம், எப்படி இருக்கிறீர்கள்?',
+    'te': 'నమస్కారం, మీరు ఎలా ఉన్నారు?',
+    'bn': 'হ্যালো, আপনি কেমন আছেন?',
+    'kn': 'ನಮಸ್ಕಾರ, ನೀವು ಹೇಗಿದ್ದೀರಿ?',
+    'gu': 'નમસ્તે, તમે કેમ છો?',
+    'ml': 'നമസ്കാരം, സുഖമാണോ?',
+    'pa': 'ਸਤ ਸ੍ਰੀ ਅਕਾਲ, ਤੁਸੀਂ ਕਿਵੇਂ ਹੋ?',
+    'or': 'ନମସ୍କାର, ଆପଣ କେମିତି ଅଛନ୍ତି?',
+    'as': 'নমস্কাৰ, আপুনি কেনে আছে?',
+}
+
+
+class WarmupState:
+    """
+    Tracks warm-up progress for the readiness endpoint
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started = False
+        self.completed = False
+        self.duration: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.languages: Dict[str, float] = {}
+        self.errors: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """A worker is ready once warm-up finished, or immediately if warm-up is disabled"""
+        return self.completed or not self.enabled
+
+    def as_dict(self) -> Dict:
+        return {
+            'ready': self.ready,
+            'warm': self.completed,
+            'warmup_enabled': self.enabled,
+            'warmup_duration_ms': round(self.duration * 1000, 1) if self.duration is not None else None,
+            'steps_ms': {name: round(seconds * 1000, 1) for name, seconds in self.steps.items()},
+            'languages_ms': {code: round(seconds * 1000, 1) for code, seconds in self.languages.items()},
+            'errors': list(self.errors),
+        }
+
+
+warmup_state = WarmupState()
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def _load_sign_vocabulary():
+    from .sign_pipeline import sign_pipeline
+    from .sign_vocabulary import sign_vocabulary
+    sign_vocabulary.rebuild()
+    if sign_pipeline.fuzzy is not None:
+        sign_pipeline.fuzzy.preload()
+
+
+def _load_nltk_resources():
+    from .nlp_models import lemmatizer
+    from .nltk_resources import nltk_resources, pipeline_resources
+    errors = nltk_resources.resolve(pipeline_resources(lemmatizer.backend_name))
+    missing = [f"{name} ({error})" for name, error in errors.items() if error]
+    if missing:
+        raise LookupError(f"Missing NLTK resources: {', '.join(missing)}")
+
+
+def _load_pos_tagger():
+    from django.conf import settings
+    from .nlp_models import lexicon_tagger, pos_tagger
+    pos_tagger.get_tagger()
+    if not lexicon_tagger.get_lexicon() and getattr(settings, 'POS_LEXICON_ENABLED', True):
+        raise LookupError("POS lexicon missing or empty; run manage.py build_pos_lexicon")
+
+
+def _load_lemmatizer():
+    # Loads WordNet when the WordNet backend is used; the lemma table is already in memory
+    from .nlp_models import lemmatizer
+    lemmatizer.preload()
+
+
+def _load_language_profiles():
+    from langdetect.detector_factory import init_factory
+    init_factory()
+
+
+WARMUP_STEPS = [
+    ('sign_vocabulary', _load_sign_vocabulary),
+    ('nltk_resources', _load_nltk_resources),
+    ('pos_tagger', _load_pos_tagger),
+    ('lemmatizer', _load_lemmatizer),
+    ('langdetect', _load_language_profiles),
+]
+
+
+def get_warmup_languages(languages: Optional[List[str]] = None) -> List[str]:
+    """Active language codes to warm up, optionally restricted to the given codes"""
+    from .translation_service import MultilingualTranslationService
+
+    active = [
+        code for code, info in MultilingualTranslationService.SUPPORTED_LANGUAGES.items()
+        if info.get('active', False)
+    ]
+    if languages:
+        active = [code for code in active if code in languages]
+    return active
+
+
+def convert_offline(text: str, language: str) -> list:
+    """
+    Sign words for text, through the same steps as process_multilingual_text
+    but without the upstream: text the phrase table, local backends and
+    translation cache cannot translate is fingerspelled. The pipeline cache is
+    left untouched.
+    """
+    from .translation_service import translation_service
+    from .views import _detect_and_preprocess, _sign_words
+
+    detected_language, preprocessed_text = _detect_and_preprocess(text, language)
+    english_text, translation_fallback = preprocessed_text, False
+    if detected_language != 'en':
+        result, _, _ = translation_service._translate_without_upstream(preprocessed_text, detected_language)
+        if result is None:
+            english_text, translation_fallback = translation_service._offline_fallback(preprocessed_text, detected_language), True
+        else:
+            english_text, _, translation_fallback = result
+    return _sign_words(english_text, translation_fallback)
+
+
+def run_warmup(languages: Optional[List[str]] = None, state: WarmupState = warmup_state) -> WarmupState:
+    """
+    Load every lazily initialised model, then run one synthetic conversion per
+    active language through convert_offline. Failures are recorded but never
+    raised, so a missing resource cannot stop the worker from booting.
+    """
+    with state._lock:
+        if state.started:
+            return state
+        state.enabled = True
+        state.started = True
+
+    start_time = time.perf_counter()
+
+    for name, step in WARMUP_STEPS:
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warm-up step '{name}' failed: {e}")
+            state.errors.append(f"{name}: {e}")
+        state.steps[name] = time.perf_counter() - step_start
+
+    for code in get_warmup_languages(languages):
+        phrase = WARMUP_PHRASES.get(code)
+        if not phrase:
+            continue
+        language_start = time.perf_counter()
+        try:
+            convert_offline(phrase, code)
+        except Exception as e:
+            logger.warning(f"Warm-up conversion for '{code}' failed: {e}")
+            state.errors.append(f"{code}: {e}")
+        state.languages[code] = time.perf_counter() - language_start
+
+    state.duration = time.perf_counter() - start_time
+    state.completed = True
+    logger.info(f"Worker warm-up finished in {state.duration * 1000:.0f} ms ({len(state.errors)} errors)")
+    return state
+
+
+def start_warmup(languages: Optional[List[str]] = None, state: WarmupState = warmup_state) -> threading.Thread:
+    """
+    Run run_warmup in a daemon thread; the state reports not ready from now
+    until the thread finishes
+    """
+    global _warmup_thread
+    state.enabled = True
+    _warmup_thread = threading.Thread(
+        target=run_warmup, kwargs={'languages': languages, 'state': state}, name='nlp-warmup', daemon=True,
+    )
+    _warmup_thread.start()
+    return _warmup_thread
+
+
+def wait_for_warmup(timeout: Optional[float] = None) -> bool:
+    """
+    Block until a warm-up started by start_warmup finishes; the gunicorn
+    master calls this before forking so workers inherit warm models and a
+    completed state. Returns False if it is still running after timeout.
+    """
+    if _warmup_thread is None:
+        return True
+    _warmup_thread.join(timeout)
+    return not _warmup_thread.is_alive()
@@ -12,6 +12,31 @@ mkdir -p nltk_data
 python -c "import nltk; nltk.download('punkt', download_dir='./nltk_data'); nltk.download('stopwords', download_dir='./nltk_data'); nltk.download('averaged_perceptron_tagger', download_dir='./nltk_data'); nltk.download('wordnet', download_dir='./nltk_data'); nltk.download('omw-1.4', download_dir='./nltk_data')"
 echo "NLTK data downloaded to ./nltk_data"
 
+# Build the word -> tag class lexicon for the POS tagging fast path (unless one is committed)
+if [ ! -f A2SL/data/pos_lexicon.json ]; then
+    python manage.py build_pos_lexicon
+fi
+
+# Build the vocabulary-restricted lemma table so workers do not load WordNet (unless one is committed)
+if [ ! -f A2SL/data/lemma_table.json ]; then
+    python manage.py build_lemma_table
+fi
+
+# Build the synonym -> clip index used before fingerspelling (unless one is committed)
+if [ ! -f A2SL/data/synonym_index.json ]; then
+    python manage.py build_synonym_index
+fi
+
+# List the English words next to clip names that fuzzy matching must not correct (unless committed)
+if [ ! -f A2SL/data/fuzzy_known_words.json ]; then
+    python manage.py build_fuzzy_index
+fi
+
+# Compile the bilingual lexicons of the offline translator backend (unless they are committed)
+if ! ls A2SL/data/lexicons/*.lex >/dev/null 2>&1; then
+    python manage.py build_lexicons
+fi
+
 # Collect static files
 python manage.py collectstatic --no-input
 
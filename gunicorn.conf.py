@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration
+With GUNICORN_PRELOAD (the default) the application and its NLP models are
+loaded once in the master and shared copy-on-write with every worker.
+"""
+import logging
+
+import decouple
+
+bind = f"0.0.0.0:{decouple.config('PORT', default='8000')}"
+workers = decouple.config('WEB_CONCURRENCY', default=2, cast=int)
+# More than one thread switches to gthread workers; translations then go through the pooled clients
+threads = decouple.config('GUNICORN_THREADS', default=1, cast=int)
+preload_app = decouple.config('GUNICORN_PRELOAD', default=True, cast=bool)
+
+logger = logging.getLogger('gunicorn.error')
+
+
+def when_ready(server):
+    # Runs in the master after the preloaded application is imported, before any worker is forked
+    if preload_app:
+        from A2SL.preload import prepare_for_fork
+        from A2SL.warmup import wait_for_warmup
+        # Fork only once warm-up is done: workers inherit the warm models and a ready state
+        wait_for_warmup()
+        prepare_for_fork()
+
+
+def post_worker_init(worker):
+    from A2SL.preload import process_memory
+    memory = process_memory()
+    if memory:
+        logger.info(
+            f"Worker {worker.pid} ready: {memory['unique'] / 1e6:.1f} MB unique, "
+            f"{memory['shared'] / 1e6:.1f} MB shared, {memory['rss'] / 1e6:.1f} MB RSS"
+        )
@@ -8,16 +8,24 @@ import os
 import sys
 import django
 import unittest
-from unittest.mock import patch, MagicMock, Mock
+from unittest.mock import patch, MagicMock, Mock, AsyncMock
+import asyncio
+import threading
 import json
 
 # Setup Django environment
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SL.settings')
 django.setup()
 
-from A2SL.views import process_multilingual_text, animation_view
+from A2SL.views import (
+    process_multilingual_text, process_multilingual_text_async, animation_view, animation_view_async,
+    convert_api, convert_api_async, pipeline_cache,
+)
+from A2SL.sign_vocabulary import sign_vocabulary
 from A2SL.translation_service import translation_service
-from django.test import TestCase, Client
+from A2SL.warmup import WarmupState, run_warmup, start_warmup, warmup_state, get_warmup_languages
+from django.test import TestCase, Client, AsyncRequestFactory, override_settings
+from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth.models import User
 from django.urls import reverse
 
@@ -257,6 +265,347 @@ class TestIntegration(TestCase):
         for result in results:
             self.assertIsInstance(result, tuple)
             self.assertEqual(len(result), 3)
+    
+    def test_concurrent_processing_hundreds_of_threads(self):
+        """Test hundreds of threads converting at once load each NLP resource once and get consistent results"""
+        import time
+        from functools import partial
+        from A2SL.caching import LocalTTLCache
+        from A2SL.nlp_models import CachedLemmatizer, SharedPOSTagger
+        from A2SL.nltk_resources import NLTKResourceRegistry
+        from A2SL.sign_pipeline import SignPipeline
+        
+        class NounTagger:
+            def tag(self, tokens):
+                return [(token, 'NN') for token in tokens]
+        
+        def slow_tagger():
+            time.sleep(0.05)
+            return NounTagger()
+        
+        tagger_loader = MagicMock(side_effect=slow_tagger)
+        registry = NLTKResourceRegistry({'averaged_perceptron_tagger': tagger_loader})
+        pipeline = SignPipeline(
+            tagger=SharedPOSTagger(loader=partial(registry.get, 'averaged_perceptron_tagger')),
+            lemmatizer=CachedLemmatizer(),
+            vocabulary=sign_vocabulary,
+        )
+        texts = ["Hello world", "The children were playing", "I am going home", "We studied computers"]
+        
+        barrier = threading.Barrier(300)
+        results = []
+        errors = []
+        
+        def process_text(index):
+            barrier.wait()
+            try:
+                text = f"{texts[index % len(texts)]} {index}"
+                results.append((text, process_multilingual_text(text, 'en')))
+            except Exception as e:
+                errors.append(e)
+        
+        with patch('A2SL.views.sign_pipeline', pipeline), patch('A2SL.views.pipeline_cache', LocalTTLCache()):
+            threads = [threading.Thread(target=process_text, args=(index,)) for index in range(300)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 300)
+        self.assertEqual(tagger_loader.call_count, 1)
+        for text, (english_text, detected_language, processed_words) in results:
+            self.assertEqual((english_text, detected_language), (text, 'en'))
+            self.assertEqual(processed_words, pipeline.convert(text))
+
+class TestWarmup(TestCase):
+    """Integration tests for worker warm-up and the readiness endpoint"""
+    
+    def test_warmup_runs_every_active_language(self):
+        """Test warm-up loads each model and converts one phrase per active language"""
+        state = WarmupState()
+        loaded = []
+        steps = [('first', lambda: loaded.append('first')), ('second', lambda: loaded.append('second'))]
+        
+        with patch('A2SL.warmup.WARMUP_STEPS', steps), \
+             patch('A2SL.warmup.convert_offline') as mock_process:
+            run_warmup(state=state)
+        
+        self.assertEqual(loaded, ['first', 'second'])
+        self.assertTrue(state.completed)
+        self.assertTrue(state.ready)
+        self.assertIsNotNone(state.duration)
+        self.assertEqual(list(state.languages), get_warmup_languages())
+        called_languages = [call.args[1] for call in mock_process.call_args_list]
+        self.assertEqual(called_languages, get_warmup_languages())
+    
+    def test_warmup_records_failures(self):
+        """Test a failing step is recorded without aborting warm-up"""
+        state = WarmupState()
+        
+        def broken_step():
+            raise LookupError("resource missing")
+        
+        with patch('A2SL.warmup.WARMUP_STEPS', [('broken', broken_step)]), \
+             patch('A2SL.warmup.convert_offline'):
+            run_warmup(languages=['en', 'hi'], state=state)
+        
+        self.assertTrue(state.completed)
+        self.assertEqual(list(state.languages), ['en', 'hi'])
+        self.assertEqual(len(state.errors), 1)
+        self.assertIn('broken', state.errors[0])
+    
+    def test_warmup_never_calls_upstream(self):
+        """Test warm-up conversions use only local translation and leave the pipeline cache alone"""
+        state = WarmupState()
+        upstream = MagicMock()
+        
+        with patch('A2SL.warmup.WARMUP_STEPS', []), \
+             patch.object(translation_service, 'upstream', upstream), \
+             patch.object(translation_service, 'batcher', None), \
+             patch.object(pipeline_cache, 'set') as cache_set, \
+             patch('A2SL.views._sign_words', return_value=[]) as sign_words:
+            run_warmup(languages=['en', 'hi', 'ta'], state=state)
+        
+        self.assertEqual(state.errors, [])
+        self.assertEqual(list(state.languages), ['en', 'hi', 'ta'])
+        self.assertEqual(sign_words.call_count, 3)
+        upstream.translate.assert_not_called()
+        upstream.acquire.assert_not_called()
+        cache_set.assert_not_called()
+    
+    def test_background_warmup_gates_readiness(self):
+        """Test readiness answers 503 while the warm-up thread runs and 200 once it finishes"""
+        state = WarmupState()
+        release = threading.Event()
+        
+        with patch('A2SL.warmup.WARMUP_STEPS', [('slow', lambda: release.wait(5))]), \
+             patch('A2SL.warmup.convert_offline'), \
+             patch('A2SL.views.warmup_state', state):
+            thread = start_warmup(languages=['en'], state=state)
+            self.assertEqual(self.client.get('/health/ready/').status_code, 503)
+            release.set()
+            thread.join(5)
+            self.assertEqual(self.client.get('/health/ready/').status_code, 200)
+    
+    def test_readiness_endpoint(self):
+        """Test readiness endpoint reports warm state"""
+        response = self.client.get('/health/ready/')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertTrue(data['ready'])
+        self.assertIn('warm', data)
+        self.assertIn('warmup_duration_ms', data)
+    
+    def test_readiness_endpoint_before_warmup(self):
+        """Test readiness endpoint returns 503 while warm-up is pending"""
+        with patch.object(warmup_state, 'enabled', True), patch.object(warmup_state, 'completed', False):
+            response = self.client.get('/health/ready/')
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(json.loads(response.content)['ready'])
+
+class TestPipelineCache(TestCase):
+    """Integration tests for memoized sentence conversion"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        pipeline_cache.clear()
+        pipeline_cache.stats.reset()
+    
+    def test_repeat_conversion_served_from_cache(self):
+        """Test a repeated sentence skips the NLP stage"""
+        with patch('A2SL.views.process_english_for_sign_language', return_value=['Hello', 'World']) as mock_nlp:
+            first = process_multilingual_text("Hello world", 'en')
+            second = process_multilingual_text("  Hello   world ", 'en')
+        
+        self.assertEqual(first, second)
+        self.assertEqual(mock_nlp.call_count, 1)
+        self.assertEqual(pipeline_cache.stats.hits, 1)
+        
+        # Callers get their own copy of the word list
+        second[2].append('Extra')
+        self.assertEqual(process_multilingual_text("Hello world", 'en')[2], ['Hello', 'World'])
+    
+    def test_language_is_part_of_key(self):
+        """Test the same text with another selected language is converted separately"""
+        with patch('A2SL.views.process_english_for_sign_language', return_value=['Hello']) as mock_nlp:
+            process_multilingual_text("Hello", 'en')
+            process_multilingual_text("Hello", 'auto')
+        self.assertEqual(mock_nlp.call_count, 2)
+    
+    def test_vocabulary_change_invalidates(self):
+        """Test cached conversions are not reused after the clip set changes"""
+        with patch('A2SL.views.process_english_for_sign_language', return_value=['Hello']) as mock_nlp:
+            process_multilingual_text("Hello", 'en')
+            with patch.object(sign_vocabulary, '_version', sign_vocabulary.version + 1):
+                process_multilingual_text("Hello", 'en')
+        self.assertEqual(mock_nlp.call_count, 2)
+    
+    def test_translation_fallback_not_cached(self):
+        """Test conversions that used the offline translation fallback are retried"""
+        with patch('A2SL.views.process_english_for_sign_language', return_value=['N']), \
+             patch.object(translation_service, 'translate_to_english_detailed', return_value=("नमस्ते", 'hi', True)) as mock_translate:
+            process_multilingual_text("नमस्ते", 'hi')
+            process_multilingual_text("नमस्ते", 'hi')
+        self.assertEqual(mock_translate.call_count, 2)
+        self.assertEqual(len(pipeline_cache), 0)
+    
+    def test_translation_fallback_fingerspelled(self):
+        """Test romanized fallback text is fingerspelled instead of read as English words"""
+        with patch.object(translation_service, 'translate_to_english_detailed', return_value=("ram", 'hi', True)):
+            english_text, _, processed_words = process_multilingual_text("राम", 'hi')
+        self.assertEqual(english_text, "ram.")
+        self.assertEqual(processed_words, ['R', 'A', 'M'])
+    
+    def test_rejected_translation_fingerspelled(self):
+        """Test a rejected translation replaced by the romanized source is fingerspelled and not cached"""
+        test_cases = [
+            ("हम सब", "We all", ['We', 'all'], True),
+            ("हम", "We", ['H', 'A', 'M'], False),
+            ("घर बंद है", "Error house closed", list("GHARBANDHAI"), False),
+            ("तो", "Error", ['T', 'O'], False),
+        ]
+        for text, translated, expected, cached in test_cases:
+            with self.subTest(text=text):
+                pipeline_cache.clear()
+                with patch.object(translation_service, 'translate_to_english_detailed', return_value=(translated, 'hi', False)), \
+                     patch('A2SL.views.process_english_for_sign_language', side_effect=lambda english: english.rstrip('.').split()):
+                    _, _, processed_words = process_multilingual_text(text, 'hi')
+                self.assertEqual(processed_words, expected)
+                self.assertEqual(len(pipeline_cache), 1 if cached else 0)
+        pipeline_cache.clear()
+    
+    def test_spell_markers_stay_internal(self):
+        """Test romanized-word markers reach the sign stage but not the English text users see"""
+        result = ("My name \u2039ram\u203a", 'hi', False)
+        sign_inputs = []
+        
+        def sign_words(english):
+            sign_inputs.append(english)
+            return ['My', 'Name', 'R', 'A', 'M']
+        
+        with patch.object(translation_service, 'translate_to_english_detailed', return_value=result), \
+             patch.object(translation_service, 'translate_to_english_detailed_async', AsyncMock(return_value=result)), \
+             patch('A2SL.views.process_english_for_sign_language', side_effect=sign_words):
+            english_text, _, processed_words = process_multilingual_text("मेरा नाम राम", 'hi')
+            cached_text = process_multilingual_text("मेरा नाम राम", 'hi')[0]
+            pipeline_cache.clear()
+            async_text = asyncio.run(process_multilingual_text_async("मेरा नाम राम", 'hi'))[0]
+        
+        self.assertEqual(english_text, "My name ram.")
+        self.assertEqual(cached_text, english_text)
+        self.assertEqual(async_text, english_text)
+        self.assertEqual(processed_words, ['My', 'Name', 'R', 'A', 'M'])
+        self.assertEqual(sign_inputs, ["My name \u2039ram\u203a."] * 2)
+    
+    def test_metrics_endpoint(self):
+        """Test metrics endpoint exposes cache hit rates"""
+        staff = User.objects.create_user(username='staffuser', password='testpass123', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertIn('hit_rate', data['pipeline_cache'])
+        self.assertIn('translation_cache', data)
+        self.assertIn('state', data['translation_upstream']['circuit_breaker'])
+    
+    def test_metrics_endpoint_restricted(self):
+        """Test metrics are refused to anonymous and non-staff users and served with the metrics token"""
+        client = Client()
+        self.assertEqual(client.get('/api/metrics/').status_code, 403)
+        client.force_login(User.objects.create_user(username='plainuser', password='testpass123'))
+        self.assertEqual(client.get('/api/metrics/').status_code, 403)
+        
+        client = Client()
+        with override_settings(METRICS_TOKEN='s3cret'):
+            self.assertEqual(client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+            self.assertEqual(client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+        self.assertEqual(client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer ').status_code, 403)
+
+class TestAsyncViews(TestCase):
+    """Integration tests for the conversion API and the async views served under ASGI"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        pipeline_cache.clear()
+        self.factory = AsyncRequestFactory()
+        self.user = User.objects.create_user(username='apiuser', password='testpass123')
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        pipeline_cache.clear()
+    
+    def post_json(self, data, user=None):
+        request = self.factory.post('/api/convert/', data=json.dumps(data), content_type='application/json')
+        request.user = user or self.user
+        return request
+    
+    def test_convert_api(self):
+        """Test the JSON API converts text and rejects bad requests"""
+        client = Client()
+        client.force_login(self.user)
+        with patch('A2SL.views.process_english_for_sign_language', return_value=['Hello']):
+            response = client.post('/api/convert/', data=json.dumps({'text': 'Hello', 'language': 'en'}),
+                                   content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {'english_text': 'Hello', 'detected_language': 'en', 'words': ['Hello']})
+        
+        self.assertEqual(client.post('/api/convert/', data='[1', content_type='application/json').status_code, 400)
+        self.assertEqual(client.post('/api/convert/', data={'text': ' '}).status_code, 400)
+        self.assertEqual(client.get('/api/convert/').status_code, 405)
+    
+    def test_convert_api_requires_login(self):
+        """Test anonymous conversion requests are refused without reaching the translator"""
+        with patch('A2SL.views.process_multilingual_text') as process, \
+             patch('A2SL.views.process_multilingual_text_async') as process_async:
+            response = Client().post('/api/convert/', data=json.dumps({'text': 'नमस्ते', 'language': 'hi'}),
+                                     content_type='application/json')
+            async_response = asyncio.run(convert_api_async(self.post_json({'text': 'नमस्ते'}, user=AnonymousUser())))
+        
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content), {'error': 'Authentication required'})
+        self.assertEqual(async_response.status_code, 401)
+        process.assert_not_called()
+        process_async.assert_not_called()
+    
+    def test_async_api_matches_sync(self):
+        """Test the async API returns what the sync API returns"""
+        result = ("Hello world", 'hi', False)
+        with patch('A2SL.views.process_english_for_sign_language', return_value=['Hello', 'World']), \
+             patch.object(translation_service, 'translate_to_english_detailed', return_value=result), \
+             patch.object(translation_service, 'translate_to_english_detailed_async', AsyncMock(return_value=result)):
+            expected = json.loads(convert_api(self.post_json({'text': 'नमस्ते दुनिया', 'language': 'hi'})).content)
+            pipeline_cache.clear()
+            response = asyncio.run(convert_api_async(self.post_json({'text': 'नमस्ते दुनिया', 'language': 'hi'})))
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), expected)
+        request = self.factory.get('/api/convert/')
+        request.user = self.user
+        self.assertEqual(asyncio.run(convert_api_async(request)).status_code, 405)
+    
+    def test_nlp_stage_runs_off_event_loop(self):
+        """Test the CPU-bound NLP stage runs on the NLP thread pool, not the event loop thread"""
+        threads = []
+        
+        def record_thread(text):
+            threads.append(threading.current_thread().name)
+            return ['Hello']
+        
+        with patch('A2SL.views.process_english_for_sign_language', side_effect=record_thread):
+            result = asyncio.run(process_multilingual_text_async("Hello", 'en'))
+        
+        self.assertEqual(result, ("Hello", 'en', ['Hello']))
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith('nlp'))
+    
+    def test_async_animation_requires_login(self):
+        """Test the async animation view redirects anonymous users to the login page"""
+        request = self.factory.get('/animation/')
+        request.user = AnonymousUser()
+        response = asyncio.run(animation_view_async(request))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith('/login/'))
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,6 +8,12 @@ import os
 import sys
 import django
 import unittest
+import tempfile
+import random
+import json
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+import shutil
 from unittest.mock import patch, MagicMock
 
 # Setup Django environment
@@ -15,7 +21,22 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SL.settings')
 django.setup()
 
 from A2SL.views import process_english_for_sign_language
-from nltk.tokenize import word_tokenize
+from A2SL.sign_vocabulary import SignVocabulary, build_phrase_trie
+from A2SL.nlp_models import SharedPOSTagger, CachedLemmatizer, LexiconPOSTagger, build_pos_lexicon
+from A2SL.nlp_models import LemmaTable, build_lemma_table, get_lemmatizer, COMMON_WORDS
+from A2SL.sign_vocabulary import sign_vocabulary
+from A2SL.preload import SharedAveragedPerceptron, SharedKeyIndex, SharedProbabilityMap, share_tagger_weights, share_langdetect_profiles, process_memory
+from nltk.tag.perceptron import PerceptronTagger
+from django.conf import settings
+from A2SL.sign_pipeline import SignPipeline, SignToken
+from A2SL.fast_tokenizer import fast_alpha_tokens, alpha_word_tokenize
+from A2SL.nltk_resources import NLTKResourceRegistry, nltk_resources, pipeline_resources
+from A2SL.checks import check_pos_lexicon
+from A2SL.fuzzy_match import FuzzyMatcher, SymSpellIndex, build_known_words, deletes, edit_distance, get_fuzzy_matcher
+from A2SL.synonyms import SynonymIndex, build_synonym_index, get_synonym_index, parse_curated_synonyms, wordnet_synonyms
+from django.test import override_settings
+from django.core.management import call_command
+from nltk.tokenize import word_tokenize, NLTKWordTokenizer
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 import nltk
@@ -202,5 +223,1076 @@ class TestNLPUnit(unittest.TestCase):
                 except Exception as e:
                     self.fail(f"Function raised {type(e).__name__} for input '{test_case}': {e}")
 
+class TestSignVocabulary(unittest.TestCase):
+    """Unit tests for the in-memory sign vocabulary index"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.vocabulary = SignVocabulary()
+    
+    def test_lookup_is_case_insensitive(self):
+        """Test words resolve to the clip file name regardless of case"""
+        test_cases = [
+            ("hello", "Hello"),
+            ("HELLO", "Hello"),
+            ("h", "H"),
+            ("me", "ME"),
+            ("do not", "Do Not"),
+        ]
+        
+        for word, expected in test_cases:
+            with self.subTest(word=word):
+                self.assertEqual(self.vocabulary.lookup(word), expected)
+    
+    def test_phrase_trie(self):
+        """Test multi-word clips are indexed in the phrase trie"""
+        trie = self.vocabulary.phrase_trie
+        self.assertEqual(trie["do"]["not"][None], "do not")
+        self.assertEqual(trie["does"]["not"][None], "does not")
+        self.assertEqual(trie["thank"]["you"][None], "thank you")
+        self.assertNotIn("hello", trie)
+    
+    def test_lookup_missing_word(self):
+        """Test words without a clip are not found"""
+        self.assertIsNone(self.vocabulary.lookup("xyzzy"))
+        self.assertIsNone(self.vocabulary.lookup(""))
+        self.assertNotIn("xyzzy", self.vocabulary)
+        self.assertIn("hello", self.vocabulary)
+    
+    def test_index_covers_assets(self):
+        """Test every clip in assets/ is indexed"""
+        assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets')
+        clip_names = [name[:-4] for name in os.listdir(assets_dir) if name.endswith('.mp4')]
+        
+        self.assertEqual(len(self.vocabulary), len(clip_names))
+        for name in clip_names:
+            self.assertEqual(self.vocabulary.lookup(name), name)
+    
+    def test_rebuild_when_assets_change(self):
+        """Test the index picks up added clips only after a refresh"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            open(os.path.join(temp_dir, 'Foo.mp4'), 'wb').close()
+            with override_settings(STATICFILES_DIRS=[temp_dir], STATIC_ROOT=None):
+                vocabulary = SignVocabulary(refresh_interval=0)
+                self.assertEqual(vocabulary.lookup("foo"), "Foo")
+                self.assertFalse(vocabulary.refresh_if_changed())
+                
+                open(os.path.join(temp_dir, 'Bar.mp4'), 'wb').close()
+                stat = os.stat(temp_dir)
+                os.utime(temp_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                self.assertIsNone(vocabulary.lookup("bar"))
+                
+                self.assertTrue(vocabulary.refresh_if_changed())
+                self.assertEqual(vocabulary.lookup("bar"), "Bar")
+        finally:
+            shutil.rmtree(temp_dir)
+
+class FakeTagger:
+    """Stand-in for PerceptronTagger that tags every token as a noun"""
+    
+    def tag(self, tokens):
+        return [(token, 'NN') for token in tokens]
+
+class TestSharedPOSTagger(unittest.TestCase):
+    """Unit tests for the process-wide POS tagger"""
+    
+    def test_model_loaded_once(self):
+        """Test the tagger model is loaded once and reused across calls"""
+        loader = MagicMock(side_effect=FakeTagger)
+        tagger = SharedPOSTagger(loader=loader)
+        self.assertFalse(tagger.loaded)
+        
+        for _ in range(5):
+            self.assertEqual(tagger.tag(["hello", "world"]), [("hello", "NN"), ("world", "NN")])
+        
+        self.assertTrue(tagger.loaded)
+        self.assertEqual(loader.call_count, 1)
+    
+    def test_model_loaded_once_across_threads(self):
+        """Test concurrent first use still loads the model only once"""
+        import threading
+        import time
+        
+        def slow_loader():
+            time.sleep(0.05)
+            return FakeTagger()
+        
+        loader = MagicMock(side_effect=slow_loader)
+        tagger = SharedPOSTagger(loader=loader)
+        errors = []
+        
+        def tag_words():
+            try:
+                tagger.tag(["good", "morning"])
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=tag_words) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(loader.call_count, 1)
+    
+    def test_tag_sents(self):
+        """Test batched tagging of several sentences"""
+        tagger = SharedPOSTagger(loader=FakeTagger)
+        result = tagger.tag_sents([["hello"], [], ["good", "morning"]])
+        self.assertEqual(result, [[("hello", "NN")], [], [("good", "NN"), ("morning", "NN")]])
+    
+    def test_tag_rejects_string(self):
+        """Test a raw string is rejected like nltk.pos_tag does"""
+        tagger = SharedPOSTagger(loader=FakeTagger)
+        with self.assertRaises(TypeError):
+            tagger.tag("hello world")
+        self.assertEqual(tagger.tag([]), [])
+
+class TestCachedLemmatizer(unittest.TestCase):
+    """Test the shared (word, pos) -> lemma cache"""
+    
+    def test_matches_wordnet(self):
+        """Test cached lemmas are the same as WordNetLemmatizer output"""
+        lemmatizer = CachedLemmatizer()
+        reference = WordNetLemmatizer()
+        for word, pos in [("running", "v"), ("better", "a"), ("cats", "n"), ("went", "v"), ("children", "n")]:
+            with self.subTest(word=word, pos=pos):
+                self.assertEqual(lemmatizer.lemmatize(word, pos=pos), reference.lemmatize(word, pos=pos))
+                # second lookup comes from the cache
+                self.assertEqual(lemmatizer.lemmatize(word, pos=pos), reference.lemmatize(word, pos=pos))
+        self.assertEqual(lemmatizer.stats.misses, 5)
+        self.assertEqual(lemmatizer.stats.hits, 5)
+    
+    def test_repeats_do_not_reach_wordnet(self):
+        """Test each (word, pos) pair is lemmatized by WordNet only once"""
+        backend = MagicMock()
+        backend.lemmatize.side_effect = lambda word, pos='n': word.rstrip('s')
+        lemmatizer = CachedLemmatizer(lemmatizer=backend)
+        
+        for _ in range(10):
+            self.assertEqual(lemmatizer.lemmatize("cats"), "cat")
+            self.assertEqual(lemmatizer.lemmatize("cats", pos='v'), "cat")
+        
+        self.assertEqual(backend.lemmatize.call_count, 2)
+        self.assertAlmostEqual(lemmatizer.stats.hit_rate, 0.9)
+    
+    def test_preload(self):
+        """Test preloaded words are served from the cache"""
+        backend = MagicMock()
+        backend.lemmatize.side_effect = lambda word, pos='n': word
+        lemmatizer = CachedLemmatizer(lemmatizer=backend)
+        
+        self.assertEqual(lemmatizer.preload(["hello", "world"]), 6)
+        self.assertEqual(lemmatizer.preload(["hello"]), 0)
+        lemmatizer.lemmatize("hello", pos='v')
+        
+        self.assertEqual(lemmatizer.stats.hits, 1)
+        self.assertEqual(lemmatizer.stats.misses, 0)
+        self.assertEqual(backend.lemmatize.call_count, 6)
+    
+    def test_bounded(self):
+        """Test the cache never grows past max_size"""
+        backend = MagicMock()
+        backend.lemmatize.side_effect = lambda word, pos='n': word
+        lemmatizer = CachedLemmatizer(max_size=8, lemmatizer=backend)
+        for i in range(50):
+            lemmatizer.lemmatize(f"word{i}")
+        self.assertEqual(len(lemmatizer), 8)
+
+
+class DeterministicTagger:
+    """Stand-in for PerceptronTagger with a fixed tag per word (covers every tag class the pipeline uses)"""
+    
+    TAGS = ['NN', 'NNS', 'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ', 'MD', 'JJ', 'JJR', 'JJS', 'RB', 'RBR', 'RBS', 'PRP', 'DT', 'IN']
+    
+    def tag(self, tokens):
+        return [(token, self.TAGS[sum(map(ord, token)) % len(self.TAGS)]) for token in tokens]
+
+class FakeVocabulary:
+    """Case-folded clip lookup over a fixed word list"""
+    
+    def __init__(self, clips):
+        self.clips = {clip.casefold(): clip for clip in clips}
+        self.phrase_trie = build_phrase_trie(self.clips)
+        self.words = frozenset(self.clips)
+        self.version = 1
+    
+    def lookup(self, word):
+        return self.clips.get(word.casefold())
+
+def legacy_process_english(text, tagger, lr, vocabulary, tokenizer):
+    """Reference copy of the original process_english_for_sign_language"""
+    if not text:
+        return []
+    text = text.lower()
+    words = tokenizer(text)
+    words = [word for word in words if word.isalpha()]
+    tagged = tagger.tag(words)
+    tense = {}
+    tense["future"] = len([word for word in tagged if word[1] == "MD"])
+    tense["present"] = len([word for word in tagged if word[1] in ["VBP", "VBZ","VBG"]])
+    tense["past"] = len([word for word in tagged if word[1] in ["VBD", "VBN"]])
+    tense["present_continuous"] = len([word for word in tagged if word[1] in ["VBG"]])
+    stop_words = set(["mightn't", 're', 'wasn', 'wouldn', 'be', 'has', 'that', 'does', 'shouldn', 'do', "you've",'off', 'for', "didn't", 'm', 'ain', 'haven', "weren't", 'are', "she's", "wasn't", 'its', "haven't", "wouldn't", 'don', 'weren', 's', "you'd", "don't", 'doesn', "hadn't", 'is', 'was', "that'll", "should've", 'a', 'then', 'the', 'mustn', 'i', 'nor', 'as', "it's", "needn't", 'd', 'am', 'have',  'hasn', 'o', "aren't", "you'll", "couldn't", "you're", "mustn't", 'didn', "doesn't", 'll', 'an', 'hadn', 'whom', 'y', "hasn't", 'itself', 'couldn', 'needn', "shan't", 'isn', 'been', 'such', 'shan', "shouldn't", 'aren', 'being', 'were', 'did', 'ma', 't', 'having', 'mightn', 've', "isn't", "won't"])
+    filtered_text = []
+    for w,p in zip(words,tagged):
+        if w not in stop_words and w.isalpha():
+            if p[1]=='VBG' or p[1]=='VBD' or p[1]=='VBZ' or p[1]=='VBN' or p[1]=='NN':
+                filtered_text.append(lr.lemmatize(w,pos='v'))
+            elif p[1]=='JJ' or p[1]=='JJR' or p[1]=='JJS'or p[1]=='RBR' or p[1]=='RBS':
+                filtered_text.append(lr.lemmatize(w,pos='a'))
+            else:
+                filtered_text.append(lr.lemmatize(w))
+    words = filtered_text
+    temp=[]
+    for w in words:
+        if w=='I':
+            temp.append('Me')
+        else:
+            temp.append(w)
+    words = temp
+    probable_tense = max(tense,key=tense.get)
+    if probable_tense == "past" and tense["past"]>=1:
+        words = ["Before"] + words
+    elif probable_tense == "future" and tense["future"]>=1:
+        if "Will" not in words:
+            words = ["Will"] + words
+    elif probable_tense == "present":
+        if tense["present_continuous"]>=1:
+            words = ["Now"] + words
+    filtered_text = []
+    for w in words:
+        clip = vocabulary.lookup(w)
+        if not clip:
+            for c in w:
+                filtered_text.append(c.upper())
+        else:
+            filtered_text.append(clip)
+    return filtered_text
+
+class TestSignPipeline(unittest.TestCase):
+    """Unit tests for the compiled English-to-sign pipeline"""
+    
+    CLIPS = ['Hello', 'Before', 'Will', 'Now', 'Me', 'Go', 'Home', 'Happy', 'Good', 'Work', 'Study', 'Thank', 'You']
+    WORD_POOL = [
+        'i', 'you', 'we', 'they', 'he', 'she', 'will', 'shall', 'can', 'would', 'am', 'is', 'are', 'was', 'were',
+        'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'go', 'goes', 'going', 'went', 'gone',
+        'run', 'running', 'ran', 'eat', 'eating', 'ate', 'eaten', 'happy', 'happier', 'happiest', 'good', 'better',
+        'best', 'home', 'homes', 'work', 'working', 'worked', 'study', 'studies', 'studied', 'children', 'cats',
+        'the', 'a', 'an', 'to', 'of', 'hello', 'thank', 'thanks', 'quickly', 'now', 'before', 'tomorrow', 'yesterday',
+        'not', "don't", "isn't", 'computer', 'engineers', 'xyzzy', ',', '.', '?', '!', '123', '42nd',
+    ]
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tagger = SharedPOSTagger(loader=DeterministicTagger)
+        self.vocabulary = FakeVocabulary(self.CLIPS)
+        self.pipeline = SignPipeline(tagger=self.tagger, lemmatizer=CachedLemmatizer(),
+                                     vocabulary=self.vocabulary, tokenizer=str.split)
+    
+    def legacy(self, text):
+        return legacy_process_english(text, DeterministicTagger(), WordNetLemmatizer(), self.vocabulary, str.split)
+    
+    @classmethod
+    def generate_corpus(cls, size, seed=1234):
+        rng = random.Random(seed)
+        corpus = []
+        for _ in range(size):
+            words = [rng.choice(cls.WORD_POOL) for _ in range(rng.randint(0, 12))]
+            text = ' '.join(words)
+            corpus.append(text.capitalize() if rng.random() < 0.5 else text.upper() if rng.random() < 0.1 else text)
+        return corpus
+    
+    def test_matches_legacy_on_generated_corpus(self):
+        """Test convert() output is identical to the original function over a large generated corpus"""
+        corpus = self.generate_corpus(5000)
+        for text in corpus:
+            with self.subTest(text=text):
+                self.assertEqual(self.pipeline.convert(text), self.legacy(text))
+    
+    def test_convert_many_matches_convert(self):
+        """Test batched conversion returns the same lists as one-by-one conversion"""
+        corpus = self.generate_corpus(500, seed=99) + ['', None]
+        self.assertEqual(self.pipeline.convert_many(corpus), [self.pipeline.convert(text) for text in corpus])
+    
+    def test_tense_markers(self):
+        """Test the tense marker chosen for each dominant tense"""
+        pipeline = SignPipeline(tagger=self.tagger, lemmatizer=CachedLemmatizer(), vocabulary=self.vocabulary)
+        test_cases = [
+            ([('go', 'MD'), ('home', 'NN')], 'Will'),
+            ([('went', 'VBD'), ('home', 'NN')], 'Before'),
+            ([('running', 'VBG')], 'Now'),
+            ([('go', 'VBP')], None),
+            ([('home', 'NN')], None),
+            ([('went', 'VBD'), ('will', 'MD')], 'Will'),
+        ]
+        for tagged, expected in test_cases:
+            with self.subTest(tagged=tagged):
+                _, marker = pipeline.analyze_tagged(tagged)
+                self.assertEqual(marker, expected)
+    
+    def test_stopwords_and_tokens(self):
+        """Test stopwords are dropped and kept tokens carry word, tag and lemma"""
+        tokens, _ = self.pipeline.analyze_tagged([('the', 'DT'), ('cats', 'NNS'), ('are', 'VBP'), ('running', 'VBG')])
+        self.assertEqual([(t.word, t.tag, t.lemma) for t in tokens], [('cats', 'NNS', 'cat'), ('running', 'VBG', 'run')])
+        self.assertFalse(hasattr(tokens[0], '__dict__'))
+        self.assertIsInstance(tokens[0], SignToken)
+    
+    def test_spelled_words_fingerspelled(self):
+        """Test words marked for fingerspelling skip stopwords, lemmas and phrases while the rest still map to clips"""
+        test_cases = [
+            ("Hello \u2039ram\u203a", ['Hello', 'R', 'A', 'M']),
+            ("Thank You \u2039ram\u203a.", ['Thank', 'You', 'R', 'A', 'M']),
+            ("\u2039a\u203a go home", ['A', 'Go', 'Home']),
+            ("\u2039thank\u203a you", ['T', 'H', 'A', 'N', 'K', 'You']),
+            ("\u2039\u203a go", ['Go']),
+            ("go home", ['Go', 'Home']),
+        ]
+        for text, expected in test_cases:
+            with self.subTest(text=text):
+                self.assertEqual(self.pipeline.convert(text), expected)
+                self.assertEqual(self.pipeline.convert_many([text]), [expected])
+        self.assertEqual(self.pipeline.fingerspell("Hello \u2039ram\u203a"), list('HELLORAM'))
+    
+    def test_multi_word_clips(self):
+        """Test multi-word clips are matched as one clip, longest match first"""
+        vocabulary = FakeVocabulary(self.CLIPS + ['Do Not', 'Does Not', 'Thank You', 'Thank You Very Much'])
+        tags = {'did': 'VBD', 'does': 'VBZ', 'eat': 'VB', 'very': 'RB', 'much': 'JJ'}
+        
+        class TableTagger:
+            def tag(self, tokens):
+                return [(token, tags.get(token, 'NN')) for token in tokens]
+        
+        pipeline = SignPipeline(tagger=TableTagger(), lemmatizer=CachedLemmatizer(), vocabulary=vocabulary, tokenizer=str.split)
+        test_cases = [
+            ("i do not go home", ['Do Not', 'Go', 'Home']),
+            ("does not eat", ['Does Not', 'E', 'A', 'T']),
+            ("the cat did not go", ['Before', 'C', 'A', 'T', 'Do Not', 'Go']),
+            ("thank you", ['Thank You']),
+            ("thank you very much", ['Thank You Very Much']),
+            ("thank you very", ['Thank You', 'V', 'E', 'R', 'Y']),
+            ("do go", ['Go']),
+        ]
+        for text, expected in test_cases:
+            with self.subTest(text=text):
+                self.assertEqual(pipeline.convert(text), expected)
+    
+    def test_empty_input(self):
+        """Test empty input converts to an empty list"""
+        self.assertEqual(self.pipeline.convert(''), [])
+        self.assertEqual(self.pipeline.convert(None), [])
+        self.assertEqual(self.pipeline.convert('!!! 123'), [])
+
+def punkt_available():
+    try:
+        nltk.data.find('tokenizers/punkt')
+        return True
+    except LookupError:
+        return False
+
+class TestNLTKResourceRegistry(unittest.TestCase):
+    """Unit tests for the thread-safe registry of NLTK resources"""
+    
+    def test_loaded_once_across_hundreds_of_threads(self):
+        """Test concurrent first use loads a resource once and every thread gets the same object"""
+        import threading
+        import time
+        
+        def slow_loader():
+            time.sleep(0.05)
+            return object()
+        
+        loader = MagicMock(side_effect=slow_loader)
+        registry = NLTKResourceRegistry({'model': loader})
+        barrier = threading.Barrier(300)
+        resources = []
+        
+        def get_model():
+            barrier.wait()
+            resources.append(registry.get('model'))
+        
+        threads = [threading.Thread(target=get_model) for _ in range(300)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(len(resources), 300)
+        self.assertEqual(len(set(map(id, resources))), 1)
+        self.assertTrue(registry.stats()['model']['loaded'])
+    
+    def test_missing_resource_is_reported_and_retried(self):
+        """Test a missing resource raises LookupError, is reported by resolve() and loads once installed"""
+        loader = MagicMock(side_effect=[LookupError("\n*****\n  Resource \x1b[93mpunkt\x1b[0m not found.\n"), 'model'])
+        registry = NLTKResourceRegistry({'punkt': loader})
+        
+        self.assertEqual(registry.resolve(), {'punkt': 'Resource punkt not found.'})
+        self.assertFalse(registry.loaded('punkt'))
+        self.assertEqual(registry.stats()['punkt']['error'], 'Resource punkt not found.')
+        
+        self.assertEqual(registry.resolve(['punkt']), {'punkt': None})
+        self.assertEqual(registry.get('punkt'), 'model')
+        self.assertIsNone(registry.stats()['punkt']['error'])
+        with self.assertRaises(LookupError):
+            registry.get('stopwords')
+    
+    def test_pipeline_resources(self):
+        """Test WordNet is only required by the WordNet lemmatizer"""
+        self.assertEqual(pipeline_resources('table'), ['punkt', 'averaged_perceptron_tagger'])
+        self.assertIn('wordnet', pipeline_resources('wordnet'))
+        self.assertTrue(set(pipeline_resources('wordnet')) <= set(nltk_resources.names()))
+    
+    def test_tokenizer_uses_registry(self):
+        """Test the slow tokenizer path gets punkt from the registry"""
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+        registry = NLTKResourceRegistry({'punkt': PunktSentenceTokenizer})
+        with patch('A2SL.fast_tokenizer.nltk_resources', registry):
+            self.assertEqual(alpha_word_tokenize("Hello. How are you?"), ['Hello', 'How', 'are', 'you'])
+        self.assertTrue(registry.loaded('punkt'))
+    
+    @unittest.skipUnless(punkt_available(), "punkt tokenizer data not installed")
+    def test_tokenizer_matches_word_tokenize(self):
+        """Test the registry-backed tokenizer gives the same tokens as nltk.word_tokenize"""
+        from A2SL.fast_tokenizer import word_tokenize as registry_word_tokenize
+        for text in ["Hello. How are you?", "Mr. Smith went home.", "I don't know... maybe?"]:
+            with self.subTest(text=text):
+                self.assertEqual(registry_word_tokenize(text), word_tokenize(text))
+
+class TestFastTokenizer(unittest.TestCase):
+    """Equivalence tests for the regex tokenizer fast path"""
+    
+    CHUNKS = [
+        "hello", "world", "I", "i'm", "don't", "DON'T", "can't", "it's", "you'll", "we've", "they're", "I'd",
+        "cannot", "Gonna", "wanna", "gimme", "lemme", "gotta", "3pm", "42", "hello,", "(hi)", '"quoted"', "#tag",
+        "$5", "50%", "a&b", "what?", "wow!", "yes;", "note:", "*star*", "<b>", "[x]", "{y}", "well-known",
+        "o'neil", "dogs'", "'tis", "U.S.", "mr.", "e.g.", "--", "...", "café", "x,y", "1,000", "time:5",
+        "more'n", "d'ye", "hello.", "'hello'", "`tick`", "\u201cquote\u201d", "end.)", "a_b", "90's", ",5", ":x",
+        "don't,", "(can't)", '"won\'t"', "it's!",
+    ]
+    
+    def reference(self, text):
+        """Alphabetic tokens from the Treebank word tokenizer (word_tokenize without punkt)"""
+        return [token for token in NLTKWordTokenizer().tokenize(text) if token.isalpha()]
+    
+    def generate_corpus(self, size, seed=2024):
+        rng = random.Random(seed)
+        corpus = []
+        for _ in range(size):
+            chunks = [rng.choice(self.CHUNKS) for _ in range(rng.randint(0, 8))]
+            text = rng.choice([' ', ' ', '  ', '\t']).join(chunks)
+            corpus.append(text + rng.choice(['', '', '.', '?', ' ', '\n']))
+        return corpus
+    
+    def test_fast_path_matches_treebank(self):
+        """Test every input taken by the fast path gives the Treebank tokens after the alpha filter"""
+        fast = 0
+        for text in self.generate_corpus(20000):
+            tokens = fast_alpha_tokens(text)
+            if tokens is None:
+                continue
+            fast += 1
+            with self.subTest(text=text):
+                self.assertEqual(tokens, self.reference(text))
+        # Most generated inputs should not need the slow path
+        self.assertGreater(fast, 5000)
+    
+    def test_fast_path_cases(self):
+        """Test typical utterances use the fast path"""
+        test_cases = {
+            "Hello, how are you?": ["Hello", "how", "are", "you"],
+            "I don't want to go.": ["I", "do", "want", "to", "go"],
+            "It's (really) nice!": ["It", "really", "nice"],
+            "I cannot come": ["I", "can", "not", "come"],
+            "We're gonna win 2 games": ["We", "gon", "na", "win", "games"],
+            "   ": [],
+            "": [],
+        }
+        for text, expected in test_cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(fast_alpha_tokens(text), expected)
+                self.assertEqual(fast_alpha_tokens(text), self.reference(text))
+    
+    def test_slow_path_cases(self):
+        """Test inputs needing sentence segmentation or special handling fall back to word_tokenize"""
+        test_cases = [
+            "Hello. How are you?",
+            "Mr. Smith went home",
+            "a well-known fact",
+            "O'Neil is here",
+            "'Tis the season",
+            "the dogs' toys",
+            "I don't\tknow",
+            "wait..",
+        ]
+        for text in test_cases:
+            with self.subTest(text=text):
+                self.assertIsNone(fast_alpha_tokens(text))
+    
+    def test_fallback_uses_word_tokenize(self):
+        """Test alpha_word_tokenize filters word_tokenize output on the slow path only"""
+        with patch('A2SL.fast_tokenizer.word_tokenize', return_value=['Hello', '.', 'How', 'are', 'you', '?']) as mock_tokenize:
+            self.assertEqual(alpha_word_tokenize("Hello. How are you?"), ['Hello', 'How', 'are', 'you'])
+            self.assertEqual(alpha_word_tokenize("how are you"), ['how', 'are', 'you'])
+        mock_tokenize.assert_called_once_with("Hello. How are you?")
+    
+    @unittest.skipUnless(punkt_available(), "punkt tokenizer data not installed")
+    def test_fast_path_matches_word_tokenize(self):
+        """Test the fast path against word_tokenize itself, including punkt segmentation"""
+        for text in self.generate_corpus(5000, seed=7):
+            tokens = fast_alpha_tokens(text)
+            if tokens is None:
+                continue
+            with self.subTest(text=text):
+                self.assertEqual(tokens, [token for token in word_tokenize(text) if token.isalpha()])
+
+class TestLexiconPOSTagger(unittest.TestCase):
+    """Unit tests for the lexicon-first POS tagging fast path"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_build_keeps_unambiguous_words(self):
+        """Test the lexicon keeps words seen often enough with a single tag class"""
+        tags = {
+            'i': ['PRP', 'PRP'],
+            'went': ['VBD', 'VBN'],  # same class
+            'run': ['VB', 'NN'],  # ambiguous
+            'will': ['MD', 'MD'],
+            'better': ['JJR', 'RBR'],  # same class
+            'rare': ['JJ'],  # seen once
+        }
+        
+        class ScriptedTagger:
+            def __init__(self):
+                self.seen = {}
+            
+            def tag(self, tokens):
+                result = []
+                for token in tokens:
+                    count = self.seen.get(token, 0)
+                    self.seen[token] = count + 1
+                    result.append((token, tags[token][count % len(tags[token])]))
+                return result
+        
+        sentences = [['i', 'went', 'run', 'will', 'better'], ['i', 'went', 'run', 'will', 'better', 'rare'], []]
+        lexicon = build_pos_lexicon(sentences, ScriptedTagger(), min_count=2)
+        
+        self.assertEqual(lexicon['words'], {'better': 'JJ', 'i': 'X', 'went': 'VBD', 'will': 'MD'})
+        self.assertEqual(lexicon['sentences'], 2)
+        self.assertEqual(lexicon['ambiguous'], 1)
+    
+    def test_known_sentence_skips_tagger(self):
+        """Test a sentence of lexicon words is tagged without the perceptron"""
+        full_tagger = MagicMock()
+        tagger = LexiconPOSTagger(tagger=full_tagger, lexicon={'i': 'X', 'went': 'VBD', 'home': 'NN'})
+        
+        self.assertEqual(tagger.tag(['i', 'went', 'home']), [('i', 'X'), ('went', 'VBD'), ('home', 'NN')])
+        full_tagger.tag.assert_not_called()
+        self.assertEqual(tagger.stats()['fast_path'], 1)
+    
+    def test_unknown_word_uses_full_tagger(self):
+        """Test one unknown word sends the whole sentence to the full tagger"""
+        full_tagger = SharedPOSTagger(loader=FakeTagger)
+        tagger = LexiconPOSTagger(tagger=full_tagger, lexicon={'i': 'X', 'went': 'VBD'})
+        
+        self.assertEqual(tagger.tag(['i', 'went', 'xyzzy']), [('i', 'NN'), ('went', 'NN'), ('xyzzy', 'NN')])
+        self.assertEqual(tagger.tag([]), [])
+        self.assertEqual(tagger.stats()['full_tagger'], 1)
+        with self.assertRaises(TypeError):
+            tagger.tag("i went")
+    
+    def test_counters_thread_safe(self):
+        """Test concurrent tagging loses no fast path or full tagger counts"""
+        tagger = LexiconPOSTagger(tagger=SharedPOSTagger(loader=FakeTagger), lexicon={'i': 'X', 'went': 'VBD'})
+        
+        def tag_many(_):
+            for _ in range(2000):
+                tagger.tag(['i', 'went'])
+                tagger.tag(['i', 'xyzzy'])
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(tag_many, range(8)))
+        
+        stats = tagger.stats()
+        self.assertEqual((stats['fast_path'], stats['full_tagger']), (16000, 16000))
+        self.assertEqual(stats['fast_path_rate'], 0.5)
+    
+    def test_missing_lexicon_fails_system_check(self):
+        """Test manage.py check reports a missing lexicon unless the fast path is disabled"""
+        path = os.path.join(self.temp_dir, 'pos_lexicon.json')
+        with override_settings(POS_LEXICON_ENABLED=True, POS_LEXICON_PATH=path):
+            self.assertEqual([error.id for error in check_pos_lexicon(None)], ['A2SL.E001'])
+        with override_settings(POS_LEXICON_ENABLED=False, POS_LEXICON_PATH=path):
+            self.assertEqual(check_pos_lexicon(None), [])
+        
+        with open(path, 'w') as f:
+            json.dump({'version': 1, 'words': {}}, f)
+        with override_settings(POS_LEXICON_ENABLED=True, POS_LEXICON_PATH=path):
+            self.assertEqual(check_pos_lexicon(None), [])
+    
+    def test_load_lexicon_file(self):
+        """Test the lexicon file is loaded once, and missing or stale files disable the fast path"""
+        path = os.path.join(self.temp_dir, 'pos_lexicon.json')
+        with open(path, 'w') as f:
+            json.dump({'version': 1, 'words': {'hello': 'NN'}}, f)
+        self.assertEqual(LexiconPOSTagger(path=path).get_lexicon(), {'hello': 'NN'})
+        
+        self.assertEqual(LexiconPOSTagger(path=os.path.join(self.temp_dir, 'missing.json')).get_lexicon(), {})
+        
+        with open(path, 'w') as f:
+            json.dump({'version': 0, 'words': {'hello': 'NN'}}, f)
+        self.assertEqual(LexiconPOSTagger(path=path).get_lexicon(), {})
+        
+        with override_settings(POS_LEXICON_ENABLED=False, POS_LEXICON_PATH=path):
+            self.assertEqual(LexiconPOSTagger().get_lexicon(), {})
+    
+    def test_build_command(self):
+        """Test manage.py build_pos_lexicon writes a lexicon the tagger can load"""
+        corpus = os.path.join(self.temp_dir, 'corpus.txt')
+        output = os.path.join(self.temp_dir, 'data', 'pos_lexicon.json')
+        with open(corpus, 'w') as f:
+            f.write("# comment\nHello world.\nhello, WORLD!\n\n")
+        
+        out = StringIO()
+        with patch('A2SL.management.commands.build_pos_lexicon.pos_tagger', SharedPOSTagger(loader=FakeTagger)):
+            call_command('build_pos_lexicon', corpus=[corpus], output=output, stdout=out)
+        
+        self.assertIn('Wrote 2 words', out.getvalue())
+        self.assertEqual(LexiconPOSTagger(path=output).get_lexicon(), {'hello': 'NN', 'world': 'NN'})
+    
+    def test_pipeline_output_unchanged(self):
+        """Test the pipeline gives the same output with the lexicon fast path as with the full tagger"""
+        full_tagger = SharedPOSTagger(loader=DeterministicTagger)
+        corpus = TestSignPipeline.generate_corpus(2000)
+        sentences = [text.lower().split() for text in corpus]
+        lexicon = build_pos_lexicon(sentences, full_tagger, min_count=1)['words']
+        
+        vocabulary = FakeVocabulary(TestSignPipeline.CLIPS)
+        reference = SignPipeline(tagger=full_tagger, lemmatizer=CachedLemmatizer(), vocabulary=vocabulary, tokenizer=str.split)
+        fast_tagger = LexiconPOSTagger(tagger=full_tagger, lexicon=lexicon)
+        pipeline = SignPipeline(tagger=fast_tagger, lemmatizer=CachedLemmatizer(), vocabulary=vocabulary, tokenizer=str.split)
+        
+        for text in corpus:
+            with self.subTest(text=text):
+                self.assertEqual(pipeline.convert(text), reference.convert(text))
+        self.assertGreater(fast_tagger.stats()['fast_path'], 1000)
+
+class TestLemmaTable(unittest.TestCase):
+    """Unit tests for the vocabulary-restricted lemma table"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_build_includes_irregular_and_regular_forms(self):
+        """Test the table holds WordNet lemmas of inflections of the given words"""
+        table = build_lemma_table(['go', 'study', 'good', 'hand'])['lemmas']
+        
+        self.assertEqual(table['v']['went'], 'go')
+        self.assertEqual(table['v']['going'], 'go')
+        self.assertEqual(table['v']['studied'], 'study')
+        self.assertEqual(table['a']['better'], 'good')
+        self.assertEqual(table['n']['hands'], 'hand')
+        self.assertNotIn('go', table['v'])  # words that are their own lemma are left out
+    
+    def test_lookup(self):
+        """Test table lookups and the identity fallback for unknown words"""
+        table = LemmaTable({'v': {'went': 'go'}, 'n': {'hands': 'hand'}})
+        
+        self.assertEqual(table.lemmatize('went', pos='v'), 'go')
+        self.assertEqual(table.lemmatize('hands'), 'hand')
+        self.assertEqual(table.lemmatize('went'), 'went')
+        self.assertEqual(table.lemmatize('xyzzy', pos='a'), 'xyzzy')
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.stats.hits, 2)
+        self.assertEqual(table.preload(), 0)
+    
+    def test_bundled_table_matches_wordnet(self):
+        """Test every entry of the bundled table is what WordNet returns"""
+        with open(settings.LEMMA_TABLE_PATH) as f:
+            tables = json.load(f)['lemmas']
+        reference = WordNetLemmatizer()
+        for pos, entries in tables.items():
+            for form, lemma in entries.items():
+                with self.subTest(form=form, pos=pos):
+                    self.assertEqual(reference.lemmatize(form, pos=pos), lemma)
+    
+    def test_backend_switch(self):
+        """Test LEMMATIZER_BACKEND selects the table or WordNet, falling back when the table is missing"""
+        path = os.path.join(self.temp_dir, 'lemma_table.json')
+        with open(path, 'w') as f:
+            json.dump({'version': 1, 'lemmas': {'v': {'went': 'go'}}}, f)
+        
+        with override_settings(LEMMATIZER_BACKEND='table', LEMMA_TABLE_PATH=path):
+            self.assertIsInstance(get_lemmatizer(), LemmaTable)
+        with override_settings(LEMMATIZER_BACKEND='wordnet', LEMMA_TABLE_PATH=path):
+            self.assertIsInstance(get_lemmatizer(), CachedLemmatizer)
+        with override_settings(LEMMATIZER_BACKEND='table', LEMMA_TABLE_PATH=os.path.join(self.temp_dir, 'missing.json')):
+            self.assertIsInstance(get_lemmatizer(), CachedLemmatizer)
+    
+    def test_build_command(self):
+        """Test manage.py build_lemma_table writes a loadable table"""
+        output = os.path.join(self.temp_dir, 'lemma_table.json')
+        out = StringIO()
+        call_command('build_lemma_table', output=output, stdout=out)
+        
+        self.assertIn('inflections', out.getvalue())
+        table = LemmaTable.load(output)
+        self.assertEqual(table.lemmatize('hands'), 'hand')
+    
+    def test_pipeline_output_matches_wordnet_for_vocabulary(self):
+        """Test sentences built from vocabulary words and their inflections convert the same with the table"""
+        with open(settings.LEMMA_TABLE_PATH) as f:
+            tables = json.load(f)['lemmas']
+        pool = sorted(set(sign_vocabulary.words) | set(COMMON_WORDS) | {form for entries in tables.values() for form in entries})
+        pool = [word for word in pool if word.isalpha()]
+        rng = random.Random(5)
+        corpus = [' '.join(rng.choice(pool) for _ in range(rng.randint(1, 8))) for _ in range(2000)]
+        
+        tagger = SharedPOSTagger(loader=DeterministicTagger)
+        table_pipeline = SignPipeline(tagger=tagger, lemmatizer=LemmaTable.load(settings.LEMMA_TABLE_PATH),
+                                      vocabulary=sign_vocabulary, tokenizer=str.split)
+        wordnet_pipeline = SignPipeline(tagger=tagger, lemmatizer=CachedLemmatizer(),
+                                        vocabulary=sign_vocabulary, tokenizer=str.split)
+        for text in corpus:
+            with self.subTest(text=text):
+                self.assertEqual(table_pipeline.convert(text), wordnet_pipeline.convert(text))
+
+    def test_inflected_synonyms_reach_clips(self):
+        """Test inflections of synonyms are reduced by the bundled table, so they are signed with the synonym's clip"""
+        class VerbTagger:
+            def tag(self, tokens):
+                return [(token, 'VBG') for token in tokens]
+        
+        synonyms = SynonymIndex.load(settings.SYNONYM_INDEX_PATH)
+        pipeline = SignPipeline(tagger=VerbTagger(), lemmatizer=LemmaTable.load(settings.LEMMA_TABLE_PATH),
+                                vocabulary=sign_vocabulary, tokenizer=str.split, synonyms=synonyms)
+        for form, clip_word in [('speaking', 'talk'), ('watching', 'see')]:
+            with self.subTest(form=form):
+                self.assertEqual(synonyms.lookup(pipeline.lemmatizer.lemmatize(form, pos='v')), clip_word)
+                self.assertEqual(pipeline.convert(form), ['Now', sign_vocabulary.lookup(clip_word)])
+
+class FakeSynset:
+    """Synset stand-in: a name, a part of speech and (lemma name, sense count) pairs"""
+    
+    def __init__(self, name, pos, counts):
+        self.name, self._pos, self.counts = name, pos, counts
+    
+    def pos(self):
+        return self._pos
+    
+    def lemma_names(self):
+        return [name for name, _ in self.counts]
+    
+    def lemmas(self):
+        return [MagicMock(**{'name.return_value': name, 'count.return_value': count}) for name, count in self.counts]
+
+class FakeWordNet:
+    """WordNet corpus stand-in over a fixed list of synsets"""
+    
+    def __init__(self, synsets):
+        self._synsets = synsets
+    
+    def synsets(self, word):
+        return [synset for synset in self._synsets if word in synset.lemma_names()]
+
+class TestSynonymIndex(unittest.TestCase):
+    """Unit tests for the synonym -> clip index"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_parse_curated(self):
+        """Test curated lines are case-folded and comments and malformed lines skipped"""
+        lines = ['# comment', '', 'Happy: Glad, joyful  # inline', 'no colon here', 'sad: unhappy, sad', 'good: glad']
+        self.assertEqual(parse_curated_synonyms(lines), {'glad': 'good', 'joyful': 'happy', 'unhappy': 'sad'})
+    
+    def test_wordnet_synonyms_use_dominant_sense(self):
+        """Test only synonyms whose most frequent sense is the word's most frequent sense are kept"""
+        wordnet = FakeWordNet([
+            FakeSynset('keep.v.01', 'v', [('keep', 30), ('maintain', 20), ('hold', 1)]),
+            FakeSynset('keep.n.01', 'n', [('keep', 2), ('dungeon', 5)]),
+            FakeSynset('hold.v.02', 'v', [('hold', 40)]),
+            FakeSynset('but.r.01', 'r', [('but', 10), ('merely', 10)]),
+        ])
+        self.assertEqual(wordnet_synonyms(['keep', 'but'], wordnet=wordnet), {'maintain': 'keep'})
+    
+    def test_build_overlays_curated(self):
+        """Test curated entries override WordNet and entries for missing clips or clip words are dropped"""
+        wordnet = FakeWordNet([FakeSynset('happy.a.01', 'a', [('happy', 5), ('felicitous', 3)])])
+        curated = {'glad': 'happy', 'felicitous': 'good', 'hi': 'hello', 'good': 'happy'}
+        index = build_synonym_index(['happy', 'good'], curated, wordnet=wordnet)
+        
+        self.assertEqual(index['synonyms'], {'felicitous': 'good', 'glad': 'happy'})
+        self.assertEqual(build_synonym_index(['happy'], curated, use_wordnet=False)['synonyms'], {'glad': 'happy', 'good': 'happy'})
+    
+    def test_pipeline_uses_synonym_before_fingerspelling(self):
+        """Test a word without a clip is signed with its synonym's clip, and fingerspelled when the clip is missing"""
+        vocabulary = FakeVocabulary(['Happy', 'Hello'])
+        synonyms = SynonymIndex({'glad': 'happy', 'hi': 'hello', 'lonely': 'alone'})
+        pipeline = SignPipeline(tagger=DeterministicTagger(), lemmatizer=LemmaTable({}), vocabulary=vocabulary,
+                                tokenizer=str.split, synonyms=synonyms)
+        
+        self.assertEqual(pipeline.convert('glad'), ['Happy'])
+        self.assertEqual(pipeline.convert('Hi'), ['Hello'])
+        self.assertEqual(pipeline.convert('lonely'), list('LONELY'))
+        self.assertEqual(synonyms.stats.hits, 3)
+        self.assertEqual(len(synonyms), 3)
+    
+    def test_settings(self):
+        """Test SYNONYMS_ENABLED and a missing or outdated index file disable the lookup"""
+        path = os.path.join(self.temp_dir, 'synonym_index.json')
+        with open(path, 'w') as f:
+            json.dump({'version': 1, 'synonyms': {'glad': 'happy'}}, f)
+        
+        with override_settings(SYNONYMS_ENABLED=True, SYNONYM_INDEX_PATH=path):
+            self.assertEqual(get_synonym_index().lookup('Glad'), 'happy')
+        with override_settings(SYNONYMS_ENABLED=False, SYNONYM_INDEX_PATH=path):
+            self.assertIsNone(get_synonym_index())
+        with override_settings(SYNONYMS_ENABLED=True, SYNONYM_INDEX_PATH=os.path.join(self.temp_dir, 'missing.json')):
+            self.assertIsNone(get_synonym_index())
+        with open(path, 'w') as f:
+            json.dump({'version': 0, 'synonyms': {}}, f)
+        with override_settings(SYNONYMS_ENABLED=True, SYNONYM_INDEX_PATH=path):
+            self.assertIsNone(get_synonym_index())
+    
+    def test_build_command(self):
+        """Test manage.py build_synonym_index writes a loadable index from the curated list"""
+        curated = os.path.join(self.temp_dir, 'synonyms.txt')
+        with open(curated, 'w') as f:
+            f.write('happy: glad\nmissingclip: word\n')
+        output = os.path.join(self.temp_dir, 'synonym_index.json')
+        out = StringIO()
+        call_command('build_synonym_index', curated=curated, no_wordnet=True, output=output, stdout=out)
+        
+        self.assertIn('1 synonyms', out.getvalue())
+        self.assertEqual(SynonymIndex.load(output).lookup('glad'), 'happy')
+    
+    def test_bundled_index_targets_exist(self):
+        """Test every synonym in the bundled index points at an existing clip and is not itself a clip"""
+        with open(settings.SYNONYM_INDEX_PATH) as f:
+            synonyms = json.load(f)['synonyms']
+        self.assertGreater(len(synonyms), 50)
+        for word, clip in synonyms.items():
+            with self.subTest(word=word):
+                self.assertIsNotNone(sign_vocabulary.lookup(clip))
+                self.assertIsNone(sign_vocabulary.lookup(word))
+
+class TestFuzzyMatch(unittest.TestCase):
+    """Unit tests for fuzzy matching of misspelled words to clips"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.vocabulary = FakeVocabulary(['Hello', 'World', 'Happy', 'Gold', 'Computer', 'Sign', 'Sing', 'Go'])
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_edit_distance(self):
+        """Test optimal string alignment distance, including transpositions and the cutoff"""
+        test_cases = [
+            ('hello', 'hello', 0), ('helo', 'hello', 1), ('hxllo', 'hello', 1), ('hlelo', 'hello', 1),
+            ('wrold', 'world', 1), ('wolrd', 'world', 1), ('hlo', 'hello', 2), ('xyz', 'hello', 3), ('', 'go', 2),
+        ]
+        for a, b, expected in test_cases:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(edit_distance(a, b, 2), min(expected, 3))
+                self.assertEqual(edit_distance(b, a, 2), min(expected, 3))
+    
+    def test_deletes(self):
+        """Test deletes cover every string up to the given number of deletions"""
+        self.assertEqual(deletes('abc', 1), {'abc', 'bc', 'ac', 'ab'})
+        self.assertEqual(deletes('abc', 2), {'abc', 'bc', 'ac', 'ab', 'a', 'b', 'c'})
+    
+    def test_lookup(self):
+        """Test the closest word is returned, and ties, short words and low confidence are rejected"""
+        index = SymSpellIndex(['hello', 'world', 'computer', 'sign', 'sing', 'go'])
+        
+        self.assertEqual(index.lookup('helo').word, 'hello')
+        self.assertEqual(index.lookup('cmoputr').word, 'computer')
+        self.assertEqual(index.lookup('helo').confidence, 0.8)
+        self.assertIsNone(index.lookup('sinn'))  # sign and sing are both one edit away
+        self.assertIsNone(index.lookup('gi'))  # too short to correct
+        self.assertNotIn('go', index.words)
+        self.assertIsNone(index.lookup('hlo', min_confidence=0.75))
+        self.assertEqual(index.lookup('hllo', min_confidence=0.75).word, 'hello')
+    
+    def test_known_words_are_not_corrected(self):
+        """Test correctly spelled words near a clip name are left alone"""
+        matcher = FuzzyMatcher(self.vocabulary, known_words=['fold'])
+        
+        self.assertIsNone(matcher.match('fold'))
+        self.assertEqual(matcher.match('goldd'), 'gold')
+        self.assertEqual(matcher.match('Wrold'), 'world')
+        self.assertEqual(matcher.stats.hits, 2)
+    
+    def test_index_rebuilt_when_vocabulary_changes(self):
+        """Test the deletes index follows the vocabulary version"""
+        matcher = FuzzyMatcher(self.vocabulary)
+        self.assertIsNone(matcher.match('thnak'))
+        
+        self.vocabulary.words = self.vocabulary.words | {'thank'}
+        self.vocabulary.version += 1
+        self.assertEqual(matcher.match('thnak'), 'thank')
+    
+    def test_pipeline_corrects_misspellings(self):
+        """Test misspelled words are signed with the intended clip, or its synonym's clip"""
+        synonyms = SynonymIndex({'glad': 'happy'})
+        matcher = FuzzyMatcher(self.vocabulary, extra_words=synonyms.words)
+        pipeline = SignPipeline(tagger=FakeTagger(), lemmatizer=LemmaTable({}), vocabulary=self.vocabulary,
+                                tokenizer=str.split, synonyms=synonyms, fuzzy=matcher)
+        
+        self.assertEqual(pipeline.convert('helo'), ['Hello'])
+        self.assertEqual(pipeline.convert('compuetr'), ['Computer'])
+        self.assertEqual(pipeline.convert('gladd'), ['Happy'])
+        self.assertEqual(pipeline.convert('xylophone'), list('XYLOPHONE'))
+    
+    def test_build_known_words(self):
+        """Test known words are the dictionary words within the distance of an indexed word"""
+        known = build_known_words(['gold', 'hello'], ['fold', 'bold', 'gold', 'cat', 'jello', 'goldfish'])
+        self.assertEqual(known['words'], ['bold', 'fold', 'jello'])
+        self.assertEqual(known['max_distance'], 2)
+    
+    def test_settings(self):
+        """Test FUZZY_MATCH_ENABLED and the known words file control the matcher"""
+        path = os.path.join(self.temp_dir, 'fuzzy_known_words.json')
+        with open(path, 'w') as f:
+            json.dump({'version': 1, 'max_distance': 1, 'words': ['fold']}, f)
+        
+        with override_settings(FUZZY_MATCH_ENABLED=True, FUZZY_KNOWN_WORDS_PATH=path, FUZZY_MATCH_MAX_DISTANCE=1):
+            matcher = get_fuzzy_matcher(self.vocabulary, SynonymIndex({'glad': 'happy'}))
+            self.assertEqual(matcher.max_distance, 1)
+            self.assertIsNone(matcher.match('fold'))
+            self.assertEqual(matcher.match('glsd'), 'glad')
+        with override_settings(FUZZY_MATCH_ENABLED=False, FUZZY_KNOWN_WORDS_PATH=path):
+            self.assertIsNone(get_fuzzy_matcher(self.vocabulary))
+        with override_settings(FUZZY_MATCH_ENABLED=True, FUZZY_KNOWN_WORDS_PATH=os.path.join(self.temp_dir, 'missing.json')):
+            self.assertIsNone(get_fuzzy_matcher(self.vocabulary))
+    
+    def test_bundled_known_words(self):
+        """Test the bundled known words protect real words next to clip names"""
+        with override_settings(FUZZY_MATCH_ENABLED=True):
+            matcher = get_fuzzy_matcher(sign_vocabulary)
+        for word in ['fold', 'cold', 'told', 'sigh', 'walks']:
+            with self.subTest(word=word):
+                self.assertIsNone(matcher.match(word))
+        self.assertIsNone(matcher.match('helo'))  # hello and help are both one edit away
+        self.assertEqual(matcher.match('hllo'), 'hello')
+        self.assertEqual(matcher.match('langauge'), 'language')
+
+class TestSharedModels(unittest.TestCase):
+    """Unit tests for the copy-on-write friendly model tables used in preload mode"""
+    
+    TRAINING = [
+        [("i", "PRP"), ("will", "MD"), ("go", "VB"), ("home", "NN")],
+        [("i", "PRP"), ("went", "VBD"), ("home", "NN")],
+        [("she", "PRP"), ("is", "VBZ"), ("running", "VBG")],
+        [("they", "PRP"), ("are", "VBP"), ("happy", "JJ")],
+        [("we", "PRP"), ("have", "VBP"), ("eaten", "VBN"), ("food", "NN")],
+        [("he", "PRP"), ("is", "VBZ"), ("better", "JJR")],
+    ]
+    
+    def test_shared_perceptron_tags_identically(self):
+        """Test the shared-array perceptron gives the same tags as the dict-of-dicts model"""
+        tagger = PerceptronTagger(load=False)
+        random.seed(0)
+        tagger.train(self.TRAINING, nr_iter=5)
+        sentences = [["i", "will", "eat", "food"], ["she", "went", "running"], ["xyzzy", "happy", "home"], []]
+        expected = [tagger.tag(tokens, use_tagdict=False) for tokens in sentences]
+        
+        shared_bytes = share_tagger_weights(tagger)
+        
+        self.assertIsInstance(tagger.model, SharedAveragedPerceptron)
+        self.assertGreater(shared_bytes, 0)
+        self.assertEqual([tagger.tag(tokens, use_tagdict=False) for tokens in sentences], expected)
+        self.assertEqual(share_tagger_weights(tagger), shared_bytes)  # already shared
+    
+    def test_shared_probability_map(self):
+        """Test the shared probability matrix reads back the original values"""
+        original = {'a': [0.1, 0.0, 0.3], 'ab': [0.0, 0.2, 0.0]}
+        shared = SharedProbabilityMap(original, 3)
+        
+        self.assertEqual(len(shared), 2)
+        self.assertIn('ab', shared)
+        self.assertNotIn('b', shared)
+        self.assertEqual(list(shared['a']), [0.1, 0.0, 0.3])
+        self.assertEqual(shared['ab'][1], 0.2)
+        self.assertEqual(list(shared), ['a', 'ab'])
+        with self.assertRaises(KeyError):
+            shared['b']
+        self.assertEqual(shared.nbytes, 6 * 8 + shared._rows.nbytes)
+    
+    def test_shared_key_index(self):
+        """Test the shared key index finds every key's row, including colliding and non-ASCII keys, and nothing else"""
+        rng = random.Random(3)
+        keys = list(dict.fromkeys(''.join(rng.choice('ab\u0939\U0001F600') for _ in range(rng.randint(0, 6))) for _ in range(2000)))
+        index = SharedKeyIndex(keys)
+        
+        self.assertEqual(len(index), len(keys))
+        self.assertEqual(list(index), keys)
+        for row, key in enumerate(keys):
+            self.assertEqual(index.get(key), row)
+        self.assertIsNone(index.get('abababa'))
+        self.assertNotIn('abababa', index)
+        self.assertNotIn(1, index)
+        self.assertIsNone(SharedKeyIndex([]).get('a'))
+    
+    def test_langdetect_results_unchanged(self):
+        """Test langdetect gives the same probabilities with shared profiles"""
+        from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+        factory = DetectorFactory()
+        factory.load_profile(PROFILES_DIRECTORY)
+        texts = ["Hello, how are you?", "नमस्ते, आप कैसे हैं?", "Bonjour tout le monde", "Guten Morgen"]
+        
+        def probabilities():
+            results = []
+            for text in texts:
+                detector = factory.create()
+                detector.append(text)
+                results.append([(p.lang, p.prob) for p in detector.get_probabilities()])
+            return results
+        
+        DetectorFactory.seed = 0
+        expected = probabilities()
+        share_langdetect_profiles(factory)
+        
+        self.assertIsInstance(factory.word_lang_prob_map, SharedProbabilityMap)
+        self.assertEqual(probabilities(), expected)
+    
+    @unittest.skipUnless(os.path.exists('/proc/self/smaps_rollup'), "requires Linux /proc")
+    def test_process_memory(self):
+        """Test the per-process memory report"""
+        memory = process_memory()
+        self.assertGreater(memory['rss'], 0)
+        self.assertLessEqual(memory['unique'], memory['rss'])
+        self.assertEqual(process_memory(pid=999999999), {})
+    
+    @unittest.skipUnless(os.path.exists('/proc/self/smaps_rollup'), "requires Linux /proc")
+    def test_memory_report_command(self):
+        """Test manage.py memory_report lists a master and its workers"""
+        out = StringIO()
+        call_command('memory_report', os.getppid(), stdout=out)
+        self.assertIn(str(os.getpid()), out.getvalue())
+        self.assertIn('worker', out.getvalue())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Performance Tests
+Benchmarks for the hot paths of the sign language conversion pipeline
+"""
+
+import os
+import sys
+import django
+import unittest
+import time
+import json
+import random
+import string
+import subprocess
+
+# Setup Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SL.settings')
+django.setup()
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.test import override_settings
+from A2SL.sign_vocabulary import SignVocabulary, sign_vocabulary
+from A2SL.script_detection import detect_language_by_script
+from A2SL.fast_tokenizer import fast_alpha_tokens
+from A2SL.fuzzy_match import get_fuzzy_matcher
+from A2SL.phrase_table import PhraseTable
+import nltk
+from nltk.tokenize import NLTKWordTokenizer
+from langdetect import detect
+
+def benchmark(func, iterations):
+    """Return the average time per call in microseconds"""
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start_time) / iterations * 1e6
+
+class TestVocabularyPerformance(unittest.TestCase):
+    """Benchmarks for sign vocabulary lookups"""
+    
+    WORDS = ["Hello", "World", "Xyzzy", "Happy", "Glad", "Me", "Go", "Home"]
+    
+    def test_index_lookup_faster_than_finders(self):
+        """Test in-memory index lookups beat filesystem finder lookups"""
+        vocabulary = SignVocabulary()
+        vocabulary.lookup("hello")  # Build outside the timed section
+        
+        def finder_lookup():
+            for word in self.WORDS:
+                finders.find(word + ".mp4")
+        
+        def index_lookup():
+            for word in self.WORDS:
+                vocabulary.lookup(word)
+        
+        finder_time = benchmark(finder_lookup, 200)
+        index_time = benchmark(index_lookup, 200)
+        print(f"\nfinders.find: {finder_time:.1f} us/sentence, index: {index_time:.1f} us/sentence")
+        
+        self.assertLess(index_time * 10, finder_time)
+    
+    def test_index_lookup_constant_time(self):
+        """Test lookup cost does not grow with vocabulary size"""
+        small = SignVocabulary()
+        small._clips = {str(i): str(i) for i in range(100)}
+        small._loaded = True
+        large = SignVocabulary()
+        large._clips = {str(i): str(i) for i in range(100000)}
+        large._loaded = True
+        
+        small_time = benchmark(lambda: small.lookup("42"), 20000)
+        large_time = benchmark(lambda: large.lookup("42"), 20000)
+        print(f"\nlookup with 100 clips: {small_time:.3f} us, with 100000 clips: {large_time:.3f} us")
+        
+        self.assertLess(large_time, small_time * 3)
+
+class TestLanguageDetectionPerformance(unittest.TestCase):
+    """Benchmarks for language detection"""
+    
+    TEXTS = [
+        "வணக்கம், எப்படி இருக்கிறீர்கள்?",
+        "నమస్కారం, మీరు ఎలా ఉన్నారు?",
+        "নমস্কাৰ, আপুনি কেনে আছে?",
+        "Hello, how are you?",
+    ]
+    
+    def test_script_detection_faster_than_langdetect(self):
+        """Test the script fast path beats langdetect's n-gram model"""
+        detect(self.TEXTS[0])  # Load language profiles outside the timed section
+        
+        def run_langdetect():
+            for text in self.TEXTS:
+                detect(text)
+        
+        def run_script_detection():
+            for text in self.TEXTS:
+                detect_language_by_script(text)
+        
+        langdetect_time = benchmark(run_langdetect, 20)
+        script_time = benchmark(run_script_detection, 20)
+        print(f"\nlangdetect: {langdetect_time:.1f} us/batch, script detection: {script_time:.1f} us/batch")
+        
+        self.assertLess(script_time * 10, langdetect_time)
+
+class TestTokenizerPerformance(unittest.TestCase):
+    """Benchmarks for English tokenization"""
+    
+    SENTENCES = [
+        "hello, how are you?",
+        "i don't want to go home today.",
+        "we are going to the college tomorrow",
+        "thank you very much for your help!",
+    ]
+    
+    def test_fast_path_faster_than_treebank(self):
+        """Test the regex fast path beats the Treebank tokenizer (word_tokenize without punkt)"""
+        treebank = NLTKWordTokenizer()
+        
+        def run_treebank():
+            for text in self.SENTENCES:
+                [token for token in treebank.tokenize(text) if token.isalpha()]
+        
+        def run_fast_path():
+            for text in self.SENTENCES:
+                fast_alpha_tokens(text)
+        
+        treebank_time = benchmark(run_treebank, 500)
+        fast_time = benchmark(run_fast_path, 500)
+        print(f"\ntreebank: {treebank_time:.1f} us/batch, fast path: {fast_time:.1f} us/batch")
+        
+        self.assertLess(fast_time * 5, treebank_time)
+
+def make_typo(word, rng):
+    """One random keyboard/ASR-style edit: deletion, insertion, substitution or adjacent transposition"""
+    i = rng.randrange(len(word))
+    letter = rng.choice(string.ascii_lowercase)
+    edit = rng.choice('disx')
+    if edit == 'd':
+        return word[:i] + word[i + 1:]
+    if edit == 'i':
+        return word[:i] + letter + word[i:]
+    if edit == 's':
+        return word[:i] + letter + word[i + 1:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+class TestFuzzyMatchPerformance(unittest.TestCase):
+    """Latency and accuracy of fuzzy matching over a typo corpus"""
+    
+    def test_typo_corpus(self):
+        """Test misspelled vocabulary words are corrected in well under a millisecond, rarely to the wrong clip"""
+        with override_settings(FUZZY_MATCH_ENABLED=True):
+            matcher = get_fuzzy_matcher(sign_vocabulary)
+        matcher.preload()
+        
+        rng = random.Random(7)
+        words = sorted(word for word in sign_vocabulary.words if word.isalpha() and len(word) >= 4)
+        corpus = []
+        for word in words:
+            for _ in range(5):
+                typo = make_typo(word, rng)
+                # A typo that is itself a clip or a real word is looked up exactly, never corrected
+                if sign_vocabulary.lookup(typo) is None and typo not in matcher.known_words:
+                    corpus.append((typo, word))
+        
+        matches = []
+        lookup_time = benchmark(lambda: matches.extend(matcher.match(typo) for typo, _ in corpus), 1) / len(corpus)
+        corrected = sum(1 for (_, word), match in zip(corpus, matches) if match == word)
+        wrong = sum(1 for (_, word), match in zip(corpus, matches) if match not in (None, word))
+        print(f"\nfuzzy match: {len(corpus)} typos, {corrected} corrected, {wrong} wrong, {lookup_time:.1f} us/lookup")
+        
+        self.assertLess(lookup_time, 1000)
+        self.assertGreater(corrected / len(corpus), 0.7)
+        self.assertLess(wrong / len(corpus), 0.02)
+
+class TestPhraseTablePerformance(unittest.TestCase):
+    """Per-request cost of the curated phrase tables"""
+    
+    TEXT = "મારું નામ રવિ છે અને આજે જમવાનું થઈ ગયું, હવે આપણે શાળાએ જઈએ"
+    
+    @staticmethod
+    def make_phrases(count):
+        rng = random.Random(count)
+        letters = 'કખગઘચછજઝટઠડઢણતથદધનપફબભમયરલવશસહ'
+        return {''.join(rng.choice(letters) for _ in range(rng.randint(4, 12))): 'phrase' for _ in range(count)}
+    
+    def test_cost_independent_of_phrase_count(self):
+        """Test matching a text against 5000 phrases costs about the same as against 10, unlike a dict scan"""
+        small = PhraseTable('gu', contains=self.make_phrases(10), source=self.make_phrases(10))
+        large = PhraseTable('gu', contains=self.make_phrases(5000), source=self.make_phrases(5000))
+        large_phrases = self.make_phrases(5000)
+        
+        def scan():
+            for phrase in large_phrases:
+                if phrase in self.TEXT:
+                    break
+        
+        def run(table):
+            return lambda: (table.translate(self.TEXT), table.correct_source(self.TEXT))
+        
+        small_time = benchmark(run(small), 500)
+        large_time = benchmark(run(large), 500)
+        scan_time = benchmark(scan, 500)
+        print(f"\nphrase table: {small_time:.1f} us with 10 phrases, {large_time:.1f} us with 5000; dict scan: {scan_time:.1f} us")
+        
+        self.assertLess(large_time, small_time * 3)
+        self.assertLess(large_time, scan_time)
+
+def nltk_data_path():
+    return list(nltk.data.path)
+
+def measure_in_subprocess(setup):
+    """Run setup in a fresh interpreter; return (allocated bytes, seconds) for it"""
+    script = (
+        "import json, time, tracemalloc\n"
+        "import nltk\n"
+        f"nltk.data.path[:0] = {nltk_data_path()!r}\n"
+        "tracemalloc.start()\n"
+        "start = time.perf_counter()\n"
+        f"{setup}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps([tracemalloc.get_traced_memory()[0], elapsed]))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+class TestLemmatizerPerformance(unittest.TestCase):
+    """Memory and first-call latency of the lemmatizer backends"""
+    
+    def test_lemma_table_smaller_than_wordnet(self):
+        """Test the lemma table costs a fraction of the memory and load time of WordNet"""
+        wordnet_bytes, wordnet_time = measure_in_subprocess(
+            "from nltk.stem import WordNetLemmatizer\n"
+            "WordNetLemmatizer().lemmatize('running', pos='v')"
+        )
+        table_bytes, table_time = measure_in_subprocess(
+            "import json\n"
+            f"tables = json.load(open({settings.LEMMA_TABLE_PATH!r}))['lemmas']\n"
+            "tables['v'].get('running', 'running')"
+        )
+        print(f"\nWordNet: {wordnet_bytes / 1e6:.1f} MB in {wordnet_time * 1000:.0f} ms, "
+              f"lemma table: {table_bytes / 1e3:.1f} KB in {table_time * 1000:.1f} ms")
+        
+        self.assertLess(table_bytes * 50, wordnet_bytes)
+        self.assertLess(table_time * 10, wordnet_time)
+
+FORKED_WORKER_SCRIPT = """
+import gc, json, os, sys
+from langdetect import detect, detector_factory
+from A2SL.preload import process_memory, share_langdetect_profiles
+detector_factory.init_factory()
+if sys.argv[1] == 'preload':
+    share_langdetect_profiles()
+    gc.collect()
+    gc.freeze()
+read_fd, write_fd = os.pipe()
+pid = os.fork()
+if pid == 0:
+    for text in ["Hello, how are you?", "Bonjour tout le monde", "Guten Morgen"] * 20:
+        detect(text)
+    gc.collect()
+    os.write(write_fd, json.dumps(process_memory()).encode())
+    os._exit(0)
+os.waitpid(pid, 0)
+print(os.read(read_fd, 4096).decode())
+"""
+
+def forked_worker_memory(mode):
+    """process_memory() of a worker forked after loading langdetect profiles in the given mode"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.run([sys.executable, '-c', FORKED_WORKER_SCRIPT, mode], capture_output=True,
+                            text=True, check=True, cwd=root, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+class TestPreloadMemory(unittest.TestCase):
+    """Per-worker unique memory with and without the preload mode"""
+    
+    @unittest.skipUnless(hasattr(os, 'fork') and os.path.exists('/proc/self/smaps_rollup'), "requires Linux")
+    def test_preload_reduces_unique_worker_memory(self):
+        """Test shared profiles and a frozen heap keep a forked worker's pages shared"""
+        default = forked_worker_memory('default')
+        preload = forked_worker_memory('preload')
+        print(f"\nworker unique memory: {default['unique'] / 1e6:.1f} MB default, {preload['unique'] / 1e6:.1f} MB preload")
+        
+        self.assertLess(preload['unique'] * 4, default['unique'])
+
+if __name__ == '__main__':
+    unittest.main()
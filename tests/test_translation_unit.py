@@ -0,0 +1,1339 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Translation Service
+Tests caching and upstream handling of MultilingualTranslationService
+"""
+
+import os
+import sys
+import django
+import unittest
+from unittest.mock import patch, MagicMock
+import time
+import threading
+import tempfile
+import shutil
+import json
+import random
+from io import StringIO
+import asyncio
+import httpcore
+import httpx
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Setup Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SL.settings')
+django.setup()
+
+from django.test import override_settings
+from django.conf import settings
+from django.core.management import call_command
+from A2SL.translation_service import MultilingualTranslationService
+from A2SL.batching import MicroBatchTranslator
+from A2SL.script_detection import detect_language_by_script, script_histogram
+from A2SL.circuit_breaker import CircuitBreaker, CircuitOpenError
+from A2SL.singleflight import SingleFlight, SingleFlightTimeout
+from A2SL.translator_backends import (
+    BilingualLexicon, GoogleTranslatorBackend, OfflineLexiconBackend, UntranslatableError,
+    get_translator_backends, parse_lexicon_tsv, write_lexicon,
+)
+from A2SL.transliteration import transliterate
+from A2SL.async_translation import AsyncGoogleTranslateClient, pool_limits
+from A2SL.deadline import DeadlineExceeded, translation_deadline
+from A2SL.translator_pool import TranslatorPool, TranslatorPoolExhausted, create_translator
+from A2SL.phrase_table import AhoCorasick, PhraseReplacer, PhraseTable, PhraseTables, load_phrase_tables
+from A2SL.caching import LocalTTLCache, DjangoCacheBackend, SQLiteCacheBackend, make_translation_key
+
+def make_translator(translations):
+    """Fake googletrans Translator returning canned translations"""
+    translator = MagicMock()
+    translator.translate.side_effect = lambda text, src=None, dest='en': MagicMock(text=translations[text])
+    return translator
+
+class TestTranslationCache(unittest.TestCase):
+    """Unit tests for the translation result cache"""
+    
+    def test_key_is_nfc_normalized(self):
+        """Test composed and decomposed forms share one cache key"""
+        composed = "café"
+        decomposed = "café"
+        self.assertEqual(make_translation_key(composed, 'fr'), make_translation_key(decomposed, 'fr'))
+        self.assertNotEqual(make_translation_key(composed, 'fr'), make_translation_key(composed, 'es'))
+    
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted at capacity"""
+        cache = LocalTTLCache(max_size=2, ttl=60)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(len(cache), 2)
+    
+    def test_ttl_expiry(self):
+        """Test entries expire after their time-to-live"""
+        cache = LocalTTLCache(max_size=10, ttl=0.05)
+        cache.set("a", "1")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+        cache.set("b", "2")
+        self.assertEqual(cache.stats.evictions, 1)
+    
+    def test_hit_miss_counters(self):
+        """Test hit and miss counters"""
+        cache = LocalTTLCache()
+        cache.get("missing")
+        cache.set("key", "value")
+        cache.get("key")
+        cache.get("key")
+        self.assertEqual(cache.stats.as_dict(), {'hits': 2, 'misses': 1, 'evictions': 0, 'hit_rate': 0.6667})
+    
+    @override_settings(CACHES={'translations': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_django_cache_backend(self):
+        """Test the Django cache backend stores and retrieves translations"""
+        cache = DjangoCacheBackend(alias='translations', ttl=60)
+        key = make_translation_key("नमस्ते", 'hi')
+        self.assertIsNone(cache.get(key))
+        cache.set(key, "Hello")
+        self.assertEqual(cache.get(key), "Hello")
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+
+class TestSQLiteTranslationCache(unittest.TestCase):
+    """Unit tests for the on-disk translation cache"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'translations.sqlite3')
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_entries_shared_between_instances(self):
+        """Test a second worker (or a restarted one) sees stored translations"""
+        first_worker = SQLiteCacheBackend(self.path)
+        first_worker.set("hi:नमस्ते", "Hello")
+        
+        second_worker = SQLiteCacheBackend(self.path)
+        self.assertEqual(second_worker.get("hi:नमस्ते"), "Hello")
+        self.assertIsNone(second_worker.get("hi:missing"))
+        self.assertEqual(second_worker.stats.hits, 1)
+        self.assertEqual(second_worker.stats.misses, 1)
+    
+    def test_database_opened_on_first_use(self):
+        """Test building the backend touches no file; the first lookup creates the database"""
+        path = os.path.join(self.temp_dir, 'cache', 'translations.sqlite3')
+        cache = SQLiteCacheBackend(path)
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
+        
+        self.assertIsNone(cache.get("hi:नमस्ते"))
+        self.assertTrue(os.path.exists(path))
+        cache.set("hi:नमस्ते", "Hello")
+        self.assertEqual(cache.get("hi:नमस्ते"), "Hello")
+    
+    def test_unwritable_path_is_a_miss(self):
+        """Test a cache directory that cannot be created behaves as an empty cache instead of raising"""
+        blocker = os.path.join(self.temp_dir, 'not-a-directory')
+        with open(blocker, 'w') as f:
+            f.write('')
+        cache = SQLiteCacheBackend(os.path.join(blocker, 'translations.sqlite3'))
+        
+        cache.set("hi:नमस्ते", "Hello")
+        self.assertIsNone(cache.get("hi:नमस्ते"))
+        self.assertEqual(cache.stats.misses, 1)
+    
+    def test_wal_mode(self):
+        """Test the database runs in write-ahead-log mode"""
+        cache = SQLiteCacheBackend(self.path)
+        mode = cache._connect().execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode, 'wal')
+    
+    def test_size_bounded_eviction(self):
+        """Test the least recently used entries are evicted above max_size"""
+        cache = SQLiteCacheBackend(self.path, max_size=3)
+        for i in range(5):
+            cache.set(f"key{i}", f"value{i}")
+            cache._connect().execute('UPDATE translation_cache SET accessed = ? WHERE key = ?', (i, f"key{i}"))
+        
+        self.assertEqual(cache.evict(), 2)
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get("key0"))
+        self.assertEqual(cache.get("key4"), "value4")
+    
+    def test_ttl_expiry(self):
+        """Test expired entries are treated as misses"""
+        cache = SQLiteCacheBackend(self.path, ttl=60)
+        cache.set("key", "value")
+        cache._connect().execute('UPDATE translation_cache SET created = 0')
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+    
+    def test_compaction_command(self):
+        """Test the management command compacts the on-disk cache"""
+        cache = SQLiteCacheBackend(self.path, max_size=1)
+        cache.set("old", "1")
+        cache._connect().execute('UPDATE translation_cache SET accessed = 0')
+        cache.set("new", "2")
+        
+        output = StringIO()
+        with patch('A2SL.translation_service.translation_service.cache', cache):
+            call_command('compact_translation_cache', stdout=output)
+        
+        self.assertIn('Removed 1 entries, 1 remain', output.getvalue())
+        self.assertEqual(cache.get("new"), "2")
+
+class TestTranslateToEnglish(unittest.TestCase):
+    """Unit tests for translate_to_english"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.service = MultilingualTranslationService(cache=LocalTTLCache())
+        self.service.translator = make_translator({"नमस्ते": "Hello"})
+    
+    def test_repeated_phrase_served_from_cache(self):
+        """Test repeated phrases only reach the upstream once"""
+        for _ in range(3):
+            self.assertEqual(self.service.translate_to_english("नमस्ते", 'hi'), ("Hello", 'hi'))
+        
+        self.assertEqual(self.service.translator.translate.call_count, 1)
+        stats = self.service.get_cache_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['backend'], 'local')
+    
+    def test_failed_translation_not_cached(self):
+        """Test upstream failures are not cached as translations"""
+        self.service.translator.translate.side_effect = Exception("upstream down")
+        self.assertEqual(self.service.translate_to_english("नमस्ते", 'hi'), ("namaste", 'hi'))
+        self.assertEqual(len(self.service.cache), 0)
+    
+    def test_english_bypasses_cache(self):
+        """Test English input is returned without touching the cache"""
+        self.assertEqual(self.service.translate_to_english("Hello", 'en'), ("Hello", 'en'))
+        self.assertEqual(self.service.get_cache_stats()['misses'], 0)
+
+def run_concurrently(func, count):
+    """Start count threads on func behind a barrier; return (results, errors)"""
+    barrier = threading.Barrier(count)
+    results = []
+    errors = []
+    
+    def worker():
+        barrier.wait()
+        try:
+            results.append(func())
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+class TestSingleFlight(unittest.TestCase):
+    """Unit tests for request coalescing"""
+    
+    def test_concurrent_callers_share_one_call(self):
+        """Test identical concurrent calls run the function once"""
+        flight = SingleFlight()
+        calls = []
+        
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return "Hello"
+        
+        results, errors = run_concurrently(lambda: flight.do("hi:नमस्ते", slow_call), 40)
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(results, ["Hello"] * 40)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats(), {'leaders': 1, 'coalesced': 39, 'in_flight': 0})
+    
+    def test_errors_shared_with_waiters(self):
+        """Test waiters receive the leader's exception"""
+        flight = SingleFlight()
+        
+        def failing_call():
+            time.sleep(0.05)
+            raise ConnectionError("upstream down")
+        
+        results, errors = run_concurrently(lambda: flight.do("key", failing_call), 5)
+        
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 5)
+        self.assertTrue(all(isinstance(e, ConnectionError) for e in errors))
+    
+    def test_waiter_timeout(self):
+        """Test waiters give up after the timeout while the leader keeps running"""
+        flight = SingleFlight(timeout=0.05)
+        leader_started = threading.Event()
+        
+        def slow_call():
+            leader_started.set()
+            time.sleep(0.3)
+            return "done"
+        
+        leader = threading.Thread(target=lambda: flight.do("key", slow_call))
+        leader.start()
+        leader_started.wait()
+        
+        with self.assertRaises(SingleFlightTimeout):
+            flight.do("key", slow_call)
+        leader.join()
+        self.assertEqual(flight.in_flight(), 0)
+    
+    def test_distinct_keys_not_coalesced(self):
+        """Test different keys run independently"""
+        flight = SingleFlight()
+        self.assertEqual(flight.do("a", lambda: 1), 1)
+        self.assertEqual(flight.do("b", lambda: 2), 2)
+        self.assertEqual(flight.stats()['coalesced'], 0)
+
+class TestTranslationCoalescing(unittest.TestCase):
+    """Integration of request coalescing with translate_to_english"""
+    
+    def test_classroom_stampede_hits_upstream_once(self):
+        """Test 40 simultaneous identical requests cause one upstream translation"""
+        service = MultilingualTranslationService(cache=LocalTTLCache())
+        translator = MagicMock()
+        
+        def slow_translate(text, src=None, dest='en'):
+            time.sleep(0.1)
+            return MagicMock(text="Good morning")
+        
+        translator.translate.side_effect = slow_translate
+        service.translator = translator
+        
+        results, errors = run_concurrently(lambda: service.translate_to_english("सुप्रभात", 'hi'), 40)
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [("Good morning", 'hi')] * 40)
+        self.assertEqual(translator.translate.call_count, 1)
+    
+    def test_waiter_timeout_not_negatively_cached(self):
+        """Test a waiter giving up on a slow leader falls back without blocking the phrase for others"""
+        service = MultilingualTranslationService(cache=LocalTTLCache())
+        translator = MagicMock()
+        started = threading.Event()
+        
+        def slow_translate(text, src=None, dest='en'):
+            started.set()
+            time.sleep(0.3)
+            return MagicMock(text="Good morning")
+        
+        translator.translate.side_effect = slow_translate
+        service.translator = translator
+        leader_results = []
+        leader = threading.Thread(target=lambda: leader_results.append(service.translate_to_english("सुप्रभात", 'hi')))
+        leader.start()
+        self.assertTrue(started.wait(5))
+        
+        with translation_deadline(0.05):
+            english_text, _, fallback = service.translate_to_english_detailed("सुप्रभात", 'hi')
+        self.assertTrue(fallback)
+        self.assertIsNone(service.negative_cache.get(make_translation_key("सुप्रभात", 'hi')))
+        
+        leader.join()
+        self.assertEqual(leader_results, [("Good morning", 'hi')])
+        self.assertEqual(translator.translate.call_count, 1)
+    
+    def test_leader_failure_negatively_cached_once(self):
+        """Test an upstream failure is negative-cached by the leader, and waiters get the fallback"""
+        service = MultilingualTranslationService(cache=LocalTTLCache())
+        translator = MagicMock()
+        
+        def failing_translate(text, src=None, dest='en'):
+            time.sleep(0.1)
+            raise ConnectionError("upstream down")
+        
+        translator.translate.side_effect = failing_translate
+        service.translator = translator
+        
+        with patch.object(service.negative_cache, 'set', wraps=service.negative_cache.set) as negative_set:
+            results, errors = run_concurrently(lambda: service.translate_to_english("सुप्रभात", 'hi'), 10)
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [("suprabhat", 'hi')] * 10)
+        self.assertEqual(translator.translate.call_count, 1)
+        negative_set.assert_called_once_with(make_translation_key("सुप्रभात", 'hi'), True)
+
+class FakeTranslator:
+    """
+    Local stand-in for googletrans.Translator: translates line by line from a
+    dictionary and simulates one network round trip per request
+    """
+    
+    def __init__(self, translations, latency=0.02):
+        self.translations = translations
+        self.latency = latency
+        self.requests = []
+        self._lock = threading.Lock()
+    
+    def translate(self, text, dest='en', src='auto'):
+        if isinstance(text, list):
+            return [self.translate(item, dest=dest, src=src) for item in text]
+        with self._lock:
+            self.requests.append(text)
+        time.sleep(self.latency)
+        lines = [self.translations.get(line, line) for line in text.split('\n')]
+        return MagicMock(text='\n'.join(lines), origin=text)
+
+class TestMicroBatching(unittest.TestCase):
+    """Unit tests for the micro-batching translator"""
+    
+    PHRASES = {f"वाक्य {i}": f"Sentence {i}" for i in range(32)}
+    
+    def make_batcher(self, translator, **kwargs):
+        service = MultilingualTranslationService(cache=LocalTTLCache())
+        service.translator = translator
+        return MicroBatchTranslator(service._translate_batch_upstream, **kwargs)
+    
+    def test_concurrent_requests_grouped(self):
+        """Test concurrent translations inside the window share one upstream request"""
+        translator = FakeTranslator(self.PHRASES)
+        batcher = self.make_batcher(translator, max_wait=0.1, max_batch_size=64)
+        texts = iter(list(self.PHRASES))
+        lock = threading.Lock()
+        
+        def translate_next():
+            with lock:
+                text = next(texts)
+            return text, batcher.translate(text, 'hi')
+        
+        results, errors = run_concurrently(translate_next, 10)
+        
+        self.assertEqual(errors, [])
+        for text, translation in results:
+            self.assertEqual(translation, self.PHRASES[text])
+        self.assertEqual(len(translator.requests), 1)
+        self.assertEqual(batcher.stats()['items_sent'], 10)
+    
+    def test_full_batch_sent_early(self):
+        """Test a batch is sent as soon as it reaches max_batch_size"""
+        translator = FakeTranslator(self.PHRASES)
+        batcher = self.make_batcher(translator, max_wait=5.0, max_batch_size=4)
+        texts = iter(list(self.PHRASES))
+        lock = threading.Lock()
+        
+        def translate_next():
+            with lock:
+                text = next(texts)
+            return batcher.translate(text, 'hi')
+        
+        start_time = time.time()
+        results, errors = run_concurrently(translate_next, 8)
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 8)
+        self.assertEqual(len(translator.requests), 2)
+        self.assertLess(time.time() - start_time, 2.0)
+    
+    def test_languages_batched_separately(self):
+        """Test each source language gets its own upstream request"""
+        translator = FakeTranslator({"नमस्ते": "Hello", "வணக்கம்": "Hello"})
+        batcher = self.make_batcher(translator, max_wait=0.05)
+        inputs = iter([("नमस्ते", 'hi'), ("வணக்கம்", 'ta')])
+        lock = threading.Lock()
+        
+        def translate_next():
+            with lock:
+                text, lang = next(inputs)
+            return batcher.translate(text, lang)
+        
+        results, errors = run_concurrently(translate_next, 2)
+        
+        self.assertEqual(sorted(results), ["Hello", "Hello"])
+        self.assertEqual(len(translator.requests), 2)
+    
+    def test_line_mismatch_falls_back_to_single_requests(self):
+        """Test a batch whose line breaks were lost is retried per item"""
+        translator = FakeTranslator({})
+        translator.translate = MagicMock(side_effect=[
+            MagicMock(text="merged"),
+            [MagicMock(text="One"), MagicMock(text="Two")],
+        ])
+        service = MultilingualTranslationService(cache=LocalTTLCache())
+        service.translator = translator
+        
+        self.assertEqual(service._translate_batch_upstream(["एक", "दो"], 'hi'), ["One", "Two"])
+    
+    def test_errors_delivered_to_every_item(self):
+        """Test an upstream failure is raised for every request in the batch"""
+        def failing_batch(texts, source_lang):
+            raise ConnectionError("upstream down")
+        
+        batcher = MicroBatchTranslator(failing_batch, max_wait=0.05)
+        results, errors = run_concurrently(lambda: batcher.translate("नमस्ते", 'hi'), 3)
+        
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 3)
+
+class FakeClock:
+    """Manually advanced clock for circuit breaker tests"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Unit tests for the upstream circuit breaker"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=3, slow_call_threshold=1.0, reset_timeout=30.0, clock=self.clock)
+    
+    def fail(self):
+        raise ConnectionError("upstream down")
+    
+    def test_opens_after_repeated_failures(self):
+        """Test the breaker opens after failure_threshold consecutive failures"""
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(self.fail)
+        
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        upstream = MagicMock()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(upstream)
+        upstream.assert_not_called()
+    
+    def test_opens_after_slow_calls(self):
+        """Test calls slower than the threshold count as failures"""
+        def slow_call():
+            self.clock.now += 2.0
+            return "ok"
+        
+        for _ in range(3):
+            self.assertEqual(self.breaker.call(slow_call), "ok")
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+    
+    def test_half_open_trial(self):
+        """Test one trial call after reset_timeout closes or re-opens the breaker"""
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(self.fail)
+        
+        self.clock.now += 31
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(ConnectionError):
+            self.breaker.call(self.fail)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        
+        self.clock.now += 31
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+    
+    def test_success_resets_failure_count(self):
+        """Test failures must be consecutive to open the breaker"""
+        for _ in range(5):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(self.fail)
+            self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+class TestTranslationFallback(unittest.TestCase):
+    """Unit tests for fast fallback when the translation upstream fails"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.service = MultilingualTranslationService(cache=LocalTTLCache())
+        self.service.translator = MagicMock()
+        self.service.translator.translate.side_effect = ConnectionError("upstream down")
+    
+    def test_open_breaker_skips_upstream(self):
+        """Test an open breaker sends requests straight to the fallback"""
+        threshold = self.service.circuit_breaker.failure_threshold
+        for i in range(threshold):
+            self.service.translate_to_english(f"वाक्य {i}", 'hi')
+        self.assertEqual(self.service.circuit_breaker.state, CircuitBreaker.OPEN)
+        
+        calls_before = self.service.translator.translate.call_count
+        result = self.service.translate_to_english("नमस्ते", 'hi')
+        
+        self.assertEqual(result, ("namaste", 'hi'))
+        self.assertEqual(self.service.translator.translate.call_count, calls_before)
+        self.assertEqual(self.service.get_upstream_stats()['circuit_breaker']['rejected'], 1)
+    
+    def test_open_breaker_still_serves_cache(self):
+        """Test cached translations keep working while the breaker is open"""
+        self.service.cache.set(make_translation_key("नमस्ते", 'hi'), "Hello")
+        for _ in range(self.service.circuit_breaker.failure_threshold):
+            self.service.circuit_breaker.record_failure()
+        
+        self.assertEqual(self.service.translate_to_english("नमस्ते", 'hi'), ("Hello", 'hi'))
+    
+    def test_failures_negatively_cached(self):
+        """Test a phrase that just failed is not retried upstream immediately"""
+        self.service.translate_to_english("नमस्ते", 'hi')
+        self.service.translate_to_english("नमस्ते", 'hi')
+        self.assertEqual(self.service.translator.translate.call_count, 1)
+
+class TestScriptDetection(unittest.TestCase):
+    """Unit tests for Unicode-script language detection"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.service = MultilingualTranslationService(cache=LocalTTLCache())
+    
+    def test_unambiguous_scripts_skip_langdetect(self):
+        """Test single-language scripts are resolved without langdetect"""
+        test_cases = [
+            ("Hello, how are you?", 'en'),
+            ("ਸਤ ਸ੍ਰੀ ਅਕਾਲ", 'pa'),
+            ("નમસ્તે, તમે કેમ છો?", 'gu'),
+            ("ନମସ୍କାର", 'or'),
+            ("வணக்கம் உலகம்", 'ta'),
+            ("నమస్కారం", 'te'),
+            ("ನಮಸ್ಕಾರ", 'kn'),
+            ("നമസ്കാരം", 'ml'),
+            ("হ্যালো, আপনি কেমন আছেন?", 'bn'),
+            ("নমস্কাৰ, আপুনি কেনে আছে?", 'as'),
+            ("123 !?", 'en'),
+        ]
+        
+        with patch('A2SL.translation_service.detect') as mock_detect, \
+             patch('A2SL.translation_service.detect_langs') as mock_detect_langs:
+            for text, expected in test_cases:
+                with self.subTest(text=text):
+                    self.assertEqual(self.service.detect_language(text), expected)
+            mock_detect.assert_not_called()
+            mock_detect_langs.assert_not_called()
+    
+    def test_devanagari_uses_langdetect(self):
+        """Test Devanagari input is disambiguated between Hindi and Marathi only"""
+        with patch('A2SL.translation_service.detect_langs') as mock_detect_langs:
+            mock_detect_langs.return_value = [MagicMock(lang='ne'), MagicMock(lang='mr'), MagicMock(lang='hi')]
+            self.assertEqual(self.service.detect_language("तुमी कसे आहात?"), 'mr')
+            
+            mock_detect_langs.return_value = [MagicMock(lang='ne')]
+            self.assertEqual(self.service.detect_language("तुमी कसे आहात?"), 'hi')
+    
+    def test_detection_is_deterministic(self):
+        """Test repeated detection of ambiguous text gives the same answer"""
+        text = "हॅलो, तुमी कसे आहात?"
+        results = {self.service.detect_language(text) for _ in range(10)}
+        self.assertEqual(len(results), 1)
+    
+    def test_script_histogram(self):
+        """Test letters are counted per script, ignoring digits and punctuation"""
+        self.assertEqual(script_histogram("नमस्ते 123, hi!"), {'Devanagari': 6, 'Latin': 2})
+        self.assertEqual(detect_language_by_script("café"), (None, ()))
+
+def legacy_gujarati(text, translated_text):
+    """Reference copy of the Gujarati handling that was inlined in the translation service"""
+    direct_mappings = {
+        'જમવાનું થઈ ગયું': 'Food is ready',
+        'જમવાનું તૈયાર છે': 'Food is ready',
+        'ખાવાનું તૈયાર છે': 'Food is ready',
+        'હેલો વર્લ્ડ': 'Hello world',
+        'મારું નામ જોહન છે': 'My name is John',
+        'હું ખુશ છું': 'I am happy',
+    }
+    direct = next((english for gujarati, english in direct_mappings.items() if gujarati in text), None)
+    corrected = text.replace('જમવાનું થઈ ગયું', 'જમવાનું તૈયાર છે')
+    for incorrect, correct in {'Gone.': 'Food is ready.', 'Gone': 'Food is ready', 'gone': 'food is ready', 'GONE': 'FOOD IS READY'}.items():
+        translated_text = translated_text.replace(incorrect, correct)
+    return direct, corrected, translated_text
+
+class TestPhraseTable(unittest.TestCase):
+    """Unit tests for the compiled multilingual phrase tables"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_automaton_finds_every_occurrence(self):
+        """Test the automaton reports the same occurrences as a naive scan, overlaps included"""
+        rng = random.Random(3)
+        for _ in range(200):
+            patterns = list({''.join(rng.choice('abc') for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))})
+            text = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 30)))
+            expected = sorted(
+                (start, start + len(pattern), pattern_id)
+                for pattern_id, pattern in enumerate(patterns)
+                for start in range(len(text)) if text.startswith(pattern, start)
+            )
+            with self.subTest(patterns=patterns, text=text):
+                self.assertEqual(sorted(AhoCorasick(patterns).finditer(text)), expected)
+    
+    def test_single_pass_replacement(self):
+        """Test replacements are leftmost-longest and never re-applied to replaced text"""
+        replacer = PhraseReplacer({'he': 'she', 'hello': 'hi', 'she': 'he', 'lo': 'LO'})
+        
+        self.assertEqual(replacer.replace('hello there, she said'), ('hi tshere, he said', ['hello', 'he', 'she']))
+        self.assertEqual(replacer.replace('nothing'), ('nothing', []))
+        self.assertEqual(len(replacer), 4)
+    
+    def test_exact_match_short_circuits(self):
+        """Test whole utterances match regardless of case, spacing, edge punctuation and normalization"""
+        table = PhraseTable('hi', exact={'शुभ रात्रि': 'Good night', 'Thank You': 'Thanks'},
+                            contains={'रात्रि': 'Night'})
+        
+        self.assertEqual(table.translate('  शुभ   रात्रि।'), 'Good night')
+        self.assertEqual(table.translate('thank you!'), 'Thanks')
+        self.assertEqual(table.translate('आज रात्रि'), 'Night')
+        self.assertIsNone(table.translate('नमस्ते'))
+    
+    def test_first_listed_contains_phrase_wins(self):
+        """Test the earliest listed phrase wins when several occur, as the dict scan did"""
+        table = PhraseTable('gu', contains={'બી': 'second', 'એ': 'first'})
+        self.assertEqual(table.translate('એ બી'), 'second')
+    
+    def test_gujarati_matches_legacy_mappings(self):
+        """Test the Gujarati table reproduces the previous inline mappings"""
+        service = MultilingualTranslationService(cache=LocalTTLCache())
+        texts = [
+            'જમવાનું થઈ ગયું', 'હવે જમવાનું તૈયાર છે!', 'ખાવાનું તૈયાર છે', 'હેલો વર્લ્ડ', 'મારું નામ જોહન છે',
+            'હું ખુશ છું', 'હું ખુશ છું, હેલો વર્લ્ડ', 'તમે કેમ છો?', '',
+        ]
+        translations = ['Gone.', 'It is gone', 'GONE!', 'Gone. Gone.', 'Hello', '']
+        for text in texts:
+            for translated in translations:
+                with self.subTest(text=text, translated=translated):
+                    direct, corrected, enhanced = legacy_gujarati(text, translated)
+                    self.assertEqual(service.phrases.translate(text, 'gu'), direct)
+                    self.assertEqual(service.phrases.correct_source(text, 'gu'), corrected)
+                    self.assertEqual(service.phrases.correct_english(translated, 'gu'), enhanced)
+        
+        self.assertEqual(service.enhance_translation_quality('જમવાનું થઈ ગયું', 'Gone', 'gu'), 'Food is ready.')
+        self.assertEqual(service.get_alternative_translation('હું ખુશ છું', 'gu'), 'I am happy')
+        self.assertEqual(service.get_alternative_translation('તમે કેમ છો?', 'gu'), 'tame kem chho?')
+        self.assertEqual(service.get_alternative_translation_detailed('હું ખુશ છું', 'gu'), ('I am happy', False))
+        self.assertEqual(service.get_alternative_translation_detailed('તમે કેમ છો?', 'gu'), ('tame kem chho?', True))
+    
+    def test_validate_translation_quality(self):
+        """Test empty, too short, too long and known-bad translations are rejected"""
+        service = MultilingualTranslationService(cache=LocalTTLCache())
+        test_cases = [
+            ('मैं घर जा रहा हूँ', "I am going home", True),
+            ('हम सब', "We all", True),
+            ('हम', "We", False),
+            ('तो', "", False),
+            ('घर', "Gone", False),
+            ('घर बंद है', "Error house closed", False),
+            ('घर', "The house that is on the street", False),
+        ]
+        for original, translated, expected in test_cases:
+            with self.subTest(original=original, translated=translated):
+                self.assertEqual(service.validate_translation_quality(original, translated, 'hi'), expected)
+    
+    def test_curated_translation_skips_upstream(self):
+        """Test curated phrases are returned without calling the upstream or the cache"""
+        service = MultilingualTranslationService(cache=LocalTTLCache())
+        service.translator = MagicMock()
+        
+        self.assertEqual(service.translate_to_english('धन्यवाद!', 'hi'), ('Thank you', 'hi'))
+        self.assertEqual(service.translate_to_english('જમવાનું થઈ ગયું', 'gu'), ('Food is ready', 'gu'))
+        service.translator.translate.assert_not_called()
+    
+    def test_bundled_tables_cover_every_language(self):
+        """Test a phrase file is bundled for every supported language"""
+        tables = load_phrase_tables(settings.PHRASE_TABLE_DIR)
+        self.assertEqual(set(tables), set(MultilingualTranslationService.SUPPORTED_LANGUAGES))
+    
+    def test_loading_skips_bad_files(self):
+        """Test outdated and unreadable phrase files are skipped"""
+        with open(os.path.join(self.temp_dir, 'hi.json'), 'w') as f:
+            json.dump({'version': 1, 'language': 'hi', 'exact': {'धन्यवाद': 'Thank you'}}, f)
+        with open(os.path.join(self.temp_dir, 'ta.json'), 'w') as f:
+            json.dump({'version': 0, 'language': 'ta', 'exact': {'நன்றி': 'Thank you'}}, f)
+        with open(os.path.join(self.temp_dir, 'te.json'), 'w') as f:
+            f.write('{not json')
+        
+        tables = PhraseTables(self.temp_dir)
+        self.assertEqual(tables.languages(), ['hi'])
+        self.assertEqual(tables.translate('धन्यवाद', 'hi'), 'Thank you')
+        self.assertIsNone(tables.translate('நன்றி', 'ta'))
+        self.assertEqual(tables.correct_english('Gone', 'ta'), 'Gone')
+        self.assertEqual(tables.stats(), {'hi': 1})
+
+class TestOfflineLexiconBackend(unittest.TestCase):
+    """Unit tests for the memory-mapped bilingual lexicons of the offline translator backend"""
+    
+    ENTRIES = {
+        'नमस्ते': 'Hello',
+        'आप कैसे हैं': 'How are you',
+        'आप': 'You',
+        'मेरा': 'My',
+        'नाम': 'Name',
+        'घर': 'Home',
+        'है': '',
+    }
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        write_lexicon(self.ENTRIES, os.path.join(self.temp_dir, 'hi.lex'))
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_lexicon_round_trip(self):
+        """Test every entry of a compiled lexicon is found and nothing else is"""
+        rng = random.Random(5)
+        entries = {''.join(rng.choice('अआइकखगघ') for _ in range(rng.randint(1, 6))): str(i) for i in range(500)}
+        path = os.path.join(self.temp_dir, 'random.lex')
+        write_lexicon(entries, path)
+        lexicon = BilingualLexicon(path)
+        
+        self.assertEqual(len(lexicon), len(entries))
+        for key, value in entries.items():
+            self.assertEqual(lexicon.lookup(key), value)
+        for _ in range(200):
+            key = ''.join(rng.choice('अआइकखगघ') for _ in range(rng.randint(1, 7)))
+            self.assertEqual(lexicon.lookup(key), entries.get(key))
+    
+    def test_parse_tsv(self):
+        """Test lexicon lines are normalized and empty English marks words to drop"""
+        entries = parse_lexicon_tsv([
+            '# comment\n', '\n', 'नमस्ते!\tHello\n', 'आप  कैसे हैं\tHow are you\r\n', 'है\t\n', 'no tab\n',
+        ])
+        self.assertEqual(entries, {'नमस्ते': 'Hello', 'आप कैसे हैं': 'How are you', 'है': ''})
+    
+    def test_longest_phrase_wins(self):
+        """Test phrases are matched before their words and dropped words leave no token"""
+        backend = OfflineLexiconBackend(self.temp_dir)
+        
+        self.assertEqual(backend.translate('नमस्ते, आप कैसे हैं?', 'hi'), 'Hello How are you')
+        self.assertEqual(backend.translate('आप घर', 'hi'), 'You Home')
+        self.assertEqual(backend.translate('मेरा नाम है।', 'hi'), 'My Name')
+    
+    def test_coverage_threshold(self):
+        """Test texts with unknown words go to the next backend unless partial coverage is allowed, romanizing the unknown words"""
+        strict = OfflineLexiconBackend(self.temp_dir, min_coverage=1.0)
+        lenient = OfflineLexiconBackend(self.temp_dir, min_coverage=0.5)
+        
+        with self.assertRaises(UntranslatableError):
+            strict.translate('मेरा नाम राम है', 'hi')
+        self.assertEqual(lenient.translate('मेरा नाम राम है', 'hi'), 'My Name \u2039ram\u203a')
+        self.assertEqual(strict.translate_partial('मेरा नाम राम है', 'hi'), 'My Name \u2039ram\u203a')
+        self.assertEqual(lenient.translate('मेरा नाम Ram है', 'hi'), 'My Name ram')
+        with self.assertRaises(UntranslatableError):
+            strict.translate_partial('राम', 'hi')
+        with self.assertRaises(UntranslatableError):
+            strict.translate('नमस्ते', 'ta')
+        with self.assertRaises(UntranslatableError):
+            strict.translate('है', 'hi')
+        self.assertFalse(strict.supports('ta'))
+    
+    def test_offline_only_service_never_calls_network(self):
+        """Test an offline-only service translates the words it knows and fingerspells the rest"""
+        service = MultilingualTranslationService(cache=LocalTTLCache(), backends=[OfflineLexiconBackend(self.temp_dir)])
+        
+        self.assertIsNone(service.upstream)
+        self.assertIsNone(service.translator)
+        self.assertEqual(service.translate_to_english_detailed('नमस्ते', 'hi'), ('Hello', 'hi', False))
+        self.assertEqual(service.translate_to_english_detailed('नमस्ते राम', 'hi'), ('Hello \u2039ram\u203a', 'hi', False))
+        self.assertEqual(service.translate_to_english_detailed('राम', 'hi'), ('ram', 'hi', True))
+    
+    def test_local_backend_before_upstream(self):
+        """Test the upstream only receives texts the lexicon does not cover"""
+        translator = MagicMock()
+        translator.translate.return_value = MagicMock(text='Hello Ram')
+        service = MultilingualTranslationService(
+            cache=LocalTTLCache(),
+            backends=[OfflineLexiconBackend(self.temp_dir), GoogleTranslatorBackend(translator=translator)],
+        )
+        
+        self.assertEqual(service.translate_to_english('आप कैसे हैं', 'hi'), ('How are you', 'hi'))
+        translator.translate.assert_not_called()
+        self.assertEqual(service.translate_to_english('नमस्ते राम', 'hi'), ('Hello Ram', 'hi'))
+        translator.translate.assert_called_once_with('नमस्ते राम', src='hi', dest='en')
+    
+    def test_backends_from_settings(self):
+        """Test TRANSLATION_BACKENDS selects the backends in order and skips unknown names"""
+        backends = get_translator_backends(['offline', 'nonexistent'])
+        self.assertEqual([backend.name for backend in backends], ['offline'])
+        
+        with override_settings(TRANSLATION_BACKENDS=['offline'], OFFLINE_LEXICON_DIR=self.temp_dir):
+            service = MultilingualTranslationService(cache=LocalTTLCache())
+        self.assertEqual([backend.name for backend in service.local_backends], ['offline'])
+        self.assertIsNone(service.upstream)
+    
+    def test_bundled_lexicons_compile(self):
+        """Test the bundled lexicons compile and agree with their TSV sources"""
+        out = StringIO()
+        call_command('build_lexicons', output=self.temp_dir, stdout=out)
+        self.assertIn('Compiled', out.getvalue())
+        
+        backend = OfflineLexiconBackend(self.temp_dir)
+        for name in os.listdir(settings.OFFLINE_LEXICON_DIR):
+            if not name.endswith('.tsv'):
+                continue
+            language = name[:-len('.tsv')]
+            with open(os.path.join(settings.OFFLINE_LEXICON_DIR, name), encoding='utf-8') as f:
+                entries = parse_lexicon_tsv(f)
+            with self.subTest(language=language):
+                self.assertIn(language, MultilingualTranslationService.SUPPORTED_LANGUAGES)
+                lexicon = backend.get_lexicon(language)
+                self.assertEqual(len(lexicon), len(entries))
+                for source, english in entries.items():
+                    self.assertEqual(lexicon.lookup(source), english)
+        self.assertEqual(backend.translate('ਸਤ ਸ੍ਰੀ ਅਕਾਲ', 'pa'), 'Hello')
+
+class TestTransliteration(unittest.TestCase):
+    """Unit tests for the offline transliteration used when no translation is available"""
+    
+    def test_every_script(self):
+        """Test greetings and names in each supported script are romanized"""
+        cases = [
+            ("नमस्ते", "namaste"),
+            ("मेरा नाम राम है", "mera nam ram hai"),
+            ("নমস্কার", "namaskar"),
+            ("অসমীয়া", "asamiya"),
+            ("ਸਤ ਸ੍ਰੀ ਅਕਾਲ", "sat sri akal"),
+            ("તમે કેમ છો?", "tame kem chho?"),
+            ("ନମସ୍କାର", "namaskara"),
+            ("வணக்கம் உலகம்", "vanakkam ulakam"),
+            ("నమస్కారం", "namaskaram"),
+            ("ನಮಸ್ಕಾರ", "namaskara"),
+            ("നമസ്കാരം", "namaskaram"),
+            ("പേര്", "peru"),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(transliterate(text), expected)
+    
+    def test_malayalam_chillu(self):
+        """Test atomic chillu letters and the older virama + zero-width joiner spelling both end in a bare consonant"""
+        cases = [
+            ("അവൻ", "avan"),
+            ("അവന\u0d4d\u200d", "avan"),
+            ("അവന\u0d4d\u200dറെ", "avanre"),
+            ("അവൾ", "aval"),
+            ("അവള\u0d4d\u200d", "aval"),
+            ("അവർ", "avar"),
+            ("അവര\u0d4d\u200d", "avar"),
+            ("അവന\u0d4d", "avanu"),
+            ("അവന\u0d4d\u200c", "avanu"),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(transliterate(text), expected)
+    
+    def test_inherent_vowel(self):
+        """Test the inherent vowel is removed by vowel signs and viramas and kept in single syllables"""
+        self.assertEqual(transliterate("हिंदी"), "hindi")
+        self.assertEqual(transliterate("धन्यवाद"), "dhanyavad")
+        self.assertEqual(transliterate("न"), "na")
+        self.assertEqual(transliterate("ज़िंदगी"), "zindagi")
+    
+    def test_mixed_text(self):
+        """Test Latin text, digits and punctuation survive and Indic digits become ASCII"""
+        self.assertEqual(transliterate("Hello नमस्ते, 123 ४५।"), "Hello namaste, 123 45.")
+        self.assertEqual(transliterate(""), "")
+    
+    def test_bundled_lexicons_romanize_to_ascii(self):
+        """Test every letter used by the bundled lexicons has a mapping"""
+        for name in os.listdir(settings.OFFLINE_LEXICON_DIR):
+            if not name.endswith('.tsv'):
+                continue
+            with open(os.path.join(settings.OFFLINE_LEXICON_DIR, name), encoding='utf-8') as f:
+                sources = list(parse_lexicon_tsv(f))
+            for source in sources:
+                with self.subTest(lexicon=name, source=source):
+                    romanized = transliterate(source)
+                    self.assertTrue(romanized.isascii(), romanized)
+                    self.assertTrue(romanized.replace(' ', '').isalpha(), romanized)
+
+class FakeServerTransport(httpcore.SyncHTTPTransport):
+    """Keep-alive transport that sends every request to a local port over plain HTTP"""
+    
+    def __init__(self, port):
+        self.port = port
+        self.pool = httpcore.SyncConnectionPool(max_keepalive=1)
+    
+    def request(self, method, url, headers=None, stream=None, timeout=None):
+        return self.pool.request(method, (b'http', b'127.0.0.1', self.port, url[3]), headers, stream, timeout)
+    
+    def close(self):
+        self.pool.close()
+
+class FakeTranslateServer:
+    """
+    Local stand-in for the Google Translate client API: answers 'EN:<text>'
+    after a delay and records request concurrency and client connections
+    """
+    
+    def __init__(self, delay=0.0, status=200):
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = set()
+        self._lock = threading.Lock()
+        fake = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections.add(self.client_address)
+            
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                with fake._lock:
+                    fake.requests += 1
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                time.sleep(fake.delay)
+                with fake._lock:
+                    fake.in_flight -= 1
+                text = query['q'][0]
+                body = json.dumps([[[f"EN:{text}", text, None, None, 1]], None, query['sl'][0]]).encode('utf-8')
+                self.send_response(fake.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+    
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/translate_a/single"
+    
+    def transport(self):
+        """httpx transport sending a googletrans.Translator's requests to this server"""
+        return FakeServerTransport(self.server.server_address[1])
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class TestAsyncTranslation(unittest.TestCase):
+    """Unit tests for the pooled async translation client and the service's async path"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.server = FakeTranslateServer(delay=0.05)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.server.close()
+    
+    def make_service(self, client):
+        return MultilingualTranslationService(
+            cache=LocalTTLCache(), backends=[GoogleTranslatorBackend(translator=MagicMock())], async_upstream=client
+        )
+    
+    def test_bounded_pooled_connections(self):
+        """Test requests beyond the pool size wait, and connections are kept alive and reused"""
+        client = AsyncGoogleTranslateClient(self.server.url, max_connections=5, max_keepalive=5)
+        
+        async def translate_all():
+            try:
+                return await asyncio.gather(*(client.translate(f"वाक्य {i}", 'hi') for i in range(50)))
+            finally:
+                await client.aclose()
+        
+        results = asyncio.run(translate_all())
+        
+        self.assertEqual(results, [f"EN:वाक्य {i}" for i in range(50)])
+        self.assertEqual(self.server.requests, 50)
+        self.assertLessEqual(self.server.max_in_flight, 5)
+        self.assertLessEqual(len(self.server.connections), 5)
+        self.assertEqual(client.stats()['in_flight'], 0)
+        self.assertLessEqual(client.stats()['max_in_flight'], 5)
+    
+    def test_hundreds_of_waits_in_one_thread(self):
+        """Test hundreds of concurrent translation waits need neither a thread nor a connection each"""
+        client = AsyncGoogleTranslateClient(self.server.url, max_connections=50, max_keepalive=50)
+        service = self.make_service(client)
+        threads_before = threading.active_count()
+        
+        async def translate_all():
+            try:
+                return await asyncio.gather(*(
+                    service.translate_to_english_detailed_async(f"वाक्य {i}", 'hi') for i in range(300)
+                ))
+            finally:
+                await client.aclose()
+        
+        start = time.monotonic()
+        results = asyncio.run(translate_all())
+        elapsed = time.monotonic() - start
+        
+        self.assertEqual(results, [(f"EN:वाक्य {i}", 'hi', False) for i in range(300)])
+        self.assertLessEqual(len(self.server.connections), 50)
+        # 300 requests of 50 ms over 50 connections; one at a time would take 15 s
+        self.assertLess(elapsed, 5.0)
+        self.assertLess(threading.active_count() - threads_before, 60)
+    
+    def test_async_path_coalesces_and_caches(self):
+        """Test concurrent identical texts share one request and repeats are served from the cache"""
+        client = AsyncGoogleTranslateClient(self.server.url)
+        service = self.make_service(client)
+        
+        async def translate_twice():
+            try:
+                first = await asyncio.gather(*(service.translate_to_english_detailed_async("नमस्ते दुनिया", 'hi') for _ in range(20)))
+                second = await service.translate_to_english_detailed_async("नमस्ते दुनिया", 'hi')
+                return first, second
+            finally:
+                await client.aclose()
+        
+        first, second = asyncio.run(translate_twice())
+        
+        self.assertEqual(set(first), {("EN:नमस्ते दुनिया", 'hi', False)})
+        self.assertEqual(second, ("EN:नमस्ते दुनिया", 'hi', False))
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(service.async_single_flight.stats()['coalesced'], 19)
+    
+    def test_async_failure_falls_back(self):
+        """Test upstream errors give the romanized fallback and are counted by the circuit breaker"""
+        self.server.status = 500
+        client = AsyncGoogleTranslateClient(self.server.url)
+        service = self.make_service(client)
+        
+        async def translate():
+            try:
+                return await service.translate_to_english_detailed_async("नमस्ते", 'hi')
+            finally:
+                await client.aclose()
+        
+        self.assertEqual(asyncio.run(translate()), ("namaste", 'hi', True))
+        self.assertEqual(service.circuit_breaker.stats()['consecutive_failures'], 1)
+        self.assertTrue(service.negative_cache.get(make_translation_key("नमस्ते", 'hi')))
+
+    def test_connection_wait_bounded_outside_deadline(self):
+        """Test a caller without a deadline waits at most acquire_timeout for a connection"""
+        client = AsyncGoogleTranslateClient(self.server.url, max_connections=1, acquire_timeout=0.05)
+        
+        async def translate_while_busy():
+            try:
+                async with client.acquire():
+                    start = time.monotonic()
+                    with self.assertRaises(TranslatorPoolExhausted):
+                        await client.translate("नमस्ते", 'hi')
+                    return time.monotonic() - start
+            finally:
+                await client.aclose()
+        
+        self.assertLess(asyncio.run(translate_while_busy()), 1.0)
+        self.assertEqual(client.stats()['timeouts'], 1)
+        self.assertEqual(client.stats()['in_flight'], 0)
+        self.assertEqual(self.server.requests, 0)
+    
+    def test_connection_waits_not_counted_by_circuit_breaker(self):
+        """Test waiting for a busy connection pool falls back without counting as an upstream failure"""
+        client = AsyncGoogleTranslateClient(self.server.url, max_connections=1, acquire_timeout=0.05)
+        service = self.make_service(client)
+        
+        async def translate_while_busy():
+            try:
+                async with client.acquire():
+                    return await service.translate_to_english_detailed_async("नमस्ते", 'hi')
+            finally:
+                await client.aclose()
+        
+        self.assertEqual(asyncio.run(translate_while_busy()), ("namaste", 'hi', True))
+        self.assertEqual(service.circuit_breaker.stats()['consecutive_failures'], 0)
+        self.assertIsNone(service.negative_cache.get(make_translation_key("नमस्ते", 'hi')))
+    
+    def test_pool_limits_for_installed_httpx(self):
+        """Test connection limits use PoolLimits on httpx 0.13 and Limits on later versions"""
+        limits = pool_limits(max_keepalive=2, max_connections=5)
+        if hasattr(httpx, 'Limits'):
+            self.assertEqual(list(limits), ['limits'])
+        else:
+            self.assertEqual(limits['pool_limits'].max_connections, 5)
+            self.assertEqual(limits['pool_limits'].max_keepalive, 2)
+        
+        with patch.object(httpx, 'Limits', create=True) as new_limits:
+            self.assertEqual(pool_limits(max_keepalive=2, max_connections=5), {'limits': new_limits.return_value})
+        new_limits.assert_called_once_with(max_keepalive_connections=2, max_connections=5)
+    
+    def test_async_path_keeps_cache_io_off_event_loop(self):
+        """Test lookups and writes of an on-disk translation cache run on worker threads, not the event loop"""
+        threads = []
+        
+        class RecordingCache(SQLiteCacheBackend):
+            def get(self, key):
+                threads.append(threading.get_ident())
+                return super().get(key)
+            
+            def set(self, key, value):
+                threads.append(threading.get_ident())
+                super().set(key, value)
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        client = AsyncGoogleTranslateClient(self.server.url)
+        service = MultilingualTranslationService(
+            cache=RecordingCache(os.path.join(temp_dir, 'translations.sqlite3')),
+            backends=[GoogleTranslatorBackend(translator=MagicMock())], async_upstream=client,
+        )
+        
+        async def translate_twice():
+            try:
+                loop_thread = threading.get_ident()
+                first = await service.translate_to_english_detailed_async("नमस्ते", 'hi')
+                second = await service.translate_to_english_detailed_async("नमस्ते", 'hi')
+                return loop_thread, first, second
+            finally:
+                await client.aclose()
+        
+        loop_thread, first, second = asyncio.run(translate_twice())
+        
+        self.assertEqual(first, ("EN:नमस्ते", 'hi', False))
+        self.assertEqual(second, first)
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+
+class TestTranslatorPool(unittest.TestCase):
+    """Unit tests for the pooled translator clients used by threaded workers"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.server = FakeTranslateServer(delay=0.02)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.server.close()
+    
+    def make_pool(self, **kwargs):
+        return TranslatorPool(factory=lambda: create_translator(proxies={'https': self.server.transport()}), **kwargs)
+    
+    def test_concurrent_threads_share_bounded_clients(self):
+        """Test hundreds of threads get their own translations over at most max_size translators and connections"""
+        pool = self.make_pool(max_size=8, acquire_timeout=30.0)
+        service = MultilingualTranslationService(cache=LocalTTLCache(), backends=[GoogleTranslatorBackend(translator=pool)])
+        numbers = iter(range(200))
+        
+        def translate():
+            number = next(numbers)
+            return number, service.translate_to_english_detailed(f"वाक्य {number}", 'hi')
+        
+        try:
+            results, errors = run_concurrently(translate, 200)
+        finally:
+            pool.close()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(results), [(i, (f"EN:वाक्य {i}", 'hi', False)) for i in range(200)])
+        self.assertEqual(self.server.requests, 200)
+        self.assertLessEqual(self.server.max_in_flight, 8)
+        self.assertLessEqual(len(self.server.connections), 8)
+        stats = pool.stats()
+        self.assertLessEqual(stats['created'], 8)
+        self.assertEqual(stats['in_use'], 0)
+        self.assertGreater(stats['waits'], 0)
+    
+    def test_sequential_requests_reuse_one_connection(self):
+        """Test a translator keeps its connection alive between requests"""
+        pool = self.make_pool(max_size=4)
+        try:
+            texts = [pool.translate(f"वाक्य {i}", src='hi').text for i in range(20)]
+        finally:
+            pool.close()
+        
+        self.assertEqual(texts, [f"EN:वाक्य {i}" for i in range(20)])
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertEqual(pool.stats()['created'], 1)
+    
+    def test_exhausted_pool_times_out(self):
+        """Test a thread waits at most acquire_timeout for a translator"""
+        pool = self.make_pool(max_size=1, acquire_timeout=0.05)
+        try:
+            with pool.acquire():
+                with self.assertRaises(TranslatorPoolExhausted):
+                    pool.translate("नमस्ते", src='hi')
+            self.assertEqual(pool.translate("नमस्ते", src='hi').text, "EN:नमस्ते")
+        finally:
+            pool.close()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+    
+    def test_waits_share_the_request_deadline(self):
+        """Test waiting for a client or an in-flight translation stops at the TRANSLATION_TIMEOUT deadline"""
+        pool = self.make_pool(max_size=1, acquire_timeout=30.0)
+        try:
+            with pool.acquire():
+                start = time.monotonic()
+                with translation_deadline(0.1):
+                    with self.assertRaises(TranslatorPoolExhausted):
+                        pool.translate("नमस्ते", src='hi')
+                    with self.assertRaises(DeadlineExceeded):
+                        pool.translate("नमस्ते", src='hi')
+                self.assertLess(time.monotonic() - start, 2.0)
+        finally:
+            pool.close()
+        
+        release = threading.Event()
+        translator = MagicMock()
+        translator.translate.side_effect = lambda text, src, dest: release.wait(5) and MagicMock(text='Hello')
+        with override_settings(TRANSLATION_TIMEOUT=0.1):
+            service = MultilingualTranslationService(cache=LocalTTLCache(), backends=[GoogleTranslatorBackend(translator=translator)])
+            leader = threading.Thread(target=service.translate_to_english_detailed, args=("नमस्ते", 'hi'))
+            leader.start()
+            while service.single_flight.in_flight() == 0:
+                time.sleep(0.001)
+            start = time.monotonic()
+            result = service.translate_to_english_detailed("नमस्ते", 'hi')
+            elapsed = time.monotonic() - start
+            release.set()
+            leader.join()
+        
+        self.assertEqual(result, ("namaste", 'hi', True))
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual(translator.translate.call_count, 1)
+    
+    def test_upstream_error_raises(self):
+        """Test error statuses raise instead of returning a placeholder translation"""
+        self.server.status = 500
+        pool = self.make_pool()
+        try:
+            with self.assertRaises(Exception):
+                pool.translate("नमस्ते", src='hi')
+        finally:
+            pool.close()
+        self.assertEqual(pool.stats()['in_use'], 0)
+    
+    def test_pool_waits_not_counted_by_circuit_breaker(self):
+        """Test waiting for a busy pool falls back without counting as an upstream failure"""
+        pool = self.make_pool(max_size=1, acquire_timeout=0.05)
+        service = MultilingualTranslationService(cache=LocalTTLCache(), backends=[GoogleTranslatorBackend(translator=pool)])
+        try:
+            with pool.acquire():
+                self.assertEqual(service.translate_to_english_detailed("नमस्ते", 'hi'), ("namaste", 'hi', True))
+            self.assertEqual(service.circuit_breaker.stats()['consecutive_failures'], 0)
+            self.assertIsNone(service.negative_cache.get(make_translation_key("नमस्ते", 'hi')))
+            
+            self.server.status = 500
+            self.assertEqual(service.translate_to_english_detailed("वाक्य", 'hi'), ("vaky", 'hi', True))
+            self.assertEqual(service.circuit_breaker.stats()['consecutive_failures'], 1)
+            self.assertTrue(service.negative_cache.get(make_translation_key("वाक्य", 'hi')))
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()